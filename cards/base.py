@@ -1,21 +1,32 @@
 import datetime
+import hashlib
 import json
 import re
-from collections import defaultdict
+from string import Formatter
 
 from ajax_helpers.utils import random_string
-from django.core.exceptions import FieldDoesNotExist
+from django.core.cache import caches
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import transaction
+from django.db.models import Case, CharField, Model, TextField, Value, When, prefetch_related_objects
+from django.db.models.signals import class_prepared
+from django.dispatch import receiver
 from django.template.loader import render_to_string
 from django.templatetags.static import static
+from django.utils.functional import cached_property
 from django.utils.safestring import mark_safe
 from django.utils.timesince import timesince
 from django.utils.text import slugify
+from django.utils.translation import get_language
 from django_datatables.columns import ColumnBase
 from django_datatables.datatables import DatatableTable
 from django_datatables.plugins.reorder import Reorder
 from django_datatables.reorder_datatable import OrderedDatatable
 from django_menus.menu import HtmlMenu
 
+from cards.channels import card_group_name, sign_subscription
+from cards.fast_json import script_json
+
 
 class ScrollableTabMenu:
     """
@@ -74,6 +85,173 @@ class ScrollableTabMenu:
     def __getattr__(self, name):
         return getattr(self._menu, name)
 
+
+# Process-wide caches used by CardBase.get_field_value(), keyed by model class.
+# (model, field_name) -> (field_type, has_display_method)
+_field_meta_cache = {}
+# (card class, field path, field_type, language) -> label, as verbose_name labels are translated
+_field_label_cache = {}
+# (model, attribute) -> relation followed by getattr(instance, attribute), or None
+_relation_cache = {}
+
+
+@receiver(class_prepared)
+def _clear_field_caches(sender, **kwargs):
+    """Model classes are being (re)created, e.g. on an app registry reload, so drop cached field metadata."""
+    _field_meta_cache.clear()
+    _field_label_cache.clear()
+    _relation_cache.clear()
+
+
+class RowStyle:
+    """
+    A row style HTML template compiled once by `CardBase.add_row_style()`.
+
+    The placeholder names (`{label}`, `{value[v1]}`, `{menu}` ...) are parsed up front so each entry only
+    builds a dict of the names the template actually uses; anything not supplied renders as ''.
+    """
+
+    def __init__(self, html):
+        if not isinstance(html, str) and hasattr(html, 'render'):
+            html = html.render()
+        self.html = html
+        field_names = set()
+        for _literal, field_name, _format_spec, _conversion in Formatter().parse(html):
+            if field_name:
+                field_names.add(re.split(r'[.\[]', field_name, 1)[0])
+        self.field_names = frozenset(field_names)
+
+    def render(self, values, extra=None, menu=None):
+        """
+        Formats the template from `values`, then `extra` (e.g. entry kwargs) without merging them.
+        `menu` is only rendered if the template uses `{menu}`.
+        """
+        if not self.field_names:
+            # Still formatted, so escaped braces ('{{', '}}') are unescaped as they are with placeholders
+            return self.html.format_map({})
+        context = {}
+        for name in self.field_names:
+            if name in values:
+                context[name] = values[name]
+            elif extra is not None and name in extra:
+                context[name] = extra[name]
+            else:
+                context[name] = ''
+        if menu is not None and 'menu' in self.field_names:
+            context['menu'] = menu.render()
+        return self.html.format_map(context)
+
+    def __str__(self):
+        return self.html
+
+
+_MISSING_ENTRY_KEY = object()
+
+
+class CardEntry:
+    """
+    A resolved card entry, as built by `CardBase._add_entry_internal()`.
+
+    Every attribute in `CardEntry.defaults` is a slot set in `__init__`, and other keyword arguments are kept in
+    a single `extra` dict, so an entry is smaller than a dict and attribute reads need no lookup. Entries support
+    dict-style access (`entry['html']`, `entry.get('badge')`, `'label' in entry`, `entry['css_class'] = ...`) so
+    templates and code written for dict entries keep working.
+    """
+
+    defaults = {'label': None, 'html': None, 'entry_css_class': None, 'css_class': '', 'multiple_lines': False,
+                'link': None, 'tooltip': None, 'value_link': None, 'badge': None, 'icon': None,
+                'copy_to_clipboard': False, 'menu': None, 'row_style_html': None, 'prefix': None, 'suffix': None,
+                'status_dot': None, 'progress_bar': None, 'image': None, 'help_text': None, 'popover': None,
+                'separator': False, 'rating': None, 'rating_range': None, 'old_value': None}
+    __slots__ = tuple(defaults) + ('extra',)
+
+    def __init__(self, label=None, html=None, entry_css_class=None, css_class='', multiple_lines=False, link=None,
+                 tooltip=None, value_link=None, badge=None, icon=None, copy_to_clipboard=False, menu=None,
+                 row_style_html=None, prefix=None, suffix=None, status_dot=None, progress_bar=None, image=None,
+                 help_text=None, popover=None, separator=False, rating=None, rating_range=None, old_value=None,
+                 **extra):
+        # Assigned one by one rather than looped over, as this runs once for every entry on a card
+        self.label = label
+        self.html = html
+        self.entry_css_class = entry_css_class
+        self.css_class = css_class
+        self.multiple_lines = multiple_lines
+        self.link = link
+        self.tooltip = tooltip
+        self.value_link = value_link
+        self.badge = badge
+        self.icon = icon
+        self.copy_to_clipboard = copy_to_clipboard
+        self.menu = menu
+        self.row_style_html = row_style_html
+        self.prefix = prefix
+        self.suffix = suffix
+        self.status_dot = status_dot
+        self.progress_bar = progress_bar
+        self.image = image
+        self.help_text = help_text
+        self.popover = popover
+        self.separator = separator
+        self.rating = rating
+        self.rating_range = rating_range
+        self.old_value = old_value
+        self.extra = extra
+
+    def __getattr__(self, name):
+        # Only called for names that are not slots, i.e. additional keyword arguments
+        if name != 'extra':
+            try:
+                return self.extra[name]
+            except KeyError:
+                pass
+        raise AttributeError(name)
+
+    def __getitem__(self, key):
+        value = getattr(self, key, _MISSING_ENTRY_KEY)
+        if value is _MISSING_ENTRY_KEY:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in CardEntry.defaults:
+            setattr(self, key, value)
+        else:
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        return key in CardEntry.defaults or key in self.extra
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(CardEntry.defaults) + len(self.extra)
+
+    def __eq__(self, other):
+        if isinstance(other, (CardEntry, dict)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self):
+        values = {key: getattr(self, key) for key, default in CardEntry.defaults.items()
+                  if getattr(self, key) != default}
+        values.update(self.extra)
+        return f'CardEntry({values})'
+
+    def get(self, key, default=None):
+        value = getattr(self, key, _MISSING_ENTRY_KEY)
+        return default if value is _MISSING_ENTRY_KEY else value
+
+    def keys(self):
+        return list(CardEntry.defaults) + list(self.extra)
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+
 CARD_TYPE_STANDARD = 1
 CARD_TYPE_DATATABLE = 2
 CARD_TYPE_ORDERED_DATATABLE = 3
@@ -182,6 +360,9 @@ class CardBase:
                                                 'tree_themes': json.dumps({'name': 'proton', 'responsive': True}),
                                                 'tree_plugins': json.dumps(['wholerow'])}},
                  'blank': {'name': 'cards/standard/blank.html'},
+                 'lazy': {'name': 'cards/standard/lazy.html',
+                          'context': {'card_css_class': 'card django-card',
+                                      'card_body_css_class': 'card-body cards-list'}},
                  'image_gallery': {'name': 'cards/standard/image_gallery.html',
                                    'context': {'card_css_class': 'card django-card',
                                                'card_body_css_class': 'card-body cards-list'}},
@@ -223,6 +404,10 @@ class CardBase:
     button_menu_type = 'button_group'
     tab_menu_type = 'tabs'
     default_empty_template = 'message'
+    cache_alias = 'default'
+    auto_related = True
+    # Render standard card rows in Python (cards.fast_render) rather than with the row template
+    fast_render = False
 
     def __init__(self, request, code=None, view=None, details_object=None, title=None,
                  menu=None, tab_menu=None, template_name=None, call_details_data=False,
@@ -234,6 +419,8 @@ class CardBase:
                  ajax_reload=False, reload_interval=None,
                  searchable=False, exportable=False,
                  column_search=False,
+                 cache_key=None, cache_timeout=None, cache_version=None,
+                 prefetch=None, lazy=False, window_rows=None, fast_render=None,
                  **kwargs):
         """
         Initializes a card instance used to render a block of content within a view.
@@ -270,6 +457,18 @@ class CardBase:
             hidden_if_blank_or_none (list, optional): Field names to hide if their values are blank or None.
             hidden_if_zero (list, optional): Field names to hide if their values are zero.
             show_header (bool, optional): Whether to show the header / title of the card.
+            cache_key (str, optional): Enables the rendered-HTML fragment cache for this card under this key.
+            cache_timeout (int, optional): Cache timeout in seconds. Defaults to the cache backend's timeout.
+            cache_version (callable or any, optional): Version used to invalidate the cached HTML. A callable is
+                called with `details_object`. Defaults to `details_object.modified` when available.
+            prefetch (list, optional): `prefetch_related` lookups applied once to `details_object` before the card
+                is populated, so many-to-many entries reuse the prefetched results.
+            lazy (bool, optional): Render only the header and a placeholder. The body is built and loaded by
+                a single batched AJAX request for all lazy cards on the page after it has been displayed.
+            window_rows (int, optional): Render only the first `window_rows` rows. Further rows are fetched in
+                windows of the same size as the user scrolls, and `searchable` searches all rows on the server.
+            fast_render (bool, optional): Render the rows of a standard card with `cards.fast_render` instead of
+                the row template. The HTML is identical. Defaults to the `fast_render` class attribute.
             **kwargs: Additional keyword arguments for custom behavior or extension.
 
         Notes:
@@ -284,6 +483,8 @@ class CardBase:
 
         self.code = code
         self.view = view
+        if prefetch and isinstance(details_object, Model):
+            prefetch_related_objects([details_object], *prefetch)
         self.details_object = details_object
         self.request = request
 
@@ -319,6 +520,13 @@ class CardBase:
         self.searchable = searchable
         self.exportable = exportable
         self.column_search = column_search
+        self.cache_key = cache_key
+        self.cache_timeout = cache_timeout
+        self.cache_version = cache_version
+        self.lazy = lazy and not getattr(view, 'loading_lazy_cards', False)
+        self.window_rows = window_rows
+        if fast_render is not None:
+            self.fast_render = fast_render
 
         if is_empty:
             self.group_type = CARD_TYPE_STANDARD
@@ -334,7 +542,8 @@ class CardBase:
         self.extra_card_info = {}
         self.add_extra_card_info(extra_info=self.extra_card_info, group_type=self.group_type, **kwargs)
 
-        self.process_data()
+        if not self.lazy:
+            self.process_data()
         self.child_card_groups = []
 
     # noinspection PyMethodMayBeStatic
@@ -359,6 +568,8 @@ class CardBase:
                     - datatable_model (Model): The model backing the datatable, if any.
                     - setup_table (callable): A callable used to set up the datatable.
                     - order_field (str): Ordering field name for ordered datatables (defaults to 'order').
+                    - order_save_instances (bool): If False, reordering skips `save()` and writes all changed
+                      rows with a single UPDATE (defaults to True).
                 - For HTML cards:
                     - html (str): The raw HTML content to render.
 
@@ -372,6 +583,7 @@ class CardBase:
             extra_info['setup_table'] = kwargs.get('setup_table')
             if group_type == CARD_TYPE_ORDERED_DATATABLE:
                 extra_info['order_field'] = kwargs.get('order_field', 'order')
+                extra_info['order_save_instances'] = kwargs.get('order_save_instances', True)
         elif group_type == CARD_TYPE_LINKED_DATATABLES:
             extra_info['datatables'] = kwargs.get('datatables', [])
         elif group_type == CARD_TYPE_ACCORDION:
@@ -399,6 +611,7 @@ class CardBase:
             extra_info['treegrid_icon_map'] = kwargs.get('treegrid_icon_map', {})
             extra_info['treegrid_show_filter'] = kwargs.get('treegrid_show_filter', True)
             extra_info['treegrid_expand_all'] = kwargs.get('treegrid_expand_all', False)
+            extra_info['treegrid_filter_auto_expand'] = kwargs.get('treegrid_filter_auto_expand', False)
             extra_info['treegrid_show_column_filters'] = kwargs.get('treegrid_show_column_filters', False)
             extra_info['treegrid_toolbar'] = kwargs.get('treegrid_toolbar', [])
             extra_info['treegrid_toolbar_after'] = kwargs.get('treegrid_toolbar_after', [])
@@ -409,12 +622,11 @@ class CardBase:
             extra_info['treegrid_checkbox'] = kwargs.get('treegrid_checkbox', False)
             extra_info['treegrid_checkbox_column'] = kwargs.get('treegrid_checkbox_column', 0)
             extra_info['treegrid_context_menu'] = kwargs.get('treegrid_context_menu', [])
-            extra_info['treegrid_context_menu_json'] = json.dumps(
-                [i for i in extra_info['treegrid_context_menu'] if isinstance(i, dict)])
             extra_info['treegrid_context_menu_html'] = kwargs.get('treegrid_context_menu_html', '')
             extra_info['treegrid_resizable'] = kwargs.get('treegrid_resizable', False)
             extra_info['treegrid_pagination'] = kwargs.get('treegrid_pagination', False)
             extra_info['treegrid_page_size'] = kwargs.get('treegrid_page_size', 50)
+            extra_info['treegrid_server_side'] = kwargs.get('treegrid_server_side', False)
             extra_info['treegrid_js_filters'] = kwargs.get('treegrid_js_filters', [])
             extra_info['treegrid_current_node'] = kwargs.get('treegrid_current_node', '')
 
@@ -430,15 +642,10 @@ class CardBase:
             extra_info['treegrid_default_selected'] = kwargs.get('treegrid_default_selected', [])
             extra_info['treegrid_drag_cross_level'] = kwargs.get('treegrid_drag_cross_level', False)
             extra_info['treegrid_nowrap'] = kwargs.get('treegrid_nowrap', False)
-            # Pre-serialise for template JS
-            extra_info['treegrid_icon_map_json'] = json.dumps(extra_info['treegrid_icon_map'])
-            extra_info['treegrid_columns_json'] = json.dumps(extra_info['treegrid_columns'])
-            extra_info['treegrid_toolbar_json'] = json.dumps(extra_info['treegrid_toolbar'])
-            extra_info['treegrid_static_data_json'] = json.dumps(extra_info['treegrid_static_data'])
-            extra_info['treegrid_js_filters_json'] = json.dumps(extra_info['treegrid_js_filters'])
-            extra_info['treegrid_default_selected_json'] = json.dumps(extra_info['treegrid_default_selected'] or [])
             extra_info['treegrid_borderless'] = kwargs.get('treegrid_borderless', False)
             extra_info['treegrid_min_width'] = kwargs.get('treegrid_min_width', '600px')
+            extra_info['treegrid_fast_json'] = kwargs.get('treegrid_fast_json', False)
+            extra_info['treegrid_save_delay'] = kwargs.get('treegrid_save_delay', 500)
 
     def add_boolean_entry(self, value, label=None, hidden=False, html_override=None,
                           entry_css_class=None, css_class=None,
@@ -572,6 +779,7 @@ class CardBase:
         """
         if extra_row_kwargs is None:
             extra_row_kwargs = {}
+        self.load_related(args)
         entries = []
         for arg in args:
             if isinstance(arg, str):
@@ -650,6 +858,8 @@ class CardBase:
             )
         """
 
+        if value is None and field is not None:
+            self.load_related([field])
         entry = self._add_entry_internal(value=value,
                                          field=field,
                                          label=label,
@@ -744,7 +954,7 @@ class CardBase:
             is_default (bool, optional): If True, this style becomes the default for all subsequent entries.
 
         Side Effects:
-            - Registers the style in `self._row_styles` under the given `name`.
+            - Compiles the HTML into a `RowStyle` and registers it in `self._row_styles` under the given `name`.
             - Optionally updates `self._default_row_styles` if `is_default` is True.
 
         Example:
@@ -759,9 +969,7 @@ class CardBase:
 
             card.add_entry(label='Custom Row', value='Styled Entry', row_style='test')
         """
-        if not isinstance(html, str) and hasattr(html, 'render'):
-            html = html.render()
-        self._row_styles[name] = html
+        self._row_styles[name] = RowStyle(html)
         if is_default:
             self._default_row_styles = name
 
@@ -778,6 +986,173 @@ class CardBase:
         if name in self._row_styles:
             self._default_row_styles = name
 
+    @classmethod
+    def _field_paths(cls, fields):
+        """Yields the field path strings found in `add_rows()` / `add_row()` style arguments."""
+        for field in fields:
+            if isinstance(field, str):
+                yield field
+            elif isinstance(field, dict):
+                if field.get('value') is None and field.get('field') is not None:
+                    yield from cls._field_paths([field['field']])
+            elif isinstance(field, (list, tuple)):
+                yield from cls._field_paths(field)
+
+    def plan_related_lookups(self, fields):
+        """
+        Works out the related lookups needed to resolve `fields` from `details_object` without lazy queries.
+
+        Each double-underscore path is walked through the model `_meta`, matching the attribute names that
+        `get_field_value()` reads. Forward foreign keys and one-to-one relations become `select_related` paths.
+        A many-to-many or reverse foreign key (by its accessor, e.g. `payment_set`) becomes a `prefetch_related`
+        path, and the walk stops there. The walk also stops at a reverse one-to-one and at the first part that
+        is not a relation, such as a concrete field, property or method.
+
+        Args:
+            fields (iterable): Field names/paths, entry dicts or row tuples as accepted by `add_rows()`.
+
+        Returns:
+            tuple[set, set]: (select_related paths, prefetch_related paths).
+        """
+        select_related = set()
+        prefetch_related = set()
+        if not isinstance(self.details_object, Model):
+            return select_related, prefetch_related
+        for field in self._field_paths(fields):
+            model = type(self.details_object)
+            path = []
+            for part in field.split('__'):
+                model_field = self._relation_for_attribute(model, part)
+                if model_field is None or (model_field.one_to_one and not model_field.concrete):
+                    # Not a relation, or a reverse one-to-one, which is left to load when it is read
+                    break
+                path.append(part)
+                if model_field.many_to_many or model_field.one_to_many:
+                    prefetch_related.add('__'.join(path))
+                    break
+                select_related.add('__'.join(path))
+                model = model_field.related_model
+        return select_related, prefetch_related
+
+    @staticmethod
+    def _relation_for_attribute(model, attribute):
+        """
+        Returns the relation of `model` that `getattr(instance, attribute)` follows, or None.
+
+        Reverse relations are matched on their accessor (`payment_set`), not their query name (`payment`),
+        as that is the name `get_field_value()` and `prefetch_related()` use. Cached per process, like
+        `get_field_meta()`.
+        """
+        key = (model, attribute)
+        try:
+            return _relation_cache[key]
+        except KeyError:
+            pass
+        relation = None
+        for model_field in model._meta.get_fields():
+            if not model_field.is_relation or model_field.related_model is None:
+                continue
+            if model_field.auto_created and not model_field.concrete:
+                accessor = model_field.get_accessor_name()
+            else:
+                accessor = model_field.name
+            if accessor == attribute:
+                relation = model_field
+                break
+        _relation_cache[key] = relation
+        return relation
+
+    def _related_cached(self, path):
+        instance = self.details_object
+        for part in path.split('__'):
+            model_field = instance._meta.get_field(part)
+            if not model_field.is_cached(instance):
+                return False
+            instance = model_field.get_cached_value(instance)
+            if instance is None:
+                return True
+        return True
+
+    @staticmethod
+    def _copy_related(instance, fetched, parts):
+        """
+        Attaches the first related object along `parts` that `fetched` has loaded but `instance` has not.
+
+        Nothing is attached once `instance`'s foreign key no longer matches the fetched object, e.g. if it was
+        changed in memory, so the relation is then loaded from the current key as without planning.
+        """
+        for part in parts:
+            model_field = instance._meta.get_field(part)
+            if not model_field.is_cached(fetched):
+                return
+            related = model_field.get_cached_value(fetched)
+            related_key = None if related is None else getattr(related, model_field.target_field.attname)
+            if getattr(instance, model_field.attname) != related_key:
+                return
+            if not model_field.is_cached(instance):
+                model_field.set_cached_value(instance, related)
+                return
+            instance = model_field.get_cached_value(instance)
+            fetched = related
+            if instance is None or fetched is None:
+                return
+
+    def load_related(self, fields):
+        """
+        Loads the related objects needed by `fields` onto `details_object` before the values are resolved.
+
+        Uncached `select_related` paths from `plan_related_lookups()` are fetched with a single query. The
+        loaded related objects are then attached to the existing `details_object`, so annotations and caches
+        on it are kept. `prefetch_related` paths use `prefetch_related_objects()`. Set `auto_related = False`
+        on the card class to disable this.
+
+        Args:
+            fields (iterable): Field names/paths, entry dicts or row tuples as accepted by `add_rows()`.
+        """
+        details_object = self.details_object
+        if not self.auto_related or not isinstance(details_object, Model) or details_object.pk is None:
+            return
+        select_related, prefetch_related = self.plan_related_lookups(fields)
+        select_related = [path for path in select_related if not self._related_cached(path)]
+        if select_related:
+            model = type(details_object)
+            fetched = (model._base_manager.using(details_object._state.db)
+                       .select_related(*select_related).filter(pk=details_object.pk).first())
+            if fetched is not None:
+                for path in select_related:
+                    self._copy_related(details_object, fetched, path.split('__'))
+        if prefetch_related:
+            try:
+                prefetch_related_objects([details_object], *sorted(prefetch_related))
+            except (AttributeError, ValueError):
+                # e.g. a property named like a relation; the values are then read lazily as without planning
+                pass
+
+    @staticmethod
+    def get_field_meta(model, field_name):
+        """
+        Returns `(field_type, has_display_method)` for `field_name` on `model`, cached per process.
+
+        `field_type` is the model field from `_meta.get_field()` (None if it is not a field, e.g. a property)
+        and `has_display_method` says whether `get_<field_name>_display` exists. The cache is cleared whenever
+        model classes are prepared, e.g. when the app registry is reloaded.
+        """
+        key = (model, field_name)
+        try:
+            return _field_meta_cache[key]
+        except KeyError:
+            pass
+        field_type = None
+        meta = getattr(model, '_meta', None)
+        if meta is not None:
+            try:
+                field_type = meta.get_field(field_name)
+            except FieldDoesNotExist:
+                pass
+        meta_info = (field_type, hasattr(model, f'get_{field_name}_display'))
+        _field_meta_cache[key] = meta_info
+        return meta_info
+
     def get_field_value(self, value, field, label):
         """
         Internal method to resolve a field value, label, and field type from a given object.
@@ -832,19 +1207,18 @@ class CardBase:
                         value = None
 
                     if old_value is not None and len(parts) > 0:
-                        try:
-                            field_type = old_value._meta.get_field(parts[-1])
-                        except FieldDoesNotExist:
-                            field_type = None
-                        try:
+                        field_type, has_display = self.get_field_meta(type(old_value), parts[-1])
+                        if has_display:
                             value = getattr(old_value, f'get_{parts[-1]}_display')
-                        except AttributeError:
-                            pass
                     if not hasattr(value, 'through') and callable(value):
                         value = value()
 
                     if label is None:
-                        label = self.label_from_field(field=field, field_type=field_type)
+                        label_key = (type(self), field, field_type, get_language())
+                        label = _field_label_cache.get(label_key)
+                        if label is None:
+                            label = self.label_from_field(field=field, field_type=field_type)
+                            _field_label_cache[label_key] = label
         return value, label, field_type
 
     def _add_many_to_many_field(self, label, query, query_filter=None, m2m_field=None,
@@ -894,7 +1268,9 @@ class CardBase:
         if query_filter is None:
             results = query.all()
         else:
-            results = query.filter(**query_filter)
+            results = self._filter_prefetched(query, query_filter)
+            if results is None:
+                results = query.filter(**query_filter)
         html = ''
         for result in results:
             if m2m_field is None:
@@ -919,6 +1295,106 @@ class CardBase:
                                         row_style=row_style,
                                         **kwargs)
 
+    prefetch_filter_lookups = {'exact': lambda a, b: a == b,
+                               'iexact': lambda a, b: str(a).lower() == str(b).lower(),
+                               'in': lambda a, b: a in b,
+                               'isnull': lambda a, b: (a is None) == b,
+                               'gt': lambda a, b: a is not None and a > b,
+                               'gte': lambda a, b: a is not None and a >= b,
+                               'lt': lambda a, b: a is not None and a < b,
+                               'lte': lambda a, b: a is not None and a <= b,
+                               'contains': lambda a, b: a is not None and str(b) in str(a),
+                               'icontains': lambda a, b: a is not None and str(b).lower() in str(a).lower()}
+
+    @classmethod
+    def _filter_prefetched(cls, query, query_filter):
+        """
+        Applies `query_filter` in Python to a related manager's `prefetch_related` results.
+
+        Supports fields of the related model, and the primary key of a forward relation (`company`,
+        `company_id`, `company__pk`), each optionally ending in one of `prefetch_filter_lookups`. Filter values
+        are converted with the field's `get_prep_value()`, as the database query would, and compared with the
+        field's `attname`, so relations are never loaded.
+
+        Returns:
+            list or None: The matching objects, or None if the relation was not prefetched or the filter cannot
+            be applied in Python (the caller then queries the database).
+        """
+        prefetched = getattr(getattr(query, 'instance', None), '_prefetched_objects_cache', {})
+        cache_name = getattr(query, 'prefetch_cache_name', None)
+        if cache_name not in prefetched:
+            return None
+        tests = []
+        for lookup, expected in query_filter.items():
+            parts = lookup.split('__')
+            lookup_name = parts.pop() if len(parts) > 1 and parts[-1] in cls.prefetch_filter_lookups else 'exact'
+            field = cls._prefetch_filter_field(query.model, parts)
+            if field is None:
+                return None
+            try:
+                expected = cls._prefetch_filter_value(field, lookup_name, expected)
+            except (ValidationError, ValueError, TypeError):
+                return None
+            if expected is None:
+                if lookup_name != 'exact':
+                    return None
+                lookup_name, expected = 'isnull', True
+            tests.append((field.attname, cls.prefetch_filter_lookups[lookup_name], expected))
+
+        def matches(obj):
+            return all(compare(getattr(obj, attname), expected) for attname, compare, expected in tests)
+
+        try:
+            return [obj for obj in prefetched[cache_name] if matches(obj)]
+        except TypeError:
+            # e.g. a naive datetime compared with an aware one
+            return None
+
+    @staticmethod
+    def _prefetch_filter_field(model, parts):
+        """
+        Returns the concrete field of `model` that `parts` filters on, or None if it cannot be read from the
+        instance without a query. A forward relation followed by its target field (`company__pk`) is the
+        relation itself.
+        """
+        try:
+            field = model._meta.pk if parts[0] == 'pk' else model._meta.get_field(parts[0])
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.many_to_many:
+            return None
+        if len(parts) == 1:
+            return field
+        if (len(parts) == 2 and field.is_relation and
+                parts[1] in ('pk', field.target_field.name, field.target_field.attname)):
+            return field
+        return None
+
+    @staticmethod
+    def _prefetch_filter_value(field, lookup_name, value):
+        """Converts a filter value for comparison with `field`'s attribute, raising an error if it can't."""
+        if lookup_name == 'isnull':
+            if not isinstance(value, bool):
+                raise ValueError('isnull requires a boolean')
+            return value
+        if lookup_name in ('iexact', 'contains', 'icontains'):
+            if not isinstance(field, (CharField, TextField)) or value is None:
+                raise ValueError('Text lookups are only applied to text fields')
+            return str(value)
+
+        def prep(item):
+            if item is None:
+                return None
+            if field.is_relation and isinstance(item, Model):
+                item = item.pk
+            return field.get_prep_value(item)
+
+        if lookup_name == 'in':
+            if not isinstance(value, (list, tuple, set, frozenset)):
+                raise ValueError('in requires a list of values')
+            return [item for item in map(prep, value) if item is not None]
+        return prep(value)
+
     def _add_entry_internal(self, value=None, field=None, label=None, default='N/A', link=None,
                             hidden=False, hidden_if_blank_or_none=None, hidden_if_zero=None, html_override=None,
                             value_method=None, value_type=None,
@@ -1108,17 +1584,12 @@ class CardBase:
             if (row_style is not None and row_style in self._row_styles) or self._default_row_styles is not None:
 
                 if row_style is not None:
-                    html_row_style = self._row_styles[row_style]
+                    compiled_row_style = self._row_styles[row_style]
                 else:
-                    html_row_style = self._row_styles[self._default_row_styles]
+                    compiled_row_style = self._row_styles[self._default_row_styles]
 
-                value_dict = {'value': value,
-                              'label': label,
-                              'link': link,
-                              **kwargs}
-                if menu is not None:
-                    value_dict['menu'] = menu.render()
-                row_style_html = html_row_style.format_map(defaultdict(lambda: '', value_dict))
+                row_style_html = compiled_row_style.render({'value': value, 'label': label, 'link': link},
+                                                           extra=kwargs, menu=menu)
 
             if css_class_method is not None:
                 css_class = css_class_method(value)
@@ -1166,31 +1637,31 @@ class CardBase:
                 else:
                     old_value = str(old_value)
 
-            entry = {'label': label,
-                     'html': value,
-                     'entry_css_class': entry_css_class,
-                     'css_class': css_class or '',
-                     'multiple_lines': multiple_parts,
-                     'link': link,
-                     'tooltip': tooltip,
-                     'value_link': value_link,
-                     'badge': badge,
-                     'icon': icon,
-                     'copy_to_clipboard': copy_to_clipboard,
-                     'menu': menu,
-                     'row_style_html': row_style_html,
-                     'prefix': prefix,
-                     'suffix': suffix,
-                     'status_dot': status_dot,
-                     'progress_bar': progress_bar,
-                     'image': image,
-                     'help_text': help_text,
-                     'popover': popover,
-                     'separator': separator,
-                     'rating': rating,
-                     'rating_range': rating_range,
-                     'old_value': old_value,
-                     **kwargs}
+            entry = CardEntry(label=label,
+                              html=value,
+                              entry_css_class=entry_css_class,
+                              css_class=css_class or '',
+                              multiple_lines=multiple_parts,
+                              link=link,
+                              tooltip=tooltip,
+                              value_link=value_link,
+                              badge=badge,
+                              icon=icon,
+                              copy_to_clipboard=copy_to_clipboard,
+                              menu=menu,
+                              row_style_html=row_style_html,
+                              prefix=prefix,
+                              suffix=suffix,
+                              status_dot=status_dot,
+                              progress_bar=progress_bar,
+                              image=image,
+                              help_text=help_text,
+                              popover=popover,
+                              separator=separator,
+                              rating=rating,
+                              rating_range=rating_range,
+                              old_value=old_value,
+                              **kwargs)
             return entry
 
     def get_value_from_type(self, value, value_type, field_type, is_default, **kwargs):
@@ -1246,12 +1717,18 @@ class CardBase:
         Side Effects:
             - Mutates `self.extra_card_info` and potentially `self.view.tables`.
 
+        If the view has `table_setup_only` set (see `CardMixin.setup_single_table()`), datatables other than
+        that one are not built.
+
         Notes:
             - This method is called internally, usually during rendering or card setup.
             - Assumes `self.view` has the required setup/data methods.
         """
+        table_setup_only = getattr(self.view, 'table_setup_only', None)
         if (self.group_type in (CARD_TYPE_DATATABLE, CARD_TYPE_ORDERED_DATATABLE) and
                 self.extra_card_info['datatable'] is None):
+            if table_setup_only is not None and table_setup_only != self.code:
+                return
 
             datatable_model = self.extra_card_info['datatable_model']
             table_id = self.extra_card_info['datatable_id']
@@ -1289,13 +1766,16 @@ class CardBase:
                 getattr(self.view, 'get_details_data')(card=self, details_object=self.details_object)
 
     def _process_linked_datatables(self):
-        """Initialize all datatables for a linked datatables card."""
+        """Initialize all datatables for a linked datatables card, or only the view's `table_setup_only` tier."""
         datatables_config = self.extra_card_info.get('datatables', [])
         initialized_tables = []
         total = len(datatables_config)
+        table_setup_only = getattr(self.view, 'table_setup_only', None)
 
         for i, dt_config in enumerate(datatables_config):
             table_id = dt_config['id']
+            if table_setup_only is not None and table_setup_only != table_id:
+                continue
             model = dt_config['model']
             title = dt_config.get('title', table_id.replace('_', ' ').title())
             linked_field = dt_config.get('linked_field')
@@ -1320,9 +1800,12 @@ class CardBase:
                 table.columns.append(arrow_col)
 
             # First table loads data normally; subsequent linked tables start empty
-            if i > 0 and linked_field:
+            server_side = dt_config.get('server_side', False)
+            if (i > 0 and linked_field) or server_side:
                 table.ajax_data = False
                 table.table_data = []
+            if server_side:
+                table.search_fields = dt_config.get('search_fields')
 
             if hasattr(self.view, 'tables'):
                 self.view.tables[table_id] = table
@@ -1348,6 +1831,8 @@ class CardBase:
                 'index': i,
                 'row_link': row_link_url,
                 'menu': menu,
+                'server_side': server_side,
+                'page_length': dt_config.get('page_length', 100),
             })
 
         self.extra_card_info['initialized_tables'] = initialized_tables
@@ -1464,7 +1949,10 @@ class CardBase:
         Behavior:
             - Fetches current `order_field` values for the specified IDs.
             - Compares current values to the desired new order.
-            - Updates and saves objects where the order has changed.
+            - Inside one transaction, either:
+                * loads all changed objects with one query and calls `save()` on each (default), or
+                * if `order_save_instances=False` was passed to the card, writes every changed order
+                  with a single `UPDATE ... CASE WHEN`, skipping `save()` and its signals.
 
         Notes:
             - Requires `self.extra_card_info['order_field']` to be set (e.g. 'order').
@@ -1472,14 +1960,21 @@ class CardBase:
             - Minimizes writes by only updating rows where the order actually differs.
         """
         order_field = self.extra_card_info['order_field']
-        ids = [x[1] for x in kwargs['sort']]
-        current_sort = dict(self.extra_card_info['datatable_model'].objects.filter(id__in=ids).
-                            values_list('id', order_field))
-        for s in kwargs['sort']:
-            if current_sort.get(s[1]) != s[0]:
-                o = self.extra_card_info['datatable_model'].objects.get(id=s[1])
-                setattr(o, order_field, s[0])
-                o.save()
+        model = self.extra_card_info['datatable_model']
+        new_sort = {model._meta.pk.to_python(x[1]): x[0] for x in kwargs['sort']}
+        current_sort = dict(model.objects.filter(id__in=new_sort.keys()).values_list('id', order_field))
+        changed = {pk: order for pk, order in new_sort.items() if current_sort.get(pk) != order}
+        if not changed:
+            return
+        with transaction.atomic():
+            if self.extra_card_info.get('order_save_instances', True):
+                for o in model.objects.filter(id__in=changed.keys()):
+                    setattr(o, order_field, changed[o.id])
+                    o.save()
+            else:
+                whens = [When(id=pk, then=Value(order)) for pk, order in changed.items()]
+                model.objects.filter(id__in=changed.keys()).update(
+                    **{order_field: Case(*whens, output_field=model._meta.get_field(order_field))})
 
     @staticmethod
     def label_from_field(field, field_type):
@@ -1543,6 +2038,7 @@ class CardBase:
         """
         if extra_row_kwargs is None:
             extra_row_kwargs = {}
+        self.load_related(args)
         for arg in args:
             if isinstance(arg, str):
                 self.add_entry(field=arg, default=default, hidden=hidden, **extra_row_kwargs)
@@ -1555,6 +2051,14 @@ class CardBase:
             elif isinstance(arg, (list, tuple)):
                 self.add_row(*arg)
 
+    @staticmethod
+    def _export_value(value):
+        if isinstance(value, str):
+            return re.sub(r'<[^>]+>', '', value)
+        elif isinstance(value, (list, tuple)):
+            return ', '.join(re.sub(r'<[^>]+>', '', str(v)) for v in value)
+        return str(value)
+
     def get_export_data(self):
         data = []
         for row in self.rows:
@@ -1562,17 +2066,183 @@ class CardBase:
                 continue
             for entry in row.get('entries', []):
                 label = entry.get('label', '')
-                value = entry.get('html', '')
-                if isinstance(value, str):
-                    value = re.sub(r'<[^>]+>', '', value)
-                elif isinstance(value, (list, tuple)):
-                    value = ', '.join(re.sub(r'<[^>]+>', '', str(v)) for v in value)
-                else:
-                    value = str(value)
+                value = self._export_value(entry.get('html', ''))
                 data.append({'label': label or '', 'value': value})
         return data
 
+    def get_row_search_text(self, row):
+        """
+        Returns the lower-case text a `window_rows` search matches against for `row`.
+
+        Entries are flattened to their labels and values as in `get_export_data()`. HTML rows use their text.
+
+        Args:
+            row (dict): A row from `self.rows`.
+
+        Returns:
+            str: The searchable text.
+        """
+        if row.get('type') == 'html':
+            return self._export_value(str(row.get('html', ''))).lower()
+        return ' '.join(f"{self._export_value(entry.get('label') or '')} {self._export_value(entry.get('html', ''))}"
+                        for entry in row.get('entries', [])).lower()
+
+    def get_window(self, start=0, search=''):
+        """
+        Returns one window of rows for a `window_rows` card, optionally filtered by a search.
+
+        Args:
+            start (int): Index of the first row, counted within the search results.
+            search (str): Text that each row's `get_row_search_text()` must contain.
+
+        Returns:
+            tuple: The rows and the start of the next window, or None if there are no more rows.
+        """
+        rows = self.rows
+        if search:
+            search = search.lower()
+            rows = [row for row in rows if search in self.get_row_search_text(row)]
+        end = start + self.window_rows
+        return rows[start:end], (end if end < len(rows) else None)
+
+    def get_visible_rows(self):
+        return self.rows[:self.window_rows]
+
+    def has_more_rows(self):
+        return len(self.rows) > self.window_rows
+
+    def get_treegrid_config(self):
+        """
+        Returns the options for `CardsTreegrid.init()` in `cards/treegrid/js/treegrid.js`.
+
+        The treegrid template renders this with `json_script`, so the script itself is a static file shared by
+        every treegrid on the page and cached by the browser.
+
+        Returns:
+            dict: JSON-serialisable treegrid options, keyed by the `add_treegrid_card()` argument names without
+            the `treegrid_` prefix.
+        """
+        info = self.extra_card_info
+        return {
+            'card_code': self.code,
+            'data_url': info['treegrid_data_url'],
+            'data_mode': info['treegrid_data_mode'],
+            'static_data': info['treegrid_static_data'],
+            'read_only': bool(info['treegrid_read_only']),
+            'indentation': info['treegrid_indentation'],
+            'icon_map': info['treegrid_icon_map'],
+            'columns': info['treegrid_columns'],
+            'expand_all': bool(info['treegrid_expand_all']),
+            'filter_auto_expand': bool(info['treegrid_filter_auto_expand']),
+            'show_column_filters': bool(info['treegrid_show_column_filters'] or self.column_search),
+            'toolbar': info['treegrid_toolbar'],
+            'node_column': info['treegrid_node_column'],
+            'save_mode': info['treegrid_save_mode'],
+            'save_delay': info['treegrid_save_delay'],
+            'checkbox': bool(info['treegrid_checkbox']),
+            'checkbox_column': info['treegrid_checkbox_column'],
+            'context_menu': [i for i in info['treegrid_context_menu'] if isinstance(i, dict)],
+            'resizable': bool(info['treegrid_resizable']),
+            'pagination': bool(info['treegrid_pagination']),
+            'page_size': info['treegrid_page_size'] or 50,
+            'server_side': bool(info['treegrid_server_side']),
+            'js_filters': info['treegrid_js_filters'],
+            'current_node': info['treegrid_current_node'],
+            'sortable': bool(info['treegrid_sortable']),
+            'drag_drop': bool(info['treegrid_drag_drop']),
+            'drag_cross_level': bool(info['treegrid_drag_cross_level']),
+            'form_field': info['treegrid_form_field'],
+            'row_click': info['treegrid_row_click'],
+            'default_selected': info['treegrid_default_selected'] or [],
+        }
+
+    @cached_property
+    def treegrid_config_json(self):
+        """
+        The `get_treegrid_config()` options as JSON for the treegrid template's config `<script>` tag.
+
+        Built when the template first reads it, so cards that are never rendered (or are served from the render
+        cache) never serialise their static data. `treegrid_fast_json` switches to orjson when it is installed.
+        """
+        return mark_safe(script_json(self.get_treegrid_config(), fast=self.extra_card_info['treegrid_fast_json']))
+
+    def render_rows(self, rows):
+        """
+        Renders `rows` with the card's list markup, for appending to a `window_rows` card.
+
+        Args:
+            rows (list): Rows from `self.rows`.
+
+        Returns:
+            str: Rendered HTML.
+        """
+        template_name = self.template_name or self.template_defaults.get(self.group_type)
+        context = {**self.templates.get(template_name, self.templates['default']).get('context', {}),
+                   'card': self, 'request': self.request, 'rows': rows}
+        if self.fast_render:
+            from cards.fast_render import render_default_rows
+            return render_default_rows(rows, item_css_class=context.get('item_css_class', ''),
+                                       item_css=context.get('item_css', ''))
+        return render_to_string('cards/standard/_default_rows.html', context)
+
+    def get_render_cache_key(self):
+        """
+        Returns the key used to cache this card's rendered HTML, or None if caching is disabled.
+
+        The key combines `cache_key`, the `details_object` model and primary key, and a version taken from
+        `cache_version` (called with `details_object` if callable) or, failing that, `details_object.modified`.
+        A new version therefore produces a new key, so stale HTML is never served after the object changes.
+
+        Returns:
+            str or None: The cache key.
+        """
+        if self.cache_key is None:
+            return None
+        details_object = self.details_object
+        if callable(self.cache_version):
+            version = self.cache_version(details_object)
+        elif self.cache_version is not None:
+            version = self.cache_version
+        else:
+            version = getattr(details_object, 'modified', None)
+        meta = getattr(details_object, '_meta', None)
+        parts = [str(self.cache_key),
+                 meta.label_lower if meta is not None else '',
+                 str(getattr(details_object, 'pk', '')),
+                 str(version)]
+        return 'django_cards.' + hashlib.md5(':'.join(parts).encode()).hexdigest()
+
+    def get_reload_subscriptions(self):
+        """
+        Returns the signed tokens an `ajax_reload` card sends to `CardReloadConsumer` to receive its updates.
+
+        The tokens name the groups from `cards.channels.card_group_name()` for this card, which receives
+        card-wide updates, and for this card and its `details_object`, which receives updates for that object.
+
+        Returns:
+            list[str]: The subscription tokens.
+        """
+        groups = [card_group_name(self.code)]
+        object_group = card_group_name(self.code, self.details_object)
+        if object_group not in groups:
+            groups.append(object_group)
+        return [sign_subscription(group) for group in groups]
+
     def _render_template(self, override_card_context=None):
+        render_cache_key = self.get_render_cache_key() if override_card_context is None and not self.lazy else None
+        if render_cache_key is not None:
+            cache = caches[self.cache_alias]
+            html = cache.get(render_cache_key)
+            if html is None:
+                html = self._render_template_uncached()
+                if self.cache_timeout is not None:
+                    cache.set(render_cache_key, str(html), self.cache_timeout)
+                else:
+                    cache.set(render_cache_key, str(html))
+            return mark_safe(html)
+        return self._render_template_uncached(override_card_context)
+
+    def _render_template_uncached(self, override_card_context=None):
         extra_card_context = self.extra_card_context
         context = {'card': self,
                    'request': self.request,
@@ -1591,7 +2261,7 @@ class CardBase:
         if override_card_context is not None:
             context = {**context, **override_card_context}
 
-        template_name = self.template_name
+        template_name = 'lazy' if self.lazy else self.template_name
         if template_name is None:
             template_name = self.template_defaults.get(self.group_type)
 
@@ -1608,11 +2278,11 @@ class CardBase:
         """
         Renders the card as an HTML string using the appropriate template and context.
 
-        When ajax_reload is enabled, wraps the output in a container div that serves
+        When ajax_reload or lazy is enabled, wraps the output in a container div that serves
         as the stable target for AJAX content replacement.
         """
         html = self._render_template(override_card_context)
-        if self.ajax_reload:
+        if self.ajax_reload or self.lazy:
             return mark_safe(f'<div id="{self.code}_ajax">{html}</div>')
         return html
 
@@ -1,11 +1,21 @@
+import json
+from functools import reduce
+from operator import or_
+
 from ajax_helpers.mixins import AjaxHelpers
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.template.loader import render_to_string
 from django.utils.safestring import mark_safe
 from django_menus.menu import MenuMixin
 
-from cards.base import CARD_TYPE_HTML
+from cards.base import CARD_TYPE_HTML, CardBase
 from cards.card_list.base import CardListBaseMixin
 from cards.standard import CardMixin
 
+LIST_CURSOR_SALT = 'cards.card_list.cursor'
+
 
 class CardListMixin(CardListBaseMixin):
     """
@@ -24,6 +34,11 @@ class CardListMixin(CardListBaseMixin):
         menu_display (str): Optional string controlling how the list menu is displayed.
         list_template_name (str): Template used for rendering the list card.
         model (Django Model): Model used to fetch list entries.
+        list_page_size (int or None): If set, only this many entries (plus the selected one) are rendered with the
+            page and further entries are fetched with AJAX as the list is scrolled.
+        list_cursor_fields (tuple): Ordering used for keyset pagination. Prefix with '-' for descending. The
+            primary key is appended if not present so the cursor is unique. Fields should not be nullable.
+        list_search_fields (tuple): Fields searched (`icontains`) from the list search box. Paged lists only.
     """
     list_class = 'col-sm-5 col-md-4 col-lg-3 float-left'
     details_class = 'col-sm-7 col-md-8 col-lg-9 float-left'
@@ -37,6 +52,10 @@ class CardListMixin(CardListBaseMixin):
 
     model = None
 
+    list_page_size = None
+    list_cursor_fields = ('pk',)
+    list_search_fields = ()
+
     def setup_cards(self):
         """
         Sets up the list and detail cards, including layout configuration and default selection.
@@ -50,7 +69,8 @@ class CardListMixin(CardListBaseMixin):
                            selected_id=selected_id,
                            list_menu=list_menu,
                            list_template_name=self.list_template_name,
-                           empty_list_message=self.empty_list_message())
+                           empty_list_message=self.empty_list_message(),
+                           extra_card_context=self.get_list_page_context())
 
         self.add_card('details_card',
                       group_type=CARD_TYPE_HTML,
@@ -146,6 +166,7 @@ class CardListMixin(CardListBaseMixin):
 
     def __init__(self):
         self.list_entries = []
+        self.list_next_cursor = None
         super().__init__()
 
     def add_list_entry(self, pk, name, colour=None, row_class=None):
@@ -207,13 +228,158 @@ class CardListMixin(CardListBaseMixin):
 
         Each entry is added using `add_list_entry()`. The formatting includes
         retrieving display name and optional colour per entry.
+
+        If `list_page_size` is set only the first page is added, plus the entry selected in the URL slug
+        if it is not on that page.
+        """
+        if self.list_page_size:
+            entry_objects, self.list_next_cursor = self.get_list_page()
+            selected_id = self.slug.get('pk')
+            if selected_id and selected_id != '-' and str(selected_id) not in {str(o.pk) for o in entry_objects}:
+                selected_object = self.get_list_entries().filter(pk=selected_id).first()
+                if selected_object is not None:
+                    entry_objects.insert(0, selected_object)
+        else:
+            entry_objects = self.get_list_entries()
+        for entry_object in entry_objects:
+            self.add_list_entry_object(entry_object)
+
+    def add_list_entry_object(self, entry_object):
+        """
+        Adds a list entry for a model instance using `get_list_entry_name()` and `get_list_colour()`.
+
+        Args:
+            entry_object (object): The model instance representing a list entry.
+        """
+        name = self.get_list_entry_name(entry_object=entry_object)
+        colour = self.get_list_colour(entry_object=entry_object)
+        self.add_list_entry(pk=entry_object.pk,
+                            name=name,
+                            colour=colour)
+
+    def get_list_page_context(self):
+        """
+        Returns the extra list card context used for paged lists, or None if `list_page_size` is not set.
+
+        Returns:
+            dict or None: Template context for the paging and search script.
+        """
+        if not self.list_page_size:
+            return None
+        return {'list_paged': True,
+                'list_next_cursor': self.list_next_cursor,
+                'list_search': bool(self.list_search_fields),
+                'list_page_button_action_name': 'list_page'}
+
+    def get_list_ordering(self):
+        """
+        Returns the `order_by()` arguments used for keyset pagination.
+
+        Returns:
+            list: `list_cursor_fields` with the primary key appended if not already included.
+        """
+        ordering = list(self.list_cursor_fields)
+        if not {'pk', '-pk', self.model._meta.pk.name, f'-{self.model._meta.pk.name}'} & set(ordering):
+            ordering.append('pk')
+        return ordering
+
+    def search_list_entries(self, queryset, search):
+        """
+        Filters the list queryset for the search box text.
+
+        By default, each field in `list_search_fields` is matched with `icontains`. Override for
+        other search behaviour.
+
+        Args:
+            queryset (QuerySet): The list entries queryset.
+            search (str): The search text.
+
+        Returns:
+            QuerySet: The filtered queryset.
+        """
+        if not search or not self.list_search_fields:
+            return queryset
+        return queryset.filter(reduce(or_, [Q(**{f'{field}__icontains': search})
+                                            for field in self.list_search_fields]))
+
+    @staticmethod
+    def _cursor_value(entry_object, field):
+        value = entry_object
+        for part in field.lstrip('-').split('__'):
+            value = getattr(value, part)
+        return value
+
+    @staticmethod
+    def _load_cursor(cursor, ordering):
+        """Returns the ordering values held by a signed `cursor`, or None if it is invalid or does not match."""
+        try:
+            values = json.loads(signing.Signer(salt=LIST_CURSOR_SALT).unsign(cursor))
+        except (signing.BadSignature, ValueError, TypeError):
+            return None
+        if not isinstance(values, list) or len(values) != len(ordering):
+            return None
+        return values
+
+    def get_list_page(self, cursor=None, search=''):
+        """
+        Returns one page of list entries using keyset (cursor) pagination.
+
+        Entries are ordered by `get_list_ordering()`. Rather than an offset, the cursor holds the ordering values
+        of the last entry returned so the next page starts with an indexed range filter. Cursors are signed, like
+        channel subscriptions, and an invalid one returns the first page.
+
+        Args:
+            cursor (str, optional): Cursor returned with the previous page. None for the first page.
+            search (str, optional): Search text passed to `search_list_entries()`.
+
+        Returns:
+            tuple: (list of model instances, next cursor or None if this is the last page).
+        """
+        ordering = self.get_list_ordering()
+        queryset = self.search_list_entries(self.get_list_entries(), search).order_by(*ordering)
+        values = self._load_cursor(cursor, ordering) if cursor else None
+        if values is not None:
+            after_cursor = []
+            for index, field in enumerate(ordering):
+                lookup = 'lt' if field.startswith('-') else 'gt'
+                condition = Q(**{f'{field.lstrip("-")}__{lookup}': values[index]})
+                for previous_index, previous_field in enumerate(ordering[:index]):
+                    condition &= Q(**{previous_field.lstrip('-'): values[previous_index]})
+                after_cursor.append(condition)
+            queryset = queryset.filter(reduce(or_, after_cursor))
+        entry_objects = list(queryset[:self.list_page_size + 1])
+        if len(entry_objects) <= self.list_page_size:
+            return entry_objects, None
+        entry_objects = entry_objects[:self.list_page_size]
+        next_cursor = json.dumps([self._cursor_value(entry_objects[-1], field) for field in ordering],
+                                 cls=DjangoJSONEncoder)
+        return entry_objects, signing.Signer(salt=LIST_CURSOR_SALT).sign(next_cursor)
+
+    def button_list_page(self, cursor=None, search='', reset=False, **kwargs):
+        """
+        Ajax endpoint used by paged lists to fetch the next page or search results.
+
+        Args:
+            cursor (str, optional): Cursor of the last loaded page.
+            search (str, optional): Search box text.
+            reset (bool, optional): True when the search has changed and the list should be replaced. Also set
+                when the cursor is invalid, as the first page is then returned.
+            **kwargs: Additional keyword arguments for extensibility.
+
+        Returns:
+            JsonResponse: A `list_page` command with the rendered entries and the next cursor.
         """
-        for entry_object in self.get_list_entries():
-            name = self.get_list_entry_name(entry_object=entry_object)
-            colour = self.get_list_colour(entry_object=entry_object)
-            self.add_list_entry(pk=entry_object.pk,
-                                name=name,
-                                colour=colour)
+        if cursor and self._load_cursor(cursor, self.get_list_ordering()) is None:
+            cursor, reset = None, True
+        entry_objects, next_cursor = self.get_list_page(cursor=cursor, search=search)
+        for entry_object in entry_objects:
+            self.add_list_entry_object(entry_object)
+        html = ''
+        if self.list_entries:
+            context = dict(CardBase.templates[self.list_template_name].get('context', {}))
+            context['entries'] = self.list_entries
+            html = render_to_string('cards/standard/_list_entries.html', context)
+        return self.command_response('list_page', html=html, cursor=next_cursor, search=search, reset=reset)
 
 
 class CardList(AjaxHelpers, MenuMixin, CardMixin, CardListMixin):
@@ -1,6 +1,7 @@
 import json
 
 from ajax_helpers.mixins import AjaxHelpers
+from django.http import JsonResponse
 from django_menus.menu import MenuMixin
 
 from cards.base import CARD_TYPE_HTML
@@ -17,9 +18,12 @@ class CardTreeMixin(CardListBaseMixin):
 
     Attributes:
         show_details_for_parents (bool): If True, allows parent nodes to show detail views.
+        lazy_tree (bool): If True, only the root nodes and the path to the selected node are embedded in the page.
+            Other children are loaded by jsTree on expand via `get_tree_children()`.
     """
 
     show_details_for_parents = False
+    lazy_tree = False
     tree_card_group_id = 'tree_card_group'
     details_card_group_id = 'details_card_group'
 
@@ -45,23 +49,24 @@ class CardTreeMixin(CardListBaseMixin):
 
         The tree is populated using data from `get_tree_data()` and marks the appropriate node as selected
         based on the current slug or default ID. Also expands parent nodes as needed.
+
+        With `lazy_tree` the data comes from `get_lazy_tree_data()`, which has already marked the selected path.
         """
         list_menu = self.get_list_menu()
 
-        for row in tree_data:
-            if str(row['id']) == str(self.selected_id):
-                if 'state' in row:
-                    row['state']['selected'] = True
-                else:
-                    row['state'] = {'selected': True}
-                self.open_parent(tree_data=tree_data, parent_id=row['parent'])
-                break
+        if not self.lazy_tree:
+            rows_by_id = {str(row['id']): row for row in reversed(tree_data)}
+            row = rows_by_id.get(str(self.selected_id))
+            if row is not None:
+                row.setdefault('state', {})['selected'] = True
+                self.open_parent(tree_data=tree_data, parent_id=row['parent'], rows_by_id=rows_by_id)
 
         context = {'list_title': self.list_title,
                    'data': json.dumps(tree_data),
                    'selected_id': self.selected_id,
                    'details_button_action_name': 'details_html',
-                   'show_details_for_parents': self.show_details_for_parents}
+                   'show_details_for_parents': self.show_details_for_parents,
+                   'lazy_tree': self.lazy_tree}
 
         card_kwargs = dict(
             title=self.list_title,
@@ -74,24 +79,27 @@ class CardTreeMixin(CardListBaseMixin):
         card = self.add_card('tree_card', **card_kwargs)
         return card
 
-    def open_parent(self, tree_data, parent_id):
+    def open_parent(self, tree_data, parent_id, rows_by_id=None):
         """
-        Recursively opens parent nodes to ensure visibility of the selected child node.
+        Opens parent nodes to ensure visibility of the selected child node.
+
+        Ancestors are looked up in an id to row index, so opening a path costs one dict lookup per level.
 
         Args:
             tree_data (list): The full tree data structure.
             parent_id (str): The parent node ID to expand.
+            rows_by_id (dict, optional): Index of `tree_data` rows by string id. Built from `tree_data` if omitted.
         """
-        if parent_id == '#':
-            return
-        for row in tree_data:
-            if row['id'] == parent_id:
-                if 'state' in row:
-                    row['state']['opened'] = True
-                else:
-                    row['state'] = {'opened': True}
-                self.open_parent(tree_data=tree_data, parent_id=row['parent'])
+        if rows_by_id is None:
+            rows_by_id = {str(row['id']): row for row in reversed(tree_data)}
+        opened = set()
+        while parent_id != '#' and str(parent_id) not in opened:
+            row = rows_by_id.get(str(parent_id))
+            if row is None:
                 break
+            opened.add(str(parent_id))
+            row.setdefault('state', {})['opened'] = True
+            parent_id = row['parent']
 
     def get_tree_card_extra_kwargs(self):
         return {}
@@ -104,7 +112,10 @@ class CardTreeMixin(CardListBaseMixin):
         it adds both the tree navigation card and the blank detail card.
         """
         selected_id = self.selected_id
-        tree_data = self.get_tree_data(selected_id=selected_id)
+        if self.lazy_tree:
+            tree_data = self.get_lazy_tree_data(selected_id=selected_id)
+        else:
+            tree_data = self.get_tree_data(selected_id=selected_id)
         extra_tree_card_kwargs = self.get_tree_card_extra_kwargs()
         self.add_tree_card(tree_data=tree_data, extra_kwargs=extra_tree_card_kwargs)
         self.add_card('details_card',
@@ -128,6 +139,73 @@ class CardTreeMixin(CardListBaseMixin):
         """
         return []
 
+    def get_tree_children(self, parent_id):
+        """
+        Returns the child nodes of `parent_id` for a `lazy_tree`.
+
+        Nodes use jsTree's nested format: `id`, `text` and optionally `icon` and `state`. Set `children` to True
+        for nodes that have children so jsTree shows them as expandable and fetches them when opened.
+
+        Args:
+            parent_id (str): The parent node ID, or `'#'` for the root nodes.
+
+        Returns:
+            list: A list of dictionaries representing tree nodes.
+        """
+        return []
+
+    def get_tree_path(self, node_id):
+        """
+        Returns the ancestor IDs of `node_id`, from the root down, for a `lazy_tree`.
+
+        These nodes are embedded opened so the selected node is visible when the page loads.
+
+        Args:
+            node_id (str): The selected node ID.
+
+        Returns:
+            list: Ancestor node IDs, excluding `node_id` itself.
+        """
+        return []
+
+    def get_lazy_tree_data(self, selected_id):
+        """
+        Returns the root nodes, with the children along the path to `selected_id` embedded and opened.
+
+        Args:
+            selected_id (str): The currently selected node ID.
+
+        Returns:
+            list: Nested tree nodes for jsTree.
+        """
+        tree_data = self.get_tree_children(parent_id='#')
+        if not selected_id:
+            return tree_data
+        nodes_by_id = {str(node['id']): node for node in tree_data}
+        for ancestor_id in self.get_tree_path(node_id=selected_id):
+            node = nodes_by_id.get(str(ancestor_id))
+            if node is None:
+                break
+            node['children'] = self.get_tree_children(parent_id=ancestor_id)
+            node.setdefault('state', {})['opened'] = True
+            nodes_by_id.update({str(child['id']): child for child in node['children']})
+        node = nodes_by_id.get(str(selected_id))
+        if node is not None:
+            node.setdefault('state', {})['selected'] = True
+        return tree_data
+
+    def ajax_tree_children(self, parent_id, **kwargs):
+        """
+        Ajax endpoint used by jsTree to load the children of a node in a `lazy_tree`.
+
+        Args:
+            parent_id (str): The node being opened.
+
+        Returns:
+            JsonResponse: The list of child nodes from `get_tree_children()`.
+        """
+        return JsonResponse(self.get_tree_children(parent_id=parent_id), safe=False)
+
 
 class CardTree(AjaxHelpers, MenuMixin, CardMixin, CardTreeMixin):
     """
@@ -35,26 +35,175 @@ Setup:
     The client will receive the message and call reload_card() automatically,
     which triggers an AJAX round-trip through button_reload_card() to fetch
     fresh HTML for that card.
+
+    5. To push the card HTML itself, render it once on the server and broadcast it:
+
+        def button_save(self, **kwargs):
+            # ... save logic ...
+            self.push_card('my_card')
+            return self.command_response('null')
+
+    Every client subscribed to the card replaces #my_card_ajax with the pushed
+    HTML without making a request, so one change costs one render instead of
+    one per client. The HTML is only sent to the card's group for its
+    details_object, never to the global group. It is rendered for the user
+    who pushed it, so only push cards that show everyone the same data.
+
+Subscriptions:
+    Each card with ajax_reload=True asks the consumer to join the group for
+    that card, and the group for that card and its details_object. The
+    helpers below publish to those groups, so a socket only receives updates
+    for the cards on its page. Subscriptions are signed by the server, so a
+    client can only join groups for cards it was sent.
+
+    Sockets also stay in the global card_updates group, so reloads sent to it
+    as in step 4 still reach every client. The client ignores reloads for
+    cards that are not on its page.
+
+    Publish to those groups from a model save, e.g. in AppConfig.ready():
+
+        from cards.channels import reload_cards_on_save
+
+        reload_cards_on_save(Company, 'company_details')
+
+    Or directly with send_card_reload('company_details', obj=company), or
+    send_card_reload('company_details') to reload it for every object.
 """
+import hashlib
+import re
+
+from django.core import signing
+from django.db import transaction
+from django.db.models import Model
+from django.db.models.signals import post_save
+
+CARD_UPDATES_GROUP = 'card_updates'
+SUBSCRIPTION_SALT = 'cards.channels.subscription'
+
+
+def card_group_name(card_code, obj=None):
+    """
+    Returns the channel layer group for `card_code`, scoped to `obj` if it is a saved model instance.
+
+    Args:
+        card_code (str): The card code.
+        obj (Model, optional): The card's details_object.
+
+    Returns:
+        str: e.g. `card_updates.company_details.cards_examples.company.12`.
+    """
+    parts = [CARD_UPDATES_GROUP, str(card_code)]
+    if isinstance(obj, Model) and obj.pk is not None:
+        parts += [obj._meta.app_label, obj._meta.model_name, str(obj.pk)]
+    group_name = re.sub(r'[^\w.-]', '_', '.'.join(parts))
+    if len(group_name) >= 100:
+        group_name = f'{CARD_UPDATES_GROUP}.{hashlib.md5(group_name.encode()).hexdigest()}'
+    return group_name
+
+
+def sign_subscription(group_name):
+    """Returns a token the client sends to CardReloadConsumer to join `group_name`."""
+    return signing.Signer(salt=SUBSCRIPTION_SALT).sign(group_name)
+
+
+def unsign_subscription(token):
+    """Returns the group name for a subscription token, or None if the token is invalid."""
+    try:
+        return signing.Signer(salt=SUBSCRIPTION_SALT).unsign(token)
+    except (signing.BadSignature, TypeError):
+        return None
+
+
+def reload_cards_on_save(model, *card_codes, per_object=True):
+    """
+    Sends a reload for `card_codes` to their subscribers whenever an instance of `model` is saved.
+
+    The message is sent once the transaction commits, to the card's object group if `per_object`,
+    otherwise to the card's group.
+
+    Args:
+        model (type): The model class to watch.
+        *card_codes (str): Codes of the cards that display the model.
+        per_object (bool): Scope the reload to the saved instance.
+
+    Returns:
+        function: The connected post_save receiver.
+    """
+    def reload_cards(sender, instance, **kwargs):
+        obj = instance if per_object else None
+        transaction.on_commit(lambda: [send_card_reload(card_code, obj=obj) for card_code in card_codes])
+
+    post_save.connect(reload_cards, sender=model, weak=False,
+                      dispatch_uid=f'cards_reload.{model._meta.label_lower}.{".".join(card_codes)}')
+    return reload_cards
+
+
 try:
     from asgiref.sync import async_to_sync
     from channels.generic.websocket import JsonWebsocketConsumer
+    from channels.layers import get_channel_layer
+
+    def send_card_reload(card_code, group_name=None, obj=None):
+        """
+        Tell clients showing `card_code` (for `obj`) to reload it through button_reload_card().
+
+        Without `obj` this reaches every client showing the card, whatever its details_object.
+        """
+        async_to_sync(get_channel_layer().group_send)(
+            group_name or card_group_name(card_code, obj),
+            {'type': 'reload_card', 'card': card_code}
+        )
+
+    def send_card_html(card_code, html, group_name=None, obj=None):
+        """
+        Send pre-rendered `html` for `card_code` (for `obj`) to the clients showing it.
+
+        The HTML is only sent to the card's own group, never to the global group, as it was rendered for one
+        user and object.
+        """
+        async_to_sync(get_channel_layer().group_send)(
+            group_name or card_group_name(card_code, obj),
+            {'type': 'card_html', 'card': card_code, 'html': html}
+        )
 
     class CardReloadConsumer(JsonWebsocketConsumer):
-        """WebSocket consumer that pushes card reload commands to connected clients."""
+        """WebSocket consumer that pushes card reloads and pre-rendered card HTML to connected clients."""
 
-        group_name = 'card_updates'
+        group_name = CARD_UPDATES_GROUP
+        max_subscriptions = 200
 
         def connect(self):
+            self.subscribed_groups = set()
             async_to_sync(self.channel_layer.group_add)(
                 self.group_name, self.channel_name
             )
             self.accept()
 
         def disconnect(self, close_code):
-            async_to_sync(self.channel_layer.group_discard)(
-                self.group_name, self.channel_name
-            )
+            for group in self.subscribed_groups | {self.group_name}:
+                async_to_sync(self.channel_layer.group_discard)(
+                    group, self.channel_name
+                )
+
+        def receive_json(self, content, **kwargs):
+            """
+            Join or leave card groups: `{'subscribe': [token, ...]}` or `{'unsubscribe': [token, ...]}`.
+
+            The socket stays in the global group, which only carries reloads; the client ignores reloads for
+            cards that are not on its page.
+            """
+            for token in content.get('unsubscribe') or []:
+                group = unsign_subscription(token)
+                if group in self.subscribed_groups:
+                    self.subscribed_groups.discard(group)
+                    async_to_sync(self.channel_layer.group_discard)(group, self.channel_name)
+            for token in content.get('subscribe') or []:
+                group = unsign_subscription(token)
+                if (group is None or group in self.subscribed_groups or
+                        len(self.subscribed_groups) >= self.max_subscriptions):
+                    continue
+                self.subscribed_groups.add(group)
+                async_to_sync(self.channel_layer.group_add)(group, self.channel_name)
 
         def reload_card(self, event):
             """Handle card reload messages from the channel layer."""
@@ -63,5 +212,13 @@ try:
                 'card': event['card'],
             })
 
+        def card_html(self, event):
+            """Forward pre-rendered card HTML from the channel layer to the client."""
+            self.send_json({
+                'command': 'card_html',
+                'card': event['card'],
+                'html': event['html'],
+            })
+
 except ImportError:
     pass
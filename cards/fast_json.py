@@ -0,0 +1,39 @@
+"""
+JSON serialisation for data embedded in pages, such as the treegrid config and its static data.
+
+`script_json()` uses the standard library by default. With `fast=True` it uses orjson when that is installed
+(`pip install orjson`), or compact standard library output when it is not. Types that orjson does not handle
+natively, such as `Decimal` and lazy translations, are passed to `DjangoJSONEncoder` in every case.
+"""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Same escapes as Django's json_script, so the output cannot close the surrounding <script> tag.
+SCRIPT_ESCAPES = {ord('>'): '\\u003E', ord('<'): '\\u003C', ord('&'): '\\u0026'}
+
+
+def script_json(value, fast=False):
+    """
+    Serialises `value` for use inside a `<script type="application/json">` tag.
+
+    Args:
+        value: A JSON-serialisable value.
+        fast (bool, optional): Use orjson if it is installed, otherwise compact separators.
+
+    Returns:
+        str: The escaped JSON text. It is not marked safe.
+    """
+    if fast and orjson is not None:
+        text = orjson.dumps(value, default=DjangoJSONEncoder().default,
+                            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME).decode()
+    elif fast:
+        text = json.dumps(value, cls=DjangoJSONEncoder, separators=(',', ':'))
+    else:
+        text = json.dumps(value, cls=DjangoJSONEncoder)
+    return text.translate(SCRIPT_ESCAPES)
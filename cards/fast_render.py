@@ -0,0 +1,234 @@
+"""
+Python renderer for the rows of standard cards.
+
+`render_default_rows()` produces exactly the same HTML as `cards/standard/_default_rows.html`, without evaluating
+the template's nested `{% if %}` chains for every entry. It is used for cards with `fast_render` enabled; the
+template remains the reference and `TestFastRender` checks that both produce identical output.
+
+Any change to `_default_rows.html` must be made here as well.
+"""
+from django.utils.formats import localize
+from django.utils.html import conditional_escape, escapejs
+from django.utils.timezone import template_localtime
+
+from cards.base import CardEntry
+
+
+def _indent(spaces):
+    return '\n' + ' ' * spaces
+
+
+I8, I12, I13, I16, I20, I24, I28, I32 = (_indent(x) for x in (8, 12, 13, 16, 20, 24, 28, 32))
+
+OLD_VALUE_ARROW = ' <i class="fas fa-arrow-right text-muted" style="font-size:0.7em"></i> '
+COPY_BUTTON = (' <button class="btn btn-sm btn-link p-0 ms-1" onclick="navigator.clipboard.writeText(\'{}\')">'
+               '<i class="fas fa-copy"></i></button>')
+
+
+def _value(value):
+    """Equivalent of `{{ value }}`."""
+    if isinstance(value, str):
+        return conditional_escape(value)
+    value = localize(template_localtime(value))
+    return conditional_escape(value if isinstance(value, str) else str(value))
+
+
+def _lookup(obj, key):
+    """Equivalent of `{{ obj.key }}`, with '' for missing keys."""
+    try:
+        return _value(obj[key])
+    except (TypeError, KeyError, AttributeError, IndexError):
+        pass
+    try:
+        return _value(getattr(obj, key))
+    except AttributeError:
+        return ''
+
+
+def _menu(menu):
+    """Equivalent of `{{ entry.menu.render }}`."""
+    render = getattr(menu, 'render', None)
+    return '' if render is None else _value(render())
+
+
+def _sequence(value):
+    return () if value is None else value
+
+
+def _less_or_equal(counter, value):
+    try:
+        return counter <= value
+    except TypeError:
+        return False
+
+
+def _status_dot(entry):
+    if entry.status_dot:
+        return ('<span style="display:inline-block;width:10px;height:10px;border-radius:50%;'
+                f'background:{_value(entry.status_dot)};margin-right:6px"></span>')
+    return ''
+
+
+def _value_html(entry):
+    """The entry value, with the previous value struck through when `old_value` is set."""
+    if entry.old_value:
+        return (f'<del class="text-danger">{_value(entry.old_value)}</del>{OLD_VALUE_ARROW}'
+                f'<span class="text-success">{entry.html}</span>')
+    return str(entry.html)
+
+
+def _inline(entry, value, copy_value, value_link=False):
+    """The status dot, icon, prefix, badge, value, suffix and copy button shared by the entry layouts."""
+    parts = [_status_dot(entry)]
+    if entry.icon:
+        parts.append(f'<i class="{_value(entry.icon)}"></i> ')
+    if entry.prefix:
+        parts.append(_value(entry.prefix))
+    if value_link and entry.value_link:
+        parts.append(f'<a href="{_value(entry.value_link)}">')
+    if entry.badge:
+        parts.append(f'<span class="badge {_value(entry.badge)}">{value}</span>')
+    else:
+        parts.append(value)
+    if value_link and entry.value_link:
+        parts.append('</a>')
+    if entry.suffix:
+        parts.append(_value(entry.suffix))
+    if entry.copy_to_clipboard:
+        parts.append(COPY_BUTTON.format(escapejs(str(copy_value))))
+    return ''.join(parts)
+
+
+def _heading(entry, value, copy_value):
+    """A value `<h4>` with popover or tooltip attributes, as used below a label."""
+    if entry.popover:
+        attributes = (f' tabindex="0" data-toggle="popover" data-trigger="focus" '
+                      f'title="{_lookup(entry.popover, "title")}" data-content="{_lookup(entry.popover, "content")}"')
+    elif entry.tooltip:
+        attributes = f' data-toggle="tooltip" title="{_value(entry.tooltip)}"'
+    else:
+        attributes = ''
+    return (f'<h4 class="list-group-item-heading {_value(entry.css_class)}"{attributes}>'
+            f'{_inline(entry, value, copy_value, value_link=True)}</h4>')
+
+
+def _stars(entry):
+    return ''.join(f'<i class="{"fas" if _less_or_equal(counter, entry.html) else "far"} fa-star text-warning"></i>'
+                   for counter, _ in enumerate(_sequence(entry.rating_range), 1))
+
+
+def _progress_bar(entry):
+    html = _value(entry.html)
+    return (f'<div class="progress" style="height:20px"><div class="progress-bar {_value(entry.progress_bar)}" '
+            f'style="width:{html}%">{html}%</div></div>')
+
+
+def _image(entry):
+    return f'<img src="{_value(entry.html)}" style="height:{_value(entry.image)};object-fit:cover" alt="">'
+
+
+def _help_text(entry):
+    if entry.help_text:
+        return f'<small class="text-muted d-block">{_value(entry.help_text)}</small>'
+    return ''
+
+
+def _labelled_value(entry):
+    if entry.progress_bar:
+        return I28 + _progress_bar(entry) + I24
+    if entry.image:
+        return I28 + _image(entry) + I24
+    if entry.rating:
+        return I28 + f'<h4 class="list-group-item-heading {_value(entry.css_class)}">{_stars(entry)}</h4>' + I24
+    if entry.multiple_lines:
+        return I28 + ''.join(I32 + _heading(entry, str(x), x) + I28 for x in _sequence(entry.html)) + I24
+    return I28 + _heading(entry, _value_html(entry), entry.html) + I24
+
+
+def _plain_value(entry):
+    if entry.progress_bar:
+        return I28 + _progress_bar(entry) + I24
+    if entry.image:
+        return I28 + _image(entry) + I24
+    if entry.rating:
+        return I28 + _stars(entry) + I24
+    return I28 + _inline(entry, _value_html(entry), entry.html) + I24
+
+
+def _entry_content(entry):
+    if entry.label:
+        return (I24 + f'<div class="d-flex"><label class="mr-auto">{entry.label}</label>{_menu(entry.menu)}</div>' +
+                I24 + _labelled_value(entry) + I24 + _help_text(entry) + I20)
+    if entry.menu:
+        return (I24 + f'<div class="d-flex"><h4 class="list-group-item-heading {_value(entry.css_class)} mr-auto">'
+                f'{_inline(entry, _value_html(entry), entry.html)}</h4>{_menu(entry.menu)}</div>' +
+                I24 + _help_text(entry) + I20)
+    return I24 + _plain_value(entry) + I24 + _help_text(entry) + I20
+
+
+def _entry(entry, multiple, item_css_class, item_css):
+    if isinstance(entry, dict):
+        entry = CardEntry(**entry)
+    if entry.row_style_html:
+        return str(entry.row_style_html)
+    parts = [I16]
+    if entry.separator:
+        parts.append('<hr class="my-1">')
+    parts.append(I16)
+    if entry.entry_css_class:
+        parts.append(f'<div class="{_value(entry.entry_css_class)}">')
+    parts.append(I16)
+    if entry.link:
+        parts.append(f'<a class="{item_css_class} cards-list-group-item" href="{_value(entry.link)}" '
+                     f'style="{item_css}">')
+    elif not multiple:
+        parts.append(f'<div class="{item_css_class}" style="{item_css}">')
+    parts.append(I20)
+    parts.append(_entry_content(entry))
+    parts.append(I12)
+    if entry.link:
+        parts.append('</a>')
+    elif not multiple:
+        parts.append('</div>')
+    parts.append(I13)
+    if entry.entry_css_class:
+        parts.append('</div>')
+    return ''.join(parts)
+
+
+def render_default_rows(rows, item_css_class='', item_css=''):
+    """
+    Renders card rows exactly as `cards/standard/_default_rows.html` does.
+
+    Args:
+        rows (list): Rows from `CardBase.rows`.
+        item_css_class (str, optional): The `item_css_class` template context value.
+        item_css (str, optional): The `item_css` template context value.
+
+    Returns:
+        str: Rendered HTML. It is not marked safe, as with `render_to_string()`.
+    """
+    item_css_class = _value(item_css_class)
+    item_css = _value(item_css)
+    parts = []
+    for row in rows:
+        parts.append('\n' + I12)
+        row_type = row.get('type')
+        if row_type == 'html':
+            parts.append(f'<div class="{item_css_class}">{row.get("html", "")}</div>')
+        else:
+            multiple = row_type == 'multiple'
+            parts.append(I12)
+            if multiple:
+                parts.append(f'<div class="{item_css_class}"><div class="row">')
+            parts.append(I12)
+            for entry in row.get('entries', ()):
+                parts.append(I16)
+                parts.append(_entry(entry, multiple, item_css_class, item_css))
+                parts.append(I12)
+            parts.append(I12)
+            if multiple:
+                parts.append('</div></div>')
+            parts.append(I12)
+        parts.append(I8)
+    return ''.join(parts)
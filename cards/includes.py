@@ -1,4 +1,6 @@
-from ajax_helpers.html_include import SourceBase
+from ajax_helpers.html_include import SourceBase, pip_version
+
+version = pip_version('django-cards')
 
 
 class JSSourceTree(SourceBase):
@@ -33,9 +35,19 @@ class FancytreeAwesomeSkinCSS(SourceBase):
     css_filename = 'skin-awesome/ui.fancytree.min.css'
 
 
+class TreegridJS(SourceBase):
+    static_path = 'cards/treegrid/'
+    js_filename = 'treegrid.js'
+
+
+class TreegridCSS(SourceBase):
+    static_path = 'cards/treegrid/'
+    css_filename = 'treegrid.css'
+
+
 packages = {
     'jstree_default': [JSSourceTree, JSSourceDefaultTheme],
     'jstree_proton': [JSSourceTree, JSSourceDarkProtonTheme],
     'jstree_dark': [JSSourceTree, JSSourceDarkTheme],
-    'fancytree': [FancytreeJS, FancytreeAwesomeSkinCSS],
+    'fancytree': [FancytreeJS, FancytreeAwesomeSkinCSS, TreegridJS, TreegridCSS],
 }
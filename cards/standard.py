@@ -1,16 +1,36 @@
 from __future__ import annotations
 
-import copy
+import asyncio
 import json
+import re
+from functools import reduce
+from operator import or_
 
 from ajax_helpers.utils import is_ajax
-from django.http import HttpResponse, JsonResponse
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import DatabaseError, connections, transaction
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import CharField, Count, Q, QuerySet, TextField
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
 
 from cards.base import CardBase, CARD_TYPE_HTML, CARD_TYPE_CARD_LAYOUT, CARD_TYPE_STANDARD, CARD_TYPE_CARD_MESSAGE, CARD_TYPE_LINKED_DATATABLES, CARD_TYPE_ACCORDION, CARD_TYPE_PANEL_LAYOUT, CARD_TYPE_IFRAME, CARD_TYPE_TREEGRID
 from cards.panel_layout import PanelLayout, PanelSplit
 
 
+CARD_GROUP_STREAM_MARKER = '<!--django-cards-group:{}-->'
+CARD_GROUP_STREAM_RE = re.compile('<!--django-cards-group:(.*?)-->')
+
+
+class StreamedCardGroups:
+    """Stands in for `card_groups` in a streamed page, returning a marker for each group the template outputs."""
+
+    def __getitem__(self, code):
+        return mark_safe(CARD_GROUP_STREAM_MARKER.format(code))
+
+
 class CardPostError(Exception):
     def __init__(self, value):
         self.value = value
@@ -39,6 +59,7 @@ class CardMixin:
     - Declarative card setup via `add_card()`, `add_html_card()`, and `add_list_card()`
     - Grouping via `add_card_group()` and nested layouts via `add_layout_card()`
     - Dynamic rendering using `get_context_data()` and `render_card_groups()`
+    - Optional streamed pages with `stream_card_groups`, sending each card group as soon as it is rendered
     - Server-side datatable support with automatic setup, sorting, and row editing
     - Delegated card rendering via a configurable `card_cls` (default: `CardBase`)
 
@@ -62,11 +83,14 @@ class CardMixin:
     """
     card_cls: type[CardBase] = CardBase
     panel_layout_cls: type[PanelLayout] = PanelLayout
+    stream_card_groups = False
 
     def __init__(self, *args, **kwargs):
         self.tables = {}
         self.cards = {}
         self.card_groups = {}
+        self.table_setup_only = None
+        self.loading_lazy_cards = False
         super().__init__(*args, **kwargs)
 
     def post(self, request, *args, **kwargs):
@@ -75,8 +99,7 @@ class CardMixin:
 
             field_setup_table_field = f'setup_table_{table_id}'
             if hasattr(self, field_setup_table_field):
-                self.setup_datatable_cards()
-                table = self.tables[table_id]
+                table = self.setup_single_table(table_id)
                 linked_filter_field = request.POST.get('linked_filter_field')
                 linked_filter_value = request.POST.get('linked_filter_value')
                 field_query = f'get_{table_id}_query'
@@ -87,6 +110,15 @@ class CardMixin:
                     results = table.get_query(**kwargs)
                 else:
                     results = table.get_query(**kwargs)
+                if request.POST.get('server_side'):
+                    page_data = self.get_datatable_page(table, results,
+                                                        start=request.POST.get('start', 0),
+                                                        length=request.POST.get('length', 100),
+                                                        search=request.POST.get('search', ''),
+                                                        order_column=request.POST.get('order_column'),
+                                                        order_dir=request.POST.get('order_dir', 'asc'))
+                    return HttpResponse(json.dumps(page_data, separators=(',', ':'), default=str),
+                                        content_type='application/json')
                 table_data = table.get_json(request, results)
                 return HttpResponse(table_data, content_type='application/json')
         # Treegrid self-dispatch: treegrid_data + card_id in JSON body
@@ -98,7 +130,9 @@ class CardMixin:
             if body.get('treegrid_data'):
                 card_id = body.get('card_id', '')
                 parent_key = body.get('parent')
-                extra = {k: v for k, v in body.items() if k not in ('treegrid_data', 'card_id', 'parent')}
+                extra = {k: v for k, v in body.items() if k not in ('treegrid_data', 'card_id', 'parent', 'parents')}
+                if isinstance(body.get('parents'), list):
+                    return self.treegrid_children_bulk_response(card_id, body['parents'], **extra)
                 method_name = f'get_treegrid_{card_id}_data'
                 if hasattr(self, method_name):
                     if extra:
@@ -201,6 +235,9 @@ class CardMixin:
                  searchable=False,
                  exportable=False,
                  column_search=False,
+                 cache_key=None,
+                 cache_timeout=None,
+                 cache_version=None,
                  **kwargs) -> CardBase:
         """
         Creates and adds a detail card to the view, using the configured card class.
@@ -227,7 +264,15 @@ class CardMixin:
             hidden_if_blank_or_none (list, optional): Field names to hide if blank or None.
             hidden_if_zero (list, optional): Field names to hide if value is zero.
             show_header (bool, optional): Whether to show the title / header of the card.
-            **kwargs: Additional keyword arguments forwarded to the card constructor.
+            cache_key (str, optional): Caches the rendered card HTML under this key (Django cache framework).
+            cache_timeout (int, optional): Timeout in seconds for the cached HTML.
+            cache_version (callable or any, optional): Version for invalidation; a callable receives `details_object`.
+                Defaults to `details_object.modified`.
+            **kwargs: Additional keyword arguments forwarded to the card constructor, e.g.
+                `prefetch=['tags', 'sectors']` to prefetch many-to-many relations on `details_object` once,
+                `lazy=True` to load the card's body over AJAX after the page is displayed, or `window_rows=200`
+                to render long cards in windows of rows fetched as the user scrolls. Windows are fetched by calling
+                the card's `setup_<card_name>_card()` builder, so without one the card renders all its rows.
 
         Returns:
             object: The instantiated card object.
@@ -241,6 +286,9 @@ class CardMixin:
         if details_object is None:
             details_object = getattr(self, 'object', None)
 
+        if kwargs.get('window_rows') and not callable(getattr(self, f'setup_{card_name}_card', None)):
+            kwargs['window_rows'] = None
+
         card = self.card_cls(request=request,
                              view=self,
                              details_object=details_object,
@@ -269,6 +317,9 @@ class CardMixin:
                              searchable=searchable,
                              exportable=exportable,
                              column_search=column_search,
+                             cache_key=cache_key,
+                             cache_timeout=cache_timeout,
+                             cache_version=cache_version,
                              **kwargs)
 
         if card_name is not None:
@@ -409,8 +460,9 @@ class CardMixin:
         Returns:
             dict: Context dictionary containing rendered cards and grouped card blocks.
         """
-        self.setup_datatable_cards()
-        self.setup_cards()
+        if self.stream_card_groups:
+            return self.get_stream_context_data(**kwargs)
+        self.setup_all_cards()
         super_context = getattr(super(), 'get_context_data')
         if super_context and callable(super_context):
             context = super_context(**kwargs)
@@ -425,6 +477,60 @@ class CardMixin:
         context['card_groups'] = rendered_card_groups
         return context
 
+    def setup_all_cards(self):
+        """Builds every card on the page: `setup_datatable_cards()` followed by `setup_cards()`."""
+        self.setup_datatable_cards()
+        self.setup_cards()
+
+    def get_stream_context_data(self, **kwargs):
+        """
+        Context for a streamed page.
+
+        The cards are set up first, as for a normal page, so page commands and other state registered by
+        `setup_cards()` are in the context, and so is `cards`. `card_groups` returns a marker for whatever group
+        the template outputs; the groups are rendered as the page is streamed.
+
+        Returns:
+            dict: Context dictionary with `StreamedCardGroups` as `card_groups`.
+        """
+        self.setup_all_cards()
+        super_context = getattr(super(), 'get_context_data', None)
+        context = super_context(**kwargs) if callable(super_context) else {}
+        context['cards'] = self.cards
+        context['card_groups'] = StreamedCardGroups()
+        return context
+
+    def render_to_response(self, context, **response_kwargs):
+        """
+        Returns the normal response, or with `stream_card_groups` a `StreamingHttpResponse`.
+
+        A streamed page sends everything above the first card group as soon as the cards are built, so the
+        browser can start loading styles and scripts. Each group is then sent as soon as it is rendered.
+        """
+        response = super().render_to_response(context, **response_kwargs)
+        if not self.stream_card_groups:
+            return response
+        return StreamingHttpResponse(self.stream_card_groups_page(response.rendered_content),
+                                     content_type=response['Content-Type'], status=response.status_code)
+
+    def stream_card_groups_page(self, page_html):
+        """
+        Yields a streamed page, rendering each card group in turn.
+
+        Args:
+            page_html (str): The page rendered with `StreamedCardGroups` markers in place of the groups.
+
+        Yields:
+            str: Page fragments and rendered card groups, in page order.
+        """
+        parts = CARD_GROUP_STREAM_RE.split(page_html)
+        yield parts[0]
+        for index in range(1, len(parts), 2):
+            card_groups = self.card_groups.get(parts[index])
+            if card_groups:
+                yield self.render_card_groups(card_groups)
+            yield parts[index + 1]
+
     def render_card_groups(self, card_groups):
         """
        Renders a collection of grouped cards into HTML using the default group template.
@@ -534,6 +640,10 @@ class CardMixin:
             - title (str, optional): Display title above this datatable.
             - linked_field (str, optional): The model field to filter on when a row is selected in the previous table.
             - css_class (str, optional): Extra CSS class for the datatable's column div.
+            - server_side (bool, optional): Page, search and order this table in the database instead of sending
+              every row to the browser.
+            - page_length (int, optional): Rows per page for a server_side table. Defaults to 100.
+            - search_fields (list, optional): Fields searched for a server_side table. Defaults to the columns' fields.
 
         Example:
             self.add_linked_datatables_card(
@@ -558,6 +668,94 @@ class CardMixin:
             **kwargs
         )
 
+    @staticmethod
+    def get_datatable_search_fields(table):
+        """
+        Returns the fields searched for a server-side linked datatables tier.
+
+        Uses the tier's `search_fields` if given, otherwise every column backed by a single, non-calculated field.
+
+        Args:
+            table (DatatableTable): The table being searched.
+
+        Returns:
+            list: Field paths matched with `icontains`.
+        """
+        search_fields = getattr(table, 'search_fields', None)
+        if search_fields is not None:
+            return list(search_fields)
+        return [column.field for column in table.columns
+                if isinstance(column.field, str) and not column.options.get('calculated')]
+
+    @staticmethod
+    def _int_or_default(value, default):
+        """Converts a client-supplied number, returning `default` if it is missing or not a number."""
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    def get_datatable_page(self, table, results, start=0, length=100, search='', order_column=None, order_dir='asc'):
+        """
+        Returns one page of a server-side linked datatables tier, ready to be sent as JSON.
+
+        Search, ordering and paging are applied in the database with `icontains`, `order_by()` and
+        LIMIT/OFFSET, so only the requested rows are converted by the table's columns. Rows given as a list are
+        converted first and searched on their displayed values; they are not reordered. Invalid numbers from
+        the client fall back to the defaults.
+
+        Args:
+            table (DatatableTable): The tier's table.
+            results (QuerySet or list): Rows from `table.get_query()` or a `get_<table_id>_query()` method.
+            start (int): Offset of the first row.
+            length (int): Number of rows in the page.
+            search (str): Search box text.
+            order_column (int, optional): Index of the column to order by.
+            order_dir (str): 'asc' or 'desc'.
+
+        Returns:
+            dict: `data`, `start`, `recordsTotal` and `recordsFiltered`.
+        """
+        start = max(self._int_or_default(start, 0), 0)
+        length = self._int_or_default(length, 0)
+        if length <= 0:
+            length = 100
+        if not isinstance(results, QuerySet) or not results.query.can_filter():
+            # Rows that are not a filterable queryset are converted first, then searched as displayed
+            data = table.get_table_array(self.request, list(results))
+            total = len(data)
+            if search:
+                search = search.lower()
+                data = [row for row in data if any(search in str(value).lower() for value in row)]
+            page_data = {'data': data[start:start + length],
+                         'start': start,
+                         'recordsTotal': total,
+                         'recordsFiltered': len(data)}
+        else:
+            total = results.count()
+            search_fields = self.get_datatable_search_fields(table)
+            if search and search_fields:
+                results = results.filter(reduce(or_, [Q(**{f'{field}__icontains': search})
+                                                      for field in search_fields]))
+                filtered = results.count()
+            else:
+                filtered = total
+            column_index = self._int_or_default(order_column, None)
+            if column_index is not None and 0 <= column_index < len(table.columns):
+                column = table.columns[column_index]
+                if isinstance(column.field, str) and not column.options.get('calculated'):
+                    # pk breaks ties, so rows with equal values keep their place between pages
+                    results = results.order_by(f'-{column.field}' if order_dir == 'desc' else column.field, 'pk')
+            if not results.ordered:
+                results = results.order_by('pk')
+            page_data = {'data': table.get_table_array(self.request, results[start:start + length]),
+                         'start': start,
+                         'recordsTotal': total,
+                         'recordsFiltered': filtered}
+        if table.ajax_commands:
+            page_data['ajax_commands'] = table.ajax_commands
+        return page_data
+
     def add_accordion_card(self, card_name=None, title=None, panels=None, multi_open=False,
                            full_height=False, min_height='300px', **kwargs):
         """
@@ -679,7 +877,8 @@ class CardMixin:
                           treegrid_checkbox=False, treegrid_checkbox_column=0,
                           treegrid_context_menu=None, treegrid_resizable=False,
                           treegrid_pagination=False, treegrid_page_size=50,
-                          treegrid_filter_auto_expand=True,
+                          treegrid_server_side=False,
+                          treegrid_filter_auto_expand=False,
                           treegrid_sortable=False,
                           treegrid_form_field='',
                           treegrid_row_click='',
@@ -690,6 +889,8 @@ class CardMixin:
                           treegrid_nowrap: bool = False,
                           treegrid_current_node: str = '',
                           treegrid_min_width: str = '600px',
+                          treegrid_fast_json: bool = False,
+                          treegrid_save_delay: int = 500,
                           **kwargs) -> CardBase:
         """
         Adds a treegrid card using Fancytree for hierarchical data display.
@@ -707,6 +908,8 @@ class CardMixin:
                 - 'field' (str): Data field name (from node.data).
                 - 'width' (str, optional): CSS width.
                 - 'editable' (bool, optional): Whether this column is editable.
+                - 'model_field' (str or dict, optional): Model field `treegrid_apply_changes()` writes, if not
+                  'field'. A dict is keyed by model name.
             treegrid_read_only (bool): If True, disables inline editing. Defaults to True.
             treegrid_height (str): CSS max-height for the scrollable area. Defaults to '600px'.
             treegrid_indentation (int): Pixels of indentation per tree level. Defaults to 20.
@@ -724,6 +927,15 @@ class CardMixin:
             treegrid_drag_cross_level (bool): Used with treegrid_drag_drop to allow multi-level drag and drop. Defaults to False,
             treegrid_nowrap (bool): If the cells of treegrid should not wrap text. Defaults to False,
             treegrid_min_width (str): Minimum width for the treegrid div. Defaults to 600px.
+            treegrid_server_side (bool): Page, filter and sort the root nodes on the server. Each page is requested
+                from `get_treegrid_<card_name>_data(parent=None, page=..., ...)`, which returns `{nodes, total}`,
+                usually via `get_treegrid_page()`. Implies `treegrid_pagination`. Defaults to False.
+            treegrid_filter_auto_expand (bool): Expand collapsed parents of nodes matched by the search or filters.
+                Defaults to False.
+            treegrid_fast_json (bool): Serialise the config and static data with orjson when it is installed, for
+                large static trees. Defaults to False.
+            treegrid_save_delay (int): With `treegrid_save_mode='coalesce'`, milliseconds without an edit before the
+                pending edits are sent together to `treegrid_apply_changes()`. Defaults to 500.
             **kwargs: Additional keyword arguments passed to `add_card`.
 
         Returns:
@@ -746,13 +958,13 @@ class CardMixin:
                 },
             )
         """
-        static_data = copy.deepcopy(treegrid_static_data) if treegrid_static_data else None
+        static_data = treegrid_static_data or None
         if treegrid_columns is None:
             treegrid_columns = []
         if treegrid_icon_map is None:
             treegrid_icon_map = {}
         if treegrid_current_node and static_data:
-            self._mark_current_node_ancestors(static_data, treegrid_current_node)
+            static_data = self._expand_to_current_node(static_data, treegrid_current_node) or static_data
         return self.add_card(
             card_name=card_name,
             title=title,
@@ -781,8 +993,9 @@ class CardMixin:
             treegrid_context_menu_html=self._build_context_menu_html(
                 treegrid_context_menu, card_name),
             treegrid_resizable=treegrid_resizable,
-            treegrid_pagination=treegrid_pagination,
+            treegrid_pagination=treegrid_pagination or treegrid_server_side,
             treegrid_page_size=treegrid_page_size,
+            treegrid_server_side=treegrid_server_side,
             treegrid_filter_auto_expand=treegrid_filter_auto_expand,
             treegrid_sortable=treegrid_sortable,
             treegrid_form_field=treegrid_form_field,
@@ -794,6 +1007,8 @@ class CardMixin:
             treegrid_nowrap=treegrid_nowrap,
             treegrid_current_node=treegrid_current_node,
             treegrid_min_width=treegrid_min_width,
+            treegrid_fast_json=treegrid_fast_json,
+            treegrid_save_delay=treegrid_save_delay,
             show_header=title is not None,
             **kwargs,
         )
@@ -828,16 +1043,289 @@ class CardMixin:
         return 'ajax'
 
     @staticmethod
-    def _mark_current_node_ancestors(nodes, target_key):
-        """Recursively mark ancestor nodes as expanded so target_key is visible on load."""
-        for node in nodes:
+    def _expand_to_current_node(nodes, target_key):
+        """Return `nodes` with the ancestors of target_key expanded so it is visible on load, or None if not found.
+
+        Only the lists and nodes on the path to target_key are copied, so the caller's tree is left unchanged
+        without deep-copying it.
+        """
+        for index, node in enumerate(nodes):
             if node.get('key') == target_key:
-                return True
+                return nodes
             children = node.get('children')
-            if children and CardMixin._mark_current_node_ancestors(children, target_key):
-                node['expanded'] = True
-                return True
-        return False
+            expanded = CardMixin._expand_to_current_node(children, target_key) if children else None
+            if expanded is not None:
+                nodes = list(nodes)
+                nodes[index] = {**node, 'children': expanded, 'expanded': True}
+                return nodes
+        return None
+
+    def get_treegrid_page(self, queryset, nodes_method, fields=None, page=1, page_size=50, search='',
+                          column_filters=None, js_filters=None, sort_field=None, sort_dir='asc', facet_fields=None):
+        """Return one page of root nodes for a `treegrid_server_side` treegrid as ``{nodes, total}``.
+
+        Search, column filters, side-panel filters and sorting are applied to ``queryset`` in the database, and
+        only the requested page is fetched with LIMIT/OFFSET and passed to ``nodes_method``.
+
+        Example::
+
+            def get_treegrid_companies_data(self, parent=None, **kwargs):
+                if parent is not None:
+                    return self._get_people(parent)
+                return self.get_treegrid_page(Company.objects.order_by('name'), self._companies_to_nodes,
+                                              fields={'title': 'name', 'category': 'company_category__name'},
+                                              **kwargs)
+
+        Args:
+            queryset (QuerySet): All root objects, in their default order.
+            nodes_method (callable): Converts a page of objects into a list of node dicts.
+            fields (dict, optional): Maps node fields (column ``field`` values, ``'title'`` for the node column)
+                to the lookups they are filtered and sorted by. Fields that are not mapped are ignored.
+            page (int): 1-based page number. Clamped to the last page.
+            page_size (int): Nodes per page.
+            search (str): Global filter text, matched with ``icontains`` against the mapped fields that are model
+                text fields (``CharField``/``TextField``). Other lookups, e.g. numbers or annotations, are not searched.
+            column_filters (dict, optional): ``{field: text}`` matched with ``icontains``.
+            js_filters (dict, optional): ``{field: [values]}`` of side-panel values to exclude.
+            sort_field (str, optional): Node field to sort by. Ties, and the default order, are broken by ``pk``
+                so rows don't move between pages.
+            sort_dir (str): 'asc' or 'desc'.
+            facet_fields (list, optional): Node fields to return value counts for, over the unfiltered queryset.
+
+        Returns:
+            dict: ``nodes``, ``total`` (after filtering), ``unfiltered_total``, ``page`` and, if requested,
+            ``facets`` as ``{field: {value: count}}``.
+        """
+        fields = fields or {}
+        page_size = int(page_size or 0)
+        if page_size <= 0:
+            page_size = 50
+        unfiltered_total = queryset.count()
+        results = queryset
+        if search and fields:
+            text_lookups = [lookup for lookup in fields.values() if self._is_text_lookup(queryset.model, lookup)]
+            if text_lookups:
+                results = results.filter(reduce(or_, [Q(**{f'{lookup}__icontains': search})
+                                                      for lookup in text_lookups]))
+            else:
+                results = results.none()
+        for field, value in (column_filters or {}).items():
+            if value and field in fields:
+                results = results.filter(**{f'{fields[field]}__icontains': value})
+        for field, values in (js_filters or {}).items():
+            if values and field in fields:
+                exclude = Q(**{f'{fields[field]}__in': [value for value in values if value != '']})
+                if '' in values:
+                    exclude |= Q(**{fields[field]: ''}) | Q(**{f'{fields[field]}__isnull': True})
+                results = results.exclude(exclude)
+        total = results.count() if results is not queryset else unfiltered_total
+        if sort_field in fields:
+            lookup = fields[sort_field]
+            results = results.order_by(f'-{lookup}' if sort_dir == 'desc' else lookup, 'pk')
+        else:
+            ordering = list(results.query.order_by or results.query.get_meta().ordering)
+            if not {'pk', '-pk', results.model._meta.pk.name, f'-{results.model._meta.pk.name}'} & set(ordering):
+                results = results.order_by(*ordering, 'pk')
+        page = min(max(int(page or 1), 1), max((total + page_size - 1) // page_size, 1))
+        offset = (page - 1) * page_size
+        page_data = {'nodes': list(nodes_method(results[offset:offset + page_size])),
+                     'total': total,
+                     'unfiltered_total': unfiltered_total,
+                     'page': page}
+        if facet_fields:
+            page_data['facets'] = {}
+            for field in facet_fields:
+                if field in fields:
+                    counts = queryset.order_by().values(fields[field]).annotate(facet_count=Count('pk', distinct=True))
+                    page_data['facets'][field] = {'' if row[fields[field]] is None else str(row[fields[field]]):
+                                                  row['facet_count'] for row in counts}
+        return page_data
+
+    @staticmethod
+    def _is_text_lookup(model, lookup):
+        """Return True if ``lookup`` (e.g. ``'company_category__name'``) ends at a text field of ``model``."""
+        field = None
+        for name in lookup.split('__'):
+            if field is not None:
+                model = field.related_model
+                if model is None:
+                    return False
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return False
+        return isinstance(field, (CharField, TextField))
+
+    def get_treegrid_children_bulk(self, card_id, parents, **extra):
+        """Return ``(parent_key, children)`` pairs for several treegrid parents.
+
+        Uses ``get_treegrid_<card_id>_children_bulk(parents=[...])`` if the view defines it. This hook may
+        return a dict keyed by parent or yield ``(parent, children)`` pairs so the response can be streamed.
+        Otherwise ``get_treegrid_<card_id>_data(parent=...)`` is called for each parent in turn.
+
+        Example::
+
+            def get_treegrid_my_tree_children_bulk(self, parents):
+                children = {key: [] for key in parents}
+                for person in Person.objects.filter(company_id__in=[k.split('_')[1] for k in parents]):
+                    children[f'company_{person.company_id}'].append({'key': f'person_{person.pk}',
+                                                                     'title': person.first_name})
+                return children
+        """
+        bulk_method = getattr(self, f'get_treegrid_{card_id}_children_bulk', None)
+        if bulk_method is not None:
+            children = bulk_method(parents=parents, **extra)
+            return children.items() if isinstance(children, dict) else children
+        data_method = getattr(self, f'get_treegrid_{card_id}_data', None)
+        if data_method is None:
+            return []
+        return ((parent, data_method(parent=parent, **extra)) for parent in parents)
+
+    def treegrid_children_bulk_response(self, card_id, parents, **extra):
+        """Stream the children of several treegrid parents as one JSON object keyed by parent key.
+
+        Each parent's children are encoded as they are produced, so a large expand-all does not have to
+        build the whole response in memory before sending it.
+        """
+        pairs = self.get_treegrid_children_bulk(card_id, parents, **extra)
+
+        def stream():
+            separator = '{'
+            for parent, children in pairs:
+                if isinstance(children, dict):
+                    children = children.get('nodes', [])
+                yield f'{separator}{json.dumps(str(parent))}: {json.dumps(children, cls=DjangoJSONEncoder)}'
+                separator = ', '
+            yield '{}' if separator == '{' else '}'
+
+        return StreamingHttpResponse(stream(), content_type='application/json')
+
+    @staticmethod
+    def get_treegrid_instances(keys, querysets):
+        """Return the model instances for ``<prefix>_<pk>`` node keys, with one ``in_bulk()`` query per prefix.
+
+        Example::
+
+            def get_treegrid_my_tree_instances(self, keys):
+                return self.get_treegrid_instances(keys, {'company': Company.objects, 'person': Person.objects})
+
+        Args:
+            keys (list): Node keys such as ``'company_12'``.
+            querysets (dict): Maps key prefixes to the querysets (or managers) to look them up in.
+
+        Returns:
+            dict: Node key to model instance. Keys that are malformed or not found are left out.
+        """
+        wanted = {}
+        for key in keys:
+            prefix, _, pk = str(key).rpartition('_')
+            if prefix in querysets:
+                wanted.setdefault(prefix, {})[pk] = key
+        instances = {}
+        for prefix, pks in wanted.items():
+            queryset = querysets[prefix]
+            pk_field = queryset.model._meta.pk
+            valid = []
+            for pk in pks:
+                try:
+                    valid.append(pk_field.to_python(pk))
+                except ValidationError:
+                    pass
+            for pk, instance in queryset.in_bulk(valid).items():
+                instances[pks[str(pk)]] = instance
+        return instances
+
+    @staticmethod
+    def _treegrid_model_field(instance, column):
+        """Return the model field a treegrid column edits on ``instance``, or None if it cannot be written."""
+        if not column or not column.get('editable'):
+            return None
+        name = column.get('model_field', column['field'])
+        if isinstance(name, dict):
+            name = name.get(instance._meta.model_name)
+        try:
+            field = instance._meta.get_field(name) if name else None
+        except FieldDoesNotExist:
+            return None
+        if field is None or not field.concrete or field.primary_key or not field.editable:
+            return None
+        return field
+
+    def treegrid_apply_changes(self, card_name, changes):
+        """Apply a batch of treegrid cell edits with one ``bulk_update()`` per model, in a single transaction.
+
+        Called with the coalesced edits of a ``treegrid_save_mode='coalesce'`` treegrid. The instances come from
+        ``get_treegrid_<card_name>_instances(keys)``, which returns a dict of node key to model instance, usually
+        via ``get_treegrid_instances()``. Only editable columns are written. A column's ``model_field`` names the
+        model field when it differs from the column field; it can be a dict keyed by model name. Values are
+        checked with the model field's ``clean()``. ``auto_now`` fields such as ``modified`` are updated as they
+        would be by ``save()``, so cached cards versioned on them are refreshed.
+
+        Override this to save the changes another way; the results must keep the same format.
+
+        Args:
+            card_name (str): The treegrid card name.
+            changes (list): ``{'key', 'field', 'value'}`` dicts, at most one per cell.
+
+        Returns:
+            list: One ``{'key', 'field', 'ok', 'value'}`` dict per change, plus ``'error'`` when ``ok`` is False.
+                ``value`` is the saved value, or the stored value for a rejected change, so the grid can show
+                what is in the database. It is left out when the row or field was not found.
+
+        Raises:
+            CardPostError: If the card is not an editable treegrid with ``treegrid_save_mode='coalesce'``.
+        """
+        card = self.setup_single_card(card_name)
+        extra_info = card.extra_card_info if card is not None else {}
+        if extra_info.get('treegrid_read_only', True) or extra_info.get('treegrid_save_mode') != 'coalesce':
+            raise CardPostError(f'{card_name} is not an editable treegrid with coalesced saves')
+        columns = {col.get('field'): col for col in extra_info['treegrid_columns']}
+        instances_method = getattr(self, f'get_treegrid_{card_name}_instances', None)
+        keys = list(dict.fromkeys(change.get('key') for change in changes))
+        instances = instances_method(keys) if instances_method and keys else {}
+        results = []
+        updates = {}
+        for change in changes:
+            key, field = change.get('key'), change.get('field')
+            result = {'key': key, 'field': field, 'ok': False}
+            results.append(result)
+            instance = instances.get(key)
+            if instance is None:
+                result['error'] = 'Not found'
+                continue
+            model_field = self._treegrid_model_field(instance, columns.get(field))
+            if model_field is None:
+                result['error'] = 'Not editable'
+                continue
+            value = change.get('value')
+            if value == '' and model_field.null:
+                value = None
+            try:
+                value = model_field.clean(value, instance)
+            except ValidationError as e:
+                result.update(error=' '.join(e.messages), value=model_field.value_from_object(instance))
+                continue
+            setattr(instance, model_field.attname, value)
+            objs, fields = updates.setdefault(type(instance), ({}, set()))
+            objs[instance.pk] = instance
+            fields.add(model_field.name)
+            result.update(ok=True, value=value)
+        try:
+            with transaction.atomic():
+                for model, (objs, fields) in updates.items():
+                    # bulk_update() skips pre_save(), which is what sets auto_now fields
+                    auto_now_fields = [f for f in model._meta.concrete_fields if getattr(f, 'auto_now', False)]
+                    for instance in objs.values():
+                        for auto_now_field in auto_now_fields:
+                            setattr(instance, auto_now_field.attname, auto_now_field.pre_save(instance, False))
+                    fields.update(f.name for f in auto_now_fields)
+                    model._default_manager.bulk_update(list(objs.values()), sorted(fields))
+        except DatabaseError as e:
+            for result in results:
+                if result['ok']:
+                    result.update(ok=False, error=str(e))
+                    del result['value']
+        return results
 
     def treegrid_update_cell(self, card_name, key, field, value):
         """Add a command to update a single cell value in the treegrid.
@@ -927,6 +1415,69 @@ class CardMixin:
         self.add_command('treegrid_move_node', card=card_name,
                          key=key, target_key=target_key, mode=mode)
 
+    def treegrid_patch(self, card_name, updates=(), styles=(), inserts=(), removes=(), moves=()):
+        """Add a single command that applies many treegrid changes at once.
+
+        Use this instead of one `treegrid_update_cell()` / `treegrid_style_cell()` call per cell when a response
+        changes many cells. Updates and styles are grouped by node key, so each key is sent once, and the browser
+        re-renders each affected row once rather than once per cell. Changes are applied in the order removes,
+        moves, inserts, updates, styles.
+
+        Example::
+
+            self.treegrid_patch('my_tree',
+                                updates=[('company_1', 'total', '120.00'), ('company_2', 'total', '80.00')],
+                                styles=[{'key': 'company_2', 'field': 'total', 'color': '#dc3545'},
+                                        {'key': 'company_3', 'bg': '#fff3cd'}],
+                                removes=['company_4'])
+            return self.command_response()
+
+        Args:
+            card_name (str): The treegrid card name.
+            updates (iterable, optional): `(key, field, value)` tuples or dicts with those keys.
+            styles (iterable, optional): Dicts with `key` and any of `field`, `bg`, `color`, `css_class` and
+                `remove_class`. Without `field` the whole row is styled. An empty `bg` or `color` clears it.
+            inserts (iterable, optional): Dicts with `parent_key`, `node_data` and optional `mode`, as for
+                `treegrid_add_node()`.
+            removes (iterable, optional): Keys of nodes to remove.
+            moves (iterable, optional): Dicts with `key`, `target_key` and optional `mode`, as for
+                `treegrid_move_node()`.
+        """
+        cmd = {'card': card_name}
+        grouped_updates = {}
+        for update in updates:
+            if isinstance(update, dict):
+                update = (update['key'], update['field'], update['value'])
+            key, field, value = update
+            grouped_updates.setdefault(key, {})[field] = value
+        if grouped_updates:
+            cmd['updates'] = grouped_updates
+
+        cell_styles = {}
+        row_styles = {}
+        for style in styles:
+            values = {k: style[k] for k in ('bg', 'color', 'css_class', 'remove_class')
+                      if style.get(k) is not None}
+            if style.get('field'):
+                cell_styles.setdefault(style['key'], {}).setdefault(style['field'], {}).update(values)
+            else:
+                row_styles.setdefault(style['key'], {}).update(values)
+        if cell_styles:
+            cmd['styles'] = cell_styles
+        if row_styles:
+            cmd['row_styles'] = row_styles
+
+        inserts = [[i.get('parent_key'), i['node_data'], i.get('mode', 'child')] for i in inserts]
+        if inserts:
+            cmd['inserts'] = inserts
+        removes = list(removes)
+        if removes:
+            cmd['removes'] = removes
+        moves = [[m['key'], m['target_key'], m.get('mode', 'child')] for m in moves]
+        if moves:
+            cmd['moves'] = moves
+        self.add_command('treegrid_patch', **cmd)
+
     def add_link_gallery_card(self, links, card_name=None, title='Links', show_image_names=False, **kwargs):
         """
         Adds a links gallery card with visual tiles for different link types.
@@ -1020,9 +1571,8 @@ class CardMixin:
            str: Rendered HTML for the updated row.
         """
         row_data = json.loads(kwargs.pop('row_data'))
-        self.setup_datatable_cards()
         table_id = kwargs['table_id']
-        table = self.tables[table_id]
+        table = self.setup_single_table(table_id)
         row_object = table.model.objects.get(pk=kwargs['row_no'][1:])
         field_setup_table_field = f'setup_table_{table_id}'
         if hasattr(self, field_setup_table_field):
@@ -1031,12 +1581,34 @@ class CardMixin:
         return table.refresh_row(self.request, kwargs['row_no'])
 
     def datatable_sort(self, **kwargs):
-        self.setup_datatable_cards()
+        self.setup_single_table(kwargs.get('table_id', ''))
         card = self.cards.get(kwargs.get('table_id', ''))
         card.datatable_sort(**kwargs)
 
         return self.command_response('null')
 
+    def setup_single_table(self, table_id):
+        """
+        Runs `setup_datatable_cards()` but builds only the datatable `table_id` and returns it.
+
+        Cards are still created, but other datatable cards and other linked datatables tiers skip
+        building their `DatatableTable` and their `setup_table_*` hooks. This is used when a request is
+        for a single table, e.g. fetching its data or a drill-down click in linked datatables.
+
+        Args:
+            table_id (str): The datatable card code or linked datatables tier id.
+
+        Returns:
+            DatatableTable or None: The table, or None if no table with that id was set up.
+        """
+        self.tables = {}
+        self.table_setup_only = table_id
+        try:
+            self.setup_datatable_cards()
+        finally:
+            self.table_setup_only = None
+        return self.tables.get(table_id)
+
     def reload_card(self, card_code):
         """Add a command to tell the client to reload a specific card via AJAX.
 
@@ -1048,35 +1620,254 @@ class CardMixin:
         """
         self.add_command('reload_card', card=card_code)
 
-    def button_reload_card(self, **kwargs):
-        card_code = kwargs.get('card')
+    def push_card(self, card_code, group_name=None):
+        """Render a card once and broadcast its HTML to the WebSocket clients subscribed to it.
+
+        Clients connected through `CardReloadConsumer` replace `#<card_code>_ajax` with the pushed HTML
+        instead of each posting `button_reload_card`. The card is built with `setup_single_card()`, so call
+        this from an AJAX handler rather than while the page is being set up.
+
+        Usage from any button handler:
+            def button_save(self, **kwargs):
+                # ... save logic ...
+                self.push_card('my_card')
+                return self.command_response('null')
+
+        Args:
+            card_code (str): The code of the card to render.
+            group_name (str, optional): Channel layer group to send to. Defaults to the card's subscription
+                group, which is scoped to its `details_object`. The HTML is never sent to the global group.
+
+        Returns:
+            str or None: The pushed HTML, or None if no card with that code was set up.
+        """
+        from cards.channels import send_card_html
+
+        card = self.setup_single_card(card_code)
+        if card is None:
+            return None
+        html = card._render_template()
+        send_card_html(card.code, html, group_name=group_name, obj=card.details_object)
+        return html
+
+    def setup_single_card(self, card_code, full_setup=True):
+        """
+        Builds only the card identified by `card_code` and returns it.
+
+        If the view defines a `setup_<card_code>_card()` method, only that builder is called. It may
+        return the card or simply register it in `self.cards` via `add_card()`. Otherwise, if `full_setup`,
+        this falls back to the full `setup_datatable_cards()` / `setup_cards()` rebuild.
+
+        Builders are ordinary methods, so `setup_cards()` can call them too:
+
+            def setup_cards(self):
+                self.setup_live_data_card()
+                self.add_card_group('live_data')
+
+            def setup_live_data_card(self):
+                card = self.add_card('live_data', title='Live Data', ajax_reload=True)
+                card.add_rows('name', 'status')
+                return card
+
+        Args:
+            card_code (str): The code of the card to build.
+            full_setup (bool, optional): Rebuild the whole view if the card has no builder.
+
+        Returns:
+            CardBase or None: The built card, or None if no card with that code was set up.
+        """
         if not hasattr(self, 'object') and hasattr(self, 'get_object'):
             self.object = self.get_object()
         self.cards = {}
         self.card_groups = {}
         self.tables = {}
+        builder = getattr(self, f'setup_{card_code}_card', None) if card_code else None
+        if builder is not None and callable(builder):
+            card = builder()
+            if card is None:
+                card = self.cards.get(card_code)
+            return card
+        if not full_setup:
+            return None
         self.setup_datatable_cards()
         self.setup_cards()
-        card = self.cards.get(card_code)
+        return self.cards.get(card_code)
+
+    def button_reload_card(self, **kwargs):
+        card = self.setup_single_card(kwargs.get('card'))
         if card is not None:
             return self.command_response('html', selector=f'#{card.code}_ajax', html=card._render_template())
         return self.command_response('null')
 
+    def button_lazy_cards(self, **kwargs):
+        """
+        AJAX handler that builds and renders the bodies of the `lazy` cards on a page in one request.
+
+        Cards with a `setup_<code>_card()` builder are built by that builder alone. Any others are built
+        together by a single `setup_datatable_cards()` / `setup_cards()` rebuild. `lazy` is ignored while
+        loading, so the builders return complete cards.
+
+        Args:
+            cards (list): Codes of the lazy cards on the page.
+
+        Returns:
+            JsonResponse: One `html` command per card, replacing its `#<code>_ajax` placeholder.
+        """
+        codes = [code for code in kwargs.get('cards') or [] if isinstance(code, str)]
+        self.loading_lazy_cards = True
+        built = {}
+        for code in codes:
+            if callable(getattr(self, f'setup_{code}_card', None)):
+                card = self.setup_single_card(code)
+                if card is not None:
+                    built[code] = card
+        missing = [code for code in codes if code not in built]
+        if missing:
+            self.setup_single_card(missing[0])
+            built.update({code: self.cards[code] for code in missing if code in self.cards})
+        for code in codes:
+            if code in built:
+                self.add_command('html', selector=f'#{code}_ajax', html=built[code]._render_template())
+        return self.command_response()
+
+    def button_card_rows(self, **kwargs):
+        """
+        AJAX handler that returns the next window of rows of a `window_rows` card, or the first window of a search.
+
+        Args:
+            card (str): The card code.
+            start (int): Index of the first row, counted within the search results.
+            search (str): The card's search box text.
+
+        Only the card's `setup_<card>_card()` builder is called, as rebuilding the whole view for every window
+        or search would cost more than rendering all the rows.
+
+        Returns:
+            JsonResponse: A `card_rows` command with the rendered rows and the start of the next window.
+
+        Raises:
+            CardPostError: If the view has no builder for the card.
+        """
+        card_code = kwargs.get('card')
+        if not callable(getattr(self, f'setup_{card_code}_card', None)):
+            raise CardPostError(f'Add a setup_{card_code}_card() builder to fetch windows of rows for {card_code}')
+        card = self.setup_single_card(card_code, full_setup=False)
+        if card is None or not card.window_rows:
+            return self.command_response('null')
+        start = max(int(kwargs.get('start') or 0), 0)
+        search = kwargs.get('search') or ''
+        rows, next_start = card.get_window(start=start, search=search)
+        return self.command_response('card_rows', card=card.code, html=card.render_rows(rows),
+                                     start=start, next_start=next_start, search=search)
+
+    def button_treegrid_apply_changes(self, **kwargs):
+        """
+        AJAX handler for the coalesced edits of a `treegrid_save_mode='coalesce'` treegrid.
+
+        Args:
+            card (str): The treegrid card name.
+            changes (list): `{'key', 'field', 'value'}` dicts.
+
+        Returns:
+            JsonResponse: A `treegrid_apply_results` command with the `treegrid_apply_changes()` results.
+
+        Raises:
+            CardPostError: If the card is read-only or does not use `treegrid_save_mode='coalesce'`.
+        """
+        card_name = kwargs.get('card')
+        changes = [change for change in kwargs.get('changes') or [] if isinstance(change, dict)]
+        return self.command_response('treegrid_apply_results', card=card_name,
+                                     results=self.treegrid_apply_changes(card_name, changes))
+
     def button_accordion_load(self, **kwargs):
         """AJAX handler to load an accordion panel's content on first expand."""
         accordion_code = kwargs.get('accordion')
         panel_id = kwargs.get('panel_id')
-        if not hasattr(self, 'object') and hasattr(self, 'get_object'):
-            self.object = self.get_object()
-        self.cards = {}
-        self.card_groups = {}
-        self.tables = {}
-        self.setup_datatable_cards()
-        self.setup_cards()
-        accordion = self.cards.get(accordion_code)
+        accordion = self.setup_single_card(accordion_code)
         if accordion is not None:
             for panel in accordion.extra_card_info.get('initialized_panels', []):
                 if panel['id'] == panel_id and panel.get('card'):
                     html = panel['card'].render()
                     return self.command_response('html', selector=f'#{panel_id}_content', html=html)
         return self.command_response('null')
+
+
+class AsyncCardMixin(CardMixin):
+    """
+    CardMixin variant that builds independent cards concurrently.
+
+    Each code in `async_cards` must have a `setup_<code>_card()` builder. The builders run at the same time
+    before `setup_cards()`, so a page of slow, independent cards takes about as long as its slowest card.
+    Plain builders are offloaded to worker threads with `sync_to_async`, and `async def` builders are
+    awaited directly. All of them are gathered with `asyncio.gather`. `setup_cards()` then only needs to
+    lay the cards out in groups.
+
+    Builders must not depend on each other. Each worker thread uses its own database connection, which is
+    closed when its builder finishes, so builders cannot see uncommitted data from the request's transaction.
+
+    Example:
+        class Dashboard(AsyncCardMixin, TemplateView):
+            async_cards = ['sales', 'stock']
+
+            def setup_sales_card(self):
+                card = self.add_card('sales', title='Sales')
+                card.add_rows({'label': 'Total', 'value': Order.objects.aggregate(Sum('total'))['total__sum']})
+                return card
+
+            def setup_stock_card(self):
+                ...
+
+            def setup_cards(self):
+                self.add_card_group('sales', 'stock', div_css_class='col-6')
+    """
+    async_cards = ()
+
+    def get_async_cards(self):
+        """
+        Returns the codes of the cards whose builders run concurrently.
+
+        Returns:
+            list: Card codes, each with a `setup_<code>_card()` builder.
+        """
+        return list(self.async_cards)
+
+    def setup_async_cards(self):
+        """Runs the `setup_<code>_card()` builders for `get_async_cards()` concurrently and waits for them all."""
+        builders = [getattr(self, f'setup_{code}_card') for code in self.get_async_cards()]
+        if builders:
+            async_to_sync(self.gather_card_builders)(builders)
+
+    async def gather_card_builders(self, builders):
+        """
+        Runs `builders` concurrently.
+
+        Args:
+            builders (list): Bound card builder methods, plain or `async def`.
+
+        Returns:
+            list: The builders' return values, in order.
+        """
+        return await asyncio.gather(*[builder() if asyncio.iscoroutinefunction(builder) else
+                                      sync_to_async(self._run_card_builder, thread_sensitive=False)(builder)
+                                      for builder in builders])
+
+    @staticmethod
+    def _run_card_builder(builder):
+        try:
+            return builder()
+        finally:
+            connections.close_all()
+
+    @staticmethod
+    async def _await_card(coroutine):
+        return await coroutine
+
+    def setup_single_card(self, card_code, full_setup=True):
+        card = super().setup_single_card(card_code, full_setup=full_setup)
+        if asyncio.iscoroutine(card):
+            card = async_to_sync(self._await_card)(card) or self.cards.get(card_code)
+        return card
+
+    def setup_all_cards(self):
+        self.setup_async_cards()
+        super().setup_all_cards()
@@ -0,0 +1,2245 @@
+/**
+ * CardsTreegrid - Fancytree based tree grid for django-cards treegrid cards.
+ * Each card renders its options as a JSON config blob (see CardBase.treegrid_config) and calls init() with it,
+ * so this file is shared by every treegrid on a page and cached by the browser.
+ *
+ * Usage:
+ *   CardsTreegrid.init(JSON.parse(document.getElementById('my_tree_treegrid_config').textContent));
+ */
+var CardsTreegrid = (function() {
+
+    function init(config) {
+        var CARD_CODE = config.card_code;
+        var DATA_URL = config.data_url;
+        var DATA_MODE = config.data_mode;
+        var STATIC_DATA = config.static_data;
+        var READ_ONLY = config.read_only;
+        var INDENTATION = config.indentation;
+        var ICON_MAP = config.icon_map;
+        var COLUMNS = config.columns;
+        var EXPAND_ALL = config.expand_all;
+        var FILTER_AUTO_EXPAND = config.filter_auto_expand;
+        var SHOW_COL_FILTERS = config.show_column_filters;
+        var TOOLBAR = config.toolbar;
+        var NODE_COLUMN = config.node_column;
+        var SAVE_MODE = config.save_mode;
+        var SAVE_DELAY = config.save_delay;
+        var CHECKBOX = config.checkbox;
+        var CHECKBOX_COLUMN = config.checkbox_column;
+        var CONTEXT_MENU = config.context_menu;
+        var RESIZABLE = config.resizable;
+        var PAGINATION = config.pagination;
+        var SERVER_SIDE = config.server_side;
+        var JS_FILTERS = config.js_filters;
+        var CURRENT_NODE = config.current_node;
+        var SORTABLE = config.sortable;
+        var DRAG_DROP = config.drag_drop;
+        var DRAG_CROSS_LEVEL = config.drag_cross_level;
+        var FORM_FIELD = config.form_field;
+        var ROW_CLICK = config.row_click;
+        var DEFAULT_SELECTED = config.default_selected;
+
+        // Form-field mode: accumulate edits/reorders/moves/selections client-side, write JSON to a named input.
+        // Keys: edits keyed by "nodeKey:field" (last write wins); reorders keyed by parent key.
+        var _ffEdits    = {};
+        var _ffReorders = {};
+        // Drag-drop moves kept as an ordered list — cross-level moves only replay correctly in sequence.
+        var _ffMoves    = [];
+        // Keys to pre-select on load (from DEFAULT_SELECTED or restored from existing field value).
+        // Also used to re-apply selections when lazy children are loaded.
+        var _ffSelectedKeys = {};
+        function _writeFormField() {
+            if (!FORM_FIELD) return;
+            var state = {
+                edits:    Object.values(_ffEdits),
+                reorders: Object.values(_ffReorders),
+                moves:    _ffMoves,
+                selected: getSelectedKeys()
+            };
+            $('[name="' + FORM_FIELD + '"]').val(JSON.stringify(state));
+        }
+
+        var $modal = $('#' + CARD_CODE + '_card').closest('.modal');
+        var LOCATION_URL = $modal.length ? $modal.attr('data-url') : window.location.href;
+
+        // Pagination state
+        var _allNodes = [];
+        var _allKeys = [];
+        var _currentPage = 1;
+        var _pageSize = config.page_size;
+        var _filteredNodes = null;  // null = no filter active; array = current filter result set
+        var _filterTerm = '';       // global search term for highlight
+        var _filterColTerms = {};   // {colIdx: term} for column-specific highlight
+        // Server-side pagination state: totals and facet counts from the last page response
+        var _serverTotal = 0;
+        var _serverUnfilteredTotal = 0;
+        var _serverFacets = null;
+        var _serverColFilters = {};  // {field: term}
+        var _sortField = null;
+        var _sortDir = 'asc';
+        var _serverRequest = 0;  // Only the latest page request is shown
+        // Filter match count for non-pagination mode (null = no filter active)
+        var _filterMatchCount = null;
+        // Side-panel JS filter state: {field: {value: true, ...}} where present = deselected (hidden)
+        var _jsFilterActive = {};
+        // Cross-page selection tracking (only used when PAGINATION && CHECKBOX)
+        var _pagedSelectedKeys = {};
+        // Maps root-level node key → count of selected descendants (for partsel restoration)
+        var _childSelectionCounts = {};
+
+        // Global treegrid registry for reload and external access
+        if (!window._treegridRegistry) window._treegridRegistry = {};
+
+        function reloadTreegrid() {
+            var tree = $.ui.fancytree.getTree('#' + CARD_CODE + '_table');
+            if (tree) {
+                tree.reload();
+                pendingChanges = {};
+                updateBatchUI();
+            }
+        }
+
+        // Register this treegrid for external access
+        function getSelectedKeys() {
+            if (PAGINATION && CHECKBOX) {
+                return Object.keys(_pagedSelectedKeys);
+            }
+            var tree = $.ui.fancytree.getTree('#' + CARD_CODE + '_table');
+            if (!tree) return [];
+            return tree.getSelectedNodes().map(function(n) { return n.key; });
+        }
+
+        function updateSelectCount() {
+            var $el = $('#' + CARD_CODE + '_select_count');
+            if ($el.length) {
+                var count = getSelectedKeys().length;
+                $el.text(count > 0 ? count + ' selected' : '');
+            }
+        }
+
+        // Offset for td indexing: handle columns + checkbox column
+        var TD_OFFSET = (SORTABLE ? 1 : 0) + (DRAG_DROP ? 1 : 0) + (CHECKBOX ? 1 : 0);
+
+        window._treegridRegistry[CARD_CODE] = {
+            reload: reloadTreegrid,
+            renderRow: function(node) { renderCells(node); },
+            columns: COLUMNS,
+            nodeColumnIdx: NODE_COLUMN,
+            tdOffset: TD_OFFSET,
+            getSelectedKeys: getSelectedKeys,
+            applyResults: _applyResults,
+            applyPatch: _applyPatch
+        };
+
+        // Register ajax_helpers commands (once)
+        if (ajax_helpers.command_functions && !ajax_helpers.command_functions.reload_treegrid) {
+            ajax_helpers.command_functions.reload_treegrid = function(command) {
+                var card = command.card;
+                if (card && window._treegridRegistry[card]) {
+                    window._treegridRegistry[card].reload();
+                }
+            };
+
+            // Update a single cell value: {card, key, field, value}
+            ajax_helpers.command_functions.treegrid_update_cell = function(command) {
+                var reg = window._treegridRegistry[command.card];
+                if (!reg) return;
+                var tree = $.ui.fancytree.getTree('#' + command.card + '_table');
+                if (!tree) return;
+                var node = tree.getNodeByKey(command.key);
+                if (!node) return;
+                // Update node data
+                node.data[command.field] = command.value;
+                if (command.field === 'title') {
+                    node.setTitle(command.value);
+                }
+                // Update any existing widget in the cell
+                if (node.tr) {
+                    var columns = reg.columns;
+                    var offset = reg.tdOffset || 0;
+                    var $tds = $(node.tr).find('>td');
+                    for (var i = 0; i < columns.length; i++) {
+                        if (columns[i].field === command.field) {
+                            var $td = $tds.eq(i + offset);
+                            var $select = $td.find('select');
+                            var $checkbox = $td.find('input[type="checkbox"]');
+                            if ($select.length) {
+                                $select.val(String(command.value));
+                            } else if ($checkbox.length) {
+                                var checked = (command.value === true || command.value === 'true' || command.value === 'Yes' || command.value === 1);
+                                $checkbox.prop('checked', checked);
+                            } else if (i !== reg.nodeColumnIdx) {
+                                // Plain text cell - just update text
+                                $td.text(command.value);
+                            }
+                            break;
+                        }
+                    }
+                    // Also update the tree title if field is 'title'
+                    if (command.field === 'title') {
+                        node.renderTitle();
+                    }
+                }
+            };
+
+            // Style a cell: {card, key, field, bg, color, css_class, remove_class}
+            ajax_helpers.command_functions.treegrid_style_cell = function(command) {
+                var tree = $.ui.fancytree.getTree('#' + command.card + '_table');
+                if (!tree) return;
+                var node = tree.getNodeByKey(command.key);
+                if (!node || !node.tr) return;
+                var reg = window._treegridRegistry[command.card];
+                var columns = reg.columns;
+                var offset = reg.tdOffset || 0;
+                var $tr = $(node.tr);
+                var $tds = $tr.find('>td');
+                for (var i = 0; i < columns.length; i++) {
+                    if (columns[i].field === command.field) {
+                        var $td = $tds.eq(i + offset);
+                        if (command.bg) $td.css('background-color', command.bg);
+                        if (command.color) $td.css('color', command.color);
+                        if (command.css_class) $td.addClass(command.css_class);
+                        if (command.remove_class) $td.removeClass(command.remove_class);
+                        break;
+                    }
+                }
+            };
+
+            // Style a whole row: {card, key, bg, color, css_class, remove_class}
+            ajax_helpers.command_functions.treegrid_style_row = function(command) {
+                var tree = $.ui.fancytree.getTree('#' + command.card + '_table');
+                if (!tree) return;
+                var node = tree.getNodeByKey(command.key);
+                if (!node || !node.tr) return;
+                var $tr = $(node.tr);
+                if (command.bg) $tr.css('background-color', command.bg);
+                if (command.color) $tr.css('color', command.color);
+                if (command.css_class) $tr.addClass(command.css_class);
+                if (command.remove_class) $tr.removeClass(command.remove_class);
+            };
+
+            // Add a node: {card, parent_key, node_data, mode}
+            // node_data: {title, key, folder, data, ...}
+            // mode: 'child' (default), 'before', 'after'
+            ajax_helpers.command_functions.treegrid_add_node = function(command) {
+                var tree = $.ui.fancytree.getTree('#' + command.card + '_table');
+                if (!tree) return;
+                var mode = command.mode || 'child';
+                if (command.parent_key) {
+                    var target = tree.getNodeByKey(command.parent_key);
+                    if (!target) return;
+                    if (mode === 'before') {
+                        target.addNode(command.node_data, 'before');
+                    } else if (mode === 'after') {
+                        target.addNode(command.node_data, 'after');
+                    } else {
+                        target.addChildren(command.node_data);
+                        target.setExpanded(true);
+                    }
+                } else {
+                    tree.getRootNode().addChildren(command.node_data);
+                }
+            };
+
+            // Remove a node: {card, key}
+            ajax_helpers.command_functions.treegrid_remove_node = function(command) {
+                var tree = $.ui.fancytree.getTree('#' + command.card + '_table');
+                if (!tree) return;
+                var node = tree.getNodeByKey(command.key);
+                if (node) node.remove();
+            };
+
+            // Reconcile coalesced saves: {card, results: [{key, field, ok, value, error}]}
+            ajax_helpers.command_functions.treegrid_apply_results = function(command) {
+                var reg = window._treegridRegistry[command.card];
+                if (reg) reg.applyResults(command.results || []);
+            };
+
+            // Apply many changes at once: {card, removes, moves, inserts, updates, styles, row_styles}
+            ajax_helpers.command_functions.treegrid_patch = function(command) {
+                var reg = window._treegridRegistry[command.card];
+                if (reg) reg.applyPatch(command);
+            };
+
+            // Move a node: {card, key, target_key, mode}
+            ajax_helpers.command_functions.treegrid_move_node = function(command) {
+                var tree = $.ui.fancytree.getTree('#' + command.card + '_table');
+                if (!tree) return;
+                var node = tree.getNodeByKey(command.key);
+                var target = tree.getNodeByKey(command.target_key);
+                if (!node || !target) return;
+                node.moveTo(target, command.mode || 'child');
+            };
+        }
+
+        // Build editable field map: {colIndex: {field, type, options, inline}} for editable columns
+        var EDITABLE_FIELDS = {};
+        if (!READ_ONLY) {
+            for (var i = 0; i < COLUMNS.length; i++) {
+                if (COLUMNS[i].editable) {
+                    EDITABLE_FIELDS[i] = {
+                        field: COLUMNS[i].field || (i === NODE_COLUMN ? 'title' : ''),
+                        type: COLUMNS[i].type || 'text',
+                        options: COLUMNS[i].options || [],
+                        inline: COLUMNS[i].inline !== false,  // default true
+                        edit_icon: COLUMNS[i].edit_icon || false
+                    };
+                }
+            }
+        }
+
+        // Batch save: pending changes keyed by "nodeKey:field"
+        var pendingChanges = {};
+
+        function updateBatchUI() {
+            if (SAVE_MODE !== 'batch') return;
+            var count = Object.keys(pendingChanges).length;
+            var $btn = $('#' + CARD_CODE + '_save_btn');
+            var $discard = $('#' + CARD_CODE + '_discard_btn');
+            var $info = $('#' + CARD_CODE + '_changes');
+            $btn.prop('disabled', count === 0);
+            $discard.prop('disabled', count === 0);
+            $info.text(count > 0 ? count + ' unsaved change' + (count > 1 ? 's' : '') : '');
+        }
+
+        // Coalesce save: edits keyed by "nodeKey:field" (last write wins), sent together once editing pauses
+        var _coalesceChanges = {};
+        var _coalesceTimer = null;
+        var _coalesceInFlight = false;
+
+        function _cellFor(node, fieldName) {
+            if (!node || !node.tr) return null;
+            for (var i = 0; i < COLUMNS.length; i++) {
+                if (COLUMNS[i].field === fieldName) return $(node.tr).find('>td').eq(i + TD_OFFSET);
+            }
+            return null;
+        }
+
+        function _flushCoalesced() {
+            _coalesceTimer = null;
+            if (_coalesceInFlight) return;  // Sent when the current request finishes
+            var changes = Object.values(_coalesceChanges);
+            if (changes.length === 0) return;
+            _coalesceChanges = {};
+            _coalesceInFlight = true;
+            var reload = changes.some(function(c) { return getOnChange(c.field) === 'reload'; });
+            $.ajax({
+                url: LOCATION_URL,
+                method: 'POST',
+                data: JSON.stringify({button: 'treegrid_apply_changes', card: CARD_CODE, changes: changes}),
+                contentType: 'application/json',
+                beforeSend: function(xhr) {
+                    xhr.setRequestHeader('X-Requested-With', 'XMLHttpRequest');
+                    xhr.setRequestHeader('X-CSRFToken', ajax_helpers.getCookie('csrftoken'));
+                }
+            }).done(function(response) {
+                ajax_helpers.process_commands(response);
+                if (reload) reloadTreegrid();
+            }).fail(function() {
+                _applyResults(changes.map(function(c) {
+                    return {key: c.key, field: c.field, ok: false, error: 'Not saved'};
+                }));
+            }).always(function() {
+                _coalesceInFlight = false;
+                if (!_coalesceTimer) _flushCoalesced();
+            });
+        }
+
+        // Show the server's outcome for each coalesced edit: the saved (or, if rejected, stored) value,
+        // and an error marker on rejected cells. Cells edited again since the batch was sent keep their new value.
+        function _applyResults(results) {
+            var tree = $.ui.fancytree.getTree('#' + CARD_CODE + '_table');
+            if (!tree) return;
+            var changed = {};
+            results.forEach(function(r) {
+                var node = tree.getNodeByKey(r.key);
+                if (!node) return;
+                var pending = _coalesceChanges.hasOwnProperty(r.key + ':' + r.field);
+                if (r.hasOwnProperty('value') && !pending) {
+                    var value = r.value === null ? '' : r.value;
+                    if (r.field === 'title') {
+                        node.setTitle(value);
+                    } else {
+                        node.data[r.field] = value;
+                    }
+                    var $widgetTd = _cellFor(node, r.field);
+                    if ($widgetTd) {
+                        $widgetTd.find('input[type="checkbox"]').prop('checked', value === true || value === 'true');
+                        $widgetTd.find('select').val(String(value));
+                    }
+                    changed[r.key] = node;
+                }
+                var $td = _cellFor(node, r.field);
+                if ($td && !pending) {
+                    $td.removeClass('treegrid-cell-pending').toggleClass('treegrid-cell-error', !r.ok);
+                    if (r.ok) {
+                        $td.removeAttr('title');
+                    } else {
+                        $td.attr('title', r.error || '');
+                    }
+                }
+            });
+            Object.keys(changed).forEach(function(key) { renderCells(changed[key]); });
+        }
+
+        function _styleElement($el, style) {
+            if (style.hasOwnProperty('bg')) $el.css('background-color', style.bg);
+            if (style.hasOwnProperty('color')) $el.css('color', style.color);
+            if (style.css_class) $el.addClass(style.css_class);
+            if (style.remove_class) $el.removeClass(style.remove_class);
+        }
+
+        // Apply a treegrid_patch command. Structural changes are made with rendering suspended, so the tree
+        // is redrawn once; cell updates then re-render each affected row once, followed by the styles.
+        //   removes: [key], moves: [[key, target_key, mode]], inserts: [[parent_key, node_data, mode]],
+        //   updates: {key: {field: value}}, styles: {key: {field: style}}, row_styles: {key: style}
+        function _applyPatch(patch) {
+            var tree = $.ui.fancytree.getTree('#' + CARD_CODE + '_table');
+            if (!tree) return;
+            var removes = patch.removes || [];
+            var moves = patch.moves || [];
+            var inserts = patch.inserts || [];
+            if (removes.length || moves.length || inserts.length) {
+                var wasEnabled = tree.enableUpdate(false);
+                try {
+                    removes.forEach(function(key) {
+                        var node = tree.getNodeByKey(key);
+                        if (node) node.remove();
+                    });
+                    moves.forEach(function(move) {
+                        var node = tree.getNodeByKey(move[0]);
+                        var target = tree.getNodeByKey(move[1]);
+                        if (node && target) node.moveTo(target, move[2] || 'child');
+                    });
+                    inserts.forEach(function(insert) {
+                        var mode = insert[2] || 'child';
+                        if (!insert[0]) {
+                            tree.getRootNode().addChildren(insert[1]);
+                            return;
+                        }
+                        var target = tree.getNodeByKey(insert[0]);
+                        if (!target) return;
+                        if (mode === 'before' || mode === 'after') {
+                            target.addNode(insert[1], mode);
+                        } else {
+                            target.addChildren(insert[1]);
+                            target.setExpanded(true);
+                        }
+                    });
+                } finally {
+                    tree.enableUpdate(wasEnabled);
+                }
+            }
+
+            var updates = patch.updates || {};
+            Object.keys(updates).forEach(function(key) {
+                var node = tree.getNodeByKey(key);
+                if (!node) return;
+                var fields = updates[key];
+                Object.keys(fields).forEach(function(field) {
+                    var value = fields[field];
+                    node.data[field] = value;
+                    if (field === 'title') node.title = value;
+                    var $td = _cellFor(node, field);
+                    if ($td) {
+                        var checked = (value === true || value === 'true' || value === 'Yes' || value === 1);
+                        $td.find('input[type="checkbox"]').prop('checked', checked);
+                        $td.find('select').val(String(value));
+                    }
+                });
+                if (node.tr) {
+                    if (fields.hasOwnProperty('title')) node.renderTitle();
+                    renderCells(node);
+                }
+            });
+
+            var rowStyles = patch.row_styles || {};
+            Object.keys(rowStyles).forEach(function(key) {
+                var node = tree.getNodeByKey(key);
+                if (node && node.tr) _styleElement($(node.tr), rowStyles[key]);
+            });
+            var styles = patch.styles || {};
+            Object.keys(styles).forEach(function(key) {
+                var node = tree.getNodeByKey(key);
+                if (!node || !node.tr) return;
+                Object.keys(styles[key]).forEach(function(field) {
+                    var $td = _cellFor(node, field);
+                    if ($td) _styleElement($td, styles[key][field]);
+                });
+            });
+        }
+
+        function getOnChange(fieldName) {
+            for (var i = 0; i < COLUMNS.length; i++) {
+                if (COLUMNS[i].field === fieldName) return COLUMNS[i].on_change || null;
+            }
+            return null;
+        }
+
+        function buildPostData(node, fieldName, value) {
+            // Include all node data fields so the server can recalculate
+            var data = {
+                button: CARD_CODE + '_save',
+                key: node.key,
+                field: fieldName,
+                value: value
+            };
+            // Add all current data values (excluding style keys)
+            for (var k in node.data) {
+                if (node.data.hasOwnProperty(k) && k.indexOf('__') === -1 && k.charAt(0) !== '_') {
+                    data['row_' + k] = node.data[k];
+                }
+            }
+            return data;
+        }
+
+        function recordChange(node, fieldName, value) {
+            if (FORM_FIELD) {
+                _ffEdits[node.key + ':' + fieldName] = {key: node.key, field: fieldName, value: value};
+                _writeFormField();
+                return;
+            }
+            if (SAVE_MODE === 'batch') {
+                pendingChanges[node.key + ':' + fieldName] = {
+                    key: node.key,
+                    field: fieldName,
+                    value: value
+                };
+                updateBatchUI();
+            } else if (SAVE_MODE === 'coalesce') {
+                _coalesceChanges[node.key + ':' + fieldName] = {key: node.key, field: fieldName, value: value};
+                var $td = _cellFor(node, fieldName);
+                if ($td) $td.removeClass('treegrid-cell-error').addClass('treegrid-cell-pending');
+                clearTimeout(_coalesceTimer);
+                _coalesceTimer = setTimeout(_flushCoalesced, SAVE_DELAY);
+            } else {
+                var onChangeAction = getOnChange(fieldName);
+                var postData = buildPostData(node, fieldName, value);
+                if (onChangeAction === 'reload') {
+                    ajax_helpers.post_json({data: postData, success: function(response) {
+                        if (typeof response === 'object') {
+                            ajax_helpers.process_commands(response);
+                        }
+                        reloadTreegrid();
+                    }, url: LOCATION_URL});
+                } else {
+                    ajax_helpers.post_json({data: postData, url: LOCATION_URL});
+                }
+            }
+        }
+
+        function startCellEdit($td, node) {
+            if (READ_ONLY) return;
+            if ($td.hasClass('treegrid-editing')) return;
+            var colIdx = $td.index() - TD_OFFSET;
+            if (colIdx < 0) return;
+            var editInfo = EDITABLE_FIELDS[colIdx];
+            if (!editInfo) return;
+            if (node.data.disableEdit) return;
+
+            // For non-inline selects/checkboxes, activate on double-click
+            if (!editInfo.inline && (editInfo.type === 'select' || editInfo.type === 'checkbox')) {
+                var fieldName = editInfo.field;
+                var val = (fieldName && node.data[fieldName] != null) ? node.data[fieldName] : '';
+                $td.addClass('treegrid-editing');
+
+                if (editInfo.type === 'select') {
+                    var $sel = $('<select class="treegrid-select form-control form-control-sm">');
+                    var opts = editInfo.options || [];
+                    for (var o = 0; o < opts.length; o++) {
+                        var optVal = typeof opts[o] === 'object' ? opts[o].value : opts[o];
+                        var optLabel = typeof opts[o] === 'object' ? opts[o].label : opts[o];
+                        var $opt = $('<option>').val(optVal).text(optLabel);
+                        if (String(val) === String(optVal)) $opt.prop('selected', true);
+                        $sel.append($opt);
+                    }
+                    $td.empty().append($sel);
+                    $sel.focus();
+                    (function(f, n, sel, td) {
+                        sel.on('change', function() {
+                            var newVal = $(this).val();
+                            n.data[f] = newVal;
+                            td.removeClass('treegrid-editing');
+                            // Resolve display label
+                            var label = sel.find('option:selected').text();
+                            td.text(label);
+                            recordChange(n, f, newVal);
+                        });
+                        sel.on('blur', function() {
+                            td.removeClass('treegrid-editing');
+                            var label = sel.find('option:selected').text();
+                            td.text(label);
+                        });
+                    })(fieldName, node, $sel, $td);
+                    return;
+                }
+
+                if (editInfo.type === 'checkbox') {
+                    var checked = (val === true || val === 'true' || val === 'Yes' || val === 1);
+                    var $sel = $('<select class="treegrid-select form-control form-control-sm">');
+                    $sel.append($('<option>').val('true').text('Yes'));
+                    $sel.append($('<option>').val('false').text('No'));
+                    $sel.val(checked ? 'true' : 'false');
+                    $td.empty().append($sel);
+                    $sel.focus();
+                    (function(f, n, sel, td) {
+                        function finish() {
+                            var newVal = sel.val() === 'true';
+                            n.data[f] = newVal;
+                            td.removeClass('treegrid-editing');
+                            td.html(renderBoolIcon(newVal));
+                            recordChange(n, f, newVal);
+                        }
+                        sel.on('change', function() { finish(); });
+                        sel.on('blur', function() {
+                            td.removeClass('treegrid-editing');
+                            td.html(renderBoolIcon(n.data[f]));
+                        });
+                    })(fieldName, node, $sel, $td);
+                    return;
+                }
+            }
+
+            if (editInfo.type !== 'text') return;
+
+            var fieldName = editInfo.field;
+            var isTreeColumn = (colIdx === NODE_COLUMN);
+            var currentVal;
+            var $editTarget;
+
+            if (isTreeColumn) {
+                var $titleSpan = $td.find('.fancytree-title');
+                currentVal = $titleSpan.text().trim();
+                $editTarget = $titleSpan;
+            } else {
+                currentVal = $td.text().trim();
+                $editTarget = $td;
+            }
+
+            $td.addClass('treegrid-editing');
+            var $input = $('<input type="text">').val(currentVal);
+            $editTarget.empty().append($input);
+            $input.focus().select();
+
+            function endEdit(save) {
+                var newVal = $input.val().trim();
+                $td.removeClass('treegrid-editing');
+                if (save && newVal !== currentVal) {
+                    if (fieldName === 'title') {
+                        node.setTitle(newVal);
+                    } else {
+                        node.data[fieldName] = newVal;
+                    }
+                    if (isTreeColumn) {
+                        node.renderTitle();
+                    }
+                    renderCells(node);
+                    recordChange(node, fieldName, newVal);
+                } else {
+                    if (isTreeColumn) {
+                        node.renderTitle();
+                    }
+                    renderCells(node);
+                }
+            }
+
+            $input.on('keydown', function(e) {
+                if (e.key === 'Enter') { endEdit(true); }
+                if (e.key === 'Escape') { endEdit(false); }
+            });
+            $input.on('blur', function() { endEdit(true); });
+        }
+
+        function renderBoolIcon(val) {
+            var truthy = (val === true || val === 'true' || val === 'True' || val === 'Yes' || val === 1 || val === '1');
+            if (truthy) {
+                return '<i class="fas fa-check treegrid-icon-true"></i>';
+            }
+            if (val === false || val === 'false' || val === 'False' || val === 'No' || val === 0 || val === '0') {
+                return '<i class="fas fa-times treegrid-icon-false"></i>';
+            }
+            return '';
+        }
+
+        function isVisibleFor(col, node) {
+            // If visible_for is defined, only show widget for matching node types
+            if (col.visible_for) {
+                var nodeType = node.data.type || '';
+                for (var v = 0; v < col.visible_for.length; v++) {
+                    if (col.visible_for[v] === nodeType) return true;
+                }
+                return false;
+            }
+            return true;
+        }
+
+        function _highlightText(text, term) {
+            // HTML-escape the value first, then wrap matches in <mark>
+            var safe = $('<span>').text(String(text)).html();
+            if (!term) return safe;
+            var escaped = term.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+            return safe.replace(new RegExp('(' + escaped + ')', 'gi'), '<mark>$1</mark>');
+        }
+
+        function _highlightInHtml(html, term) {
+            // Highlight term inside arbitrary HTML by walking text nodes only,
+            // so tag names / attributes are never corrupted.
+            if (!term || html == null) return String(html == null ? '' : html);
+            var escaped = term.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+            var re = new RegExp('(' + escaped + ')', 'gi');
+            var $wrap = $('<div>').html(String(html));
+            $wrap.find('*').addBack().contents().each(function() {
+                if (this.nodeType === 3 && re.test(this.nodeValue)) {
+                    re.lastIndex = 0;
+                    $(this).replaceWith(this.nodeValue.replace(re, '<mark>$1</mark>'));
+                }
+                re.lastIndex = 0;
+            });
+            return $wrap.html();
+        }
+
+        function renderCells(node) {
+            var $tr = $(node.tr);
+            var $tds = $tr.find('>td');
+            var d = node.data;
+
+            // Row-level styling from data: _row_bg, _row_color, _row_class
+            if (d._row_bg) $tr.css('background-color', d._row_bg);
+            if (d._row_color) $tr.css('color', d._row_color);
+            if (d._row_class) $tr.addClass(d._row_class);
+
+            // Node column (tree title) styling
+            var nodeField = COLUMNS[NODE_COLUMN] ? COLUMNS[NODE_COLUMN].field : '';
+            if (nodeField) {
+                var $nodeTd = $tds.eq(NODE_COLUMN + TD_OFFSET);
+                if (d[nodeField + '__bg']) $nodeTd.css('background-color', d[nodeField + '__bg']);
+                if (d[nodeField + '__color']) $nodeTd.css('color', d[nodeField + '__color']);
+                if (d[nodeField + '__class']) $nodeTd.addClass(d[nodeField + '__class']);
+                if (!READ_ONLY && !node.data.disableEdit && COLUMNS[NODE_COLUMN].edit_icon && EDITABLE_FIELDS[NODE_COLUMN]) {
+                    var $titleSpan = $nodeTd.find('.fancytree-title');
+                    if ($titleSpan.length && !$titleSpan.find('.treegrid-edit-icon').length) {
+                        $titleSpan.append('<i class="fas fa-pencil-alt treegrid-edit-icon"></i>');
+                    }
+                }
+            }
+
+            for (var i = 0; i < COLUMNS.length; i++) {
+                if (i === NODE_COLUMN) continue;  // Skip tree node column value (rendered by Fancytree)
+                var col = COLUMNS[i];
+                var field = col.field;
+                var val = (field && d[field] != null) ? d[field] : '';
+                var $td = $tds.eq(i + TD_OFFSET);
+                var editInfo = EDITABLE_FIELDS[i];
+                var colType = col.type || 'text';
+                var visible = isVisibleFor(col, node);
+
+                // Per-cell styling from data: field__bg, field__color, field__class
+                if (field) {
+                    if (d[field + '__bg']) $td.css('background-color', d[field + '__bg']);
+                    if (d[field + '__color']) $td.css('color', d[field + '__color']);
+                    if (d[field + '__class']) $td.addClass(d[field + '__class']);
+                }
+
+                // If this column should not show for this node type, render empty
+                if (!visible) {
+                    $td.empty();
+                    continue;
+                }
+
+                var disabled = !!(node.data.disableEdit);
+
+                // --- Editable widgets ---
+                if (!READ_ONLY && editInfo && editInfo.type === 'checkbox' && editInfo.inline && !disabled) {
+                    if (!$td.find('input[type="checkbox"]').length) {
+                        var checked = (val === true || val === 'true' || val === 'Yes' || val === 1);
+                        var $cb = $('<input type="checkbox" class="treegrid-checkbox">');
+                        $cb.prop('checked', checked);
+                        $td.empty().append($('<div style="text-align:center">').append($cb));
+                        (function(f, n, cb) {
+                            cb.on('change', function() {
+                                n.data[f] = $(this).prop('checked');
+                                recordChange(n, f, $(this).prop('checked'));
+                            });
+                        })(field, node, $cb);
+                    }
+                } else if (!READ_ONLY && editInfo && editInfo.type === 'checkbox' && (!editInfo.inline || disabled)) {
+                    // Non-inline checkbox, or inline checkbox on a disabled row: show as tick/empty
+                    $td.html(renderBoolIcon(val));
+                    if (editInfo.edit_icon && !disabled) $td.append('<i class="fas fa-pencil-alt treegrid-edit-icon"></i>');
+                } else if (!READ_ONLY && editInfo && editInfo.type === 'select' && editInfo.inline && !disabled) {
+                    if (!$td.find('select').length) {
+                        var $sel = $('<select class="treegrid-select form-control form-control-sm">');
+                        var opts = editInfo.options || [];
+                        for (var o = 0; o < opts.length; o++) {
+                            var optVal = typeof opts[o] === 'object' ? opts[o].value : opts[o];
+                            var optLabel = typeof opts[o] === 'object' ? opts[o].label : opts[o];
+                            var $opt = $('<option>').val(optVal).text(optLabel);
+                            if (String(val) === String(optVal)) $opt.prop('selected', true);
+                            $sel.append($opt);
+                        }
+                        $td.empty().append($sel);
+                        (function(f, n, sel) {
+                            sel.on('change', function() {
+                                n.data[f] = $(this).val();
+                                recordChange(n, f, $(this).val());
+                            });
+                        })(field, node, $sel);
+                    }
+                } else if (!READ_ONLY && editInfo && editInfo.type === 'select' && (!editInfo.inline || disabled)) {
+                    // Non-inline select, or inline select on a disabled row: show display label
+                    var displayLabel = val;
+                    var opts = editInfo.options || [];
+                    for (var o = 0; o < opts.length; o++) {
+                        var optVal = typeof opts[o] === 'object' ? opts[o].value : opts[o];
+                        var optLabel = typeof opts[o] === 'object' ? opts[o].label : opts[o];
+                        if (String(val) === String(optVal)) { displayLabel = optLabel; break; }
+                    }
+                    $td.text(displayLabel);
+                    if (editInfo.edit_icon && !disabled) $td.append('<i class="fas fa-pencil-alt treegrid-edit-icon"></i>');
+
+                // --- Display-only types ---
+                } else if (colType === 'boolean') {
+                    $td.html(renderBoolIcon(val));
+                } else if (colType === 'html') {
+                    var htmlHlTerm = PAGINATION ? (_filterTerm || _filterColTerms[i] || '') : '';
+                    $td.html(htmlHlTerm ? _highlightInHtml(val, htmlHlTerm) : val);
+                } else if (colType === 'actions') {
+                    if (!$td.find('.treegrid-action-btn').length) {
+                        var actions = col.actions || [];
+                        var html = '';
+                        for (var a = 0; a < actions.length; a++) {
+                            var act = actions[a];
+                            html += '<button class="treegrid-action-btn" data-action="' + act.name + '" title="' + (act.title || act.name) + '">';
+                            html += '<i class="' + (act.icon || 'fas fa-cog') + '"></i>';
+                            html += '</button> ';
+                        }
+                        $td.html(html);
+                        // Bind action handlers
+                        $td.find('.treegrid-action-btn').on('click', function(e) {
+                            e.stopPropagation();
+                            var actionName = $(this).data('action');
+                            ajax_helpers.post_json({data: {
+                                button: CARD_CODE + '_action',
+                                key: node.key,
+                                action: actionName
+                            }, url: LOCATION_URL});
+                        });
+                    }
+                } else {
+                    // Default: plain text (highlight match when pagination filter is active)
+                    var hlTerm = PAGINATION ? (_filterTerm || _filterColTerms[i] || '') : '';
+                    if (hlTerm) {
+                        $td.html(_highlightText(val, hlTerm));
+                    } else {
+                        $td.text(val);
+                    }
+                    if (editInfo && editInfo.edit_icon && !disabled) $td.append('<i class="fas fa-pencil-alt treegrid-edit-icon"></i>');
+                }
+            }
+        }
+
+        function updateInfo() {
+            var $info = $('#' + CARD_CODE + '_info');
+            if (PAGINATION) {
+                var total = SERVER_SIDE ? _serverUnfilteredTotal : _allNodes.length;
+                var activeCount = _activeCount();
+                if (activeCount === 0) { $info.text('No entries'); return; }
+                var start = (_currentPage - 1) * _pageSize + 1;
+                var end = Math.min(_currentPage * _pageSize, activeCount);
+                if (SERVER_SIDE ? activeCount !== total : _filteredNodes !== null) {
+                    $info.text('Showing ' + start + ' to ' + end + ' of ' + activeCount + ' (filtered from ' + total + ')');
+                } else {
+                    $info.text('Showing ' + start + ' to ' + end + ' of ' + total + ' entries');
+                }
+                return;
+            }
+            var tree = $.ui.fancytree.getTree('#' + CARD_CODE + '_table');
+            if (!tree) return;
+            var total = tree.count();
+            var visible = tree.count(true);
+            if (_filterMatchCount !== null) {
+                $info.text('Showing ' + visible + ' of ' + _filterMatchCount + ' (filtered from ' + total + ')');
+            } else {
+                $info.text('Showing ' + visible + ' of ' + total + ' entries');
+            }
+        }
+
+        // Build fancytree source/lazyLoad based on data mode
+        function getTreeSource() {
+            if (DATA_MODE === 'static') {
+                if (PAGINATION) {
+                    _allNodes = STATIC_DATA;
+                    _allKeys  = STATIC_DATA.map(function(n) { return n.key; });
+                    return STATIC_DATA.slice(0, _pageSize);
+                }
+                return STATIC_DATA;
+            } else if (DATA_MODE === 'url') {
+                return {url: DATA_URL, cache: false};
+            } else if (SERVER_SIDE) {
+                // Server-side pagination: only the current page of root nodes is requested
+                return function(event, data) {
+                    return _fetchServerPage(_currentPage).then(function(nodes) {
+                        _updatePaginationUI();
+                        return nodes;
+                    });
+                };
+            } else if (PAGINATION) {
+                // Pagination mode: fetch all root nodes once, then slice client-side.
+                // No further server requests are needed when changing pages.
+                return function(event, data) {
+                    var deferred = $.Deferred();
+                    $.ajax({
+                        url: LOCATION_URL,
+                        method: 'POST',
+                        data: JSON.stringify({treegrid_data: true, card_id: CARD_CODE, parent: null}),
+                        contentType: 'application/json',
+                        beforeSend: function(xhr) {
+                            xhr.setRequestHeader('X-Requested-With', 'XMLHttpRequest');
+                            xhr.setRequestHeader('X-CSRFToken', ajax_helpers.getCookie('csrftoken'));
+                        }
+                    }).done(function(resp) {
+                        _allNodes = Array.isArray(resp) ? resp : (resp.nodes || []);
+                        _allKeys = _allNodes.map(function(n) { return n.key; });
+                        _currentPage = 1;
+                        _updatePaginationUI();
+                        deferred.resolve(_allNodes.slice(0, _pageSize));
+                    }).fail(function() {
+                        deferred.reject(arguments);
+                    });
+                    return deferred.promise();
+                };
+            } else {
+                // Standard ajax mode: POST to same page via ajax_helpers
+                return function(event, data) {
+                    return $.ajax({
+                        url: LOCATION_URL,
+                        method: 'POST',
+                        data: JSON.stringify({treegrid_data: true, card_id: CARD_CODE, parent: null}),
+                        contentType: 'application/json',
+                        beforeSend: function(xhr) {
+                            xhr.setRequestHeader('X-Requested-With', 'XMLHttpRequest');
+                            xhr.setRequestHeader('X-CSRFToken', ajax_helpers.getCookie('csrftoken'));
+                        }
+                    });
+                };
+            }
+        }
+
+        // Request one page of root nodes with the current search, filters and sort
+        function _fetchServerPage(page) {
+            var hidden = {};
+            Object.keys(_jsFilterActive).forEach(function(field) {
+                var values = Object.keys(_jsFilterActive[field]);
+                if (values.length) hidden[field] = values;
+            });
+            var request = {treegrid_data: true, card_id: CARD_CODE, parent: null, page: page, page_size: _pageSize,
+                           search: _filterTerm, column_filters: _serverColFilters, js_filters: hidden,
+                           sort_field: _sortField, sort_dir: _sortDir};
+            if (_serverFacets === null) request.facet_fields = _facetFields();
+            return $.ajax({
+                url: LOCATION_URL,
+                method: 'POST',
+                data: JSON.stringify(request),
+                contentType: 'application/json',
+                beforeSend: function(xhr) {
+                    xhr.setRequestHeader('X-Requested-With', 'XMLHttpRequest');
+                    xhr.setRequestHeader('X-CSRFToken', ajax_helpers.getCookie('csrftoken'));
+                }
+            }).then(function(resp) {
+                _serverTotal = resp.total || 0;
+                _serverUnfilteredTotal = resp.unfiltered_total !== undefined ? resp.unfiltered_total : _serverTotal;
+                if (resp.facets) _serverFacets = resp.facets;
+                _currentPage = resp.page || page;
+                return resp.nodes || [];
+            });
+        }
+
+        // Fields whose value counts are needed for the side-panel filters and auto-option column filters
+        function _facetFields() {
+            var fields = JS_FILTERS.map(function(f) { return f.field; });
+            $('#' + CARD_CODE + '_table .treegrid-col-filter[data-auto-options]').each(function() {
+                var column = COLUMNS[parseInt($(this).data('col-idx'))];
+                if (column && column.field) fields.push(column.field);
+            });
+            return fields;
+        }
+
+        function _updatePaginationUI() {
+            var count = _activeCount();
+            var totalPages = Math.ceil(count / _pageSize);
+            if (count <= _pageSize) {
+                $('#' + CARD_CODE + '_pagination').addClass('d-none').removeClass('d-flex');
+                return;
+            }
+            $('#' + CARD_CODE + '_pagination').removeClass('d-none').addClass('d-flex');
+            $('#' + CARD_CODE + '_page_info').text('Page ' + _currentPage + ' of ' + totalPages);
+            $('#' + CARD_CODE + '_prev_page').prop('disabled', _currentPage <= 1);
+            $('#' + CARD_CODE + '_next_page').prop('disabled', _currentPage >= totalPages);
+        }
+
+        // Returns whichever node set is currently active (filtered subset or full list).
+        function _activeNodes() {
+            return _filteredNodes !== null ? _filteredNodes : _allNodes;
+        }
+
+        // Number of root nodes after filtering, across all pages
+        function _activeCount() {
+            return SERVER_SIDE ? _serverTotal : _activeNodes().length;
+        }
+
+        function _loadPage(page) {
+            var tree = $.ui.fancytree.getTree('#' + CARD_CODE + '_table');
+            if (!tree) return;
+            if (SERVER_SIDE) {
+                var request = ++_serverRequest;
+                _fetchServerPage(page).done(function(pageNodes) {
+                    if (request !== _serverRequest) return;
+                    _showPage(tree, pageNodes, _currentPage);
+                    if (_filterTerm) $('#' + CARD_CODE + '_matches').text('(' + _serverTotal + ' matches)');
+                    updateInfo();
+                });
+                return;
+            }
+            var nodes = _activeNodes();
+            var start = (page - 1) * _pageSize;
+            _showPage(tree, nodes.slice(start, start + _pageSize), page);
+        }
+
+        function _showPage(tree, pageNodes, page) {
+            var root = tree.getRootNode();
+            root.removeChildren();
+            root.addChildren(pageNodes);
+            if (CHECKBOX) {
+                tree.visit(function(node) {
+                    if (node.key in _pagedSelectedKeys) {
+                        node.setSelected(true);
+                    } else if (node.key in _childSelectionCounts) {
+                        // Restore partial selection indicator without loading children
+                        node.partsel = true;
+                        node.renderStatus();
+                    }
+                });
+            }
+            _currentPage = page;
+            _updatePaginationUI();
+        }
+
+        // Filter _allNodes in memory and paginate the results.
+        // Searches all data fields, not just node.title.
+        function _nodeMatchesGlobal(node, lower) {
+            if (String(node.title || '').toLowerCase().indexOf(lower) !== -1) return true;
+            if (node.data) {
+                for (var k in node.data) {
+                    if (node.data.hasOwnProperty(k) && node.data[k] != null && k !== 'type') {
+                        if (String(node.data[k]).toLowerCase().indexOf(lower) !== -1) return true;
+                    }
+                }
+            }
+            return false;
+        }
+
+        function _nodeMatchesColFilters(node, filters) {
+            for (var f = 0; f < filters.length; f++) {
+                var fi = filters[f];
+                var cellVal = '';
+                if (fi.colIdx === NODE_COLUMN) {
+                    cellVal = node.title || '';
+                } else {
+                    var field = COLUMNS[fi.colIdx] ? COLUMNS[fi.colIdx].field : '';
+                    cellVal = (field && node.data && node.data[field] != null) ? String(node.data[field]) : '';
+                }
+                if (cellVal.toLowerCase().indexOf(fi.val) === -1) return false;
+            }
+            return true;
+        }
+
+        function _applyPaginatedFilter(nodes) {
+            _filteredNodes = nodes;
+            _loadPage(1);
+        }
+
+        function _clearPaginatedFilter() {
+            if (!PAGINATION) return;
+            _filteredNodes = null;
+            _filterTerm = '';
+            _filterColTerms = {};
+            _serverColFilters = {};
+            _loadPage(1);
+        }
+
+        function _getNodeFieldValue(node, field) {
+            for (var i = 0; i < COLUMNS.length; i++) {
+                if (COLUMNS[i].field === field) {
+                    if (i === NODE_COLUMN) return String(node.title || '');
+                    var v = (node.data && node.data[field] != null) ? node.data[field] : '';
+                    return String(v);
+                }
+            }
+            var v = (node.data && node.data[field] != null) ? node.data[field] : '';
+            return String(v);
+        }
+
+        function _nodeMatchesJsFilters(node) {
+            for (var i = 0; i < JS_FILTERS.length; i++) {
+                var hidden = _jsFilterActive[JS_FILTERS[i].field];
+                if (!hidden || Object.keys(hidden).length === 0) continue;
+                var val = _getNodeFieldValue(node, JS_FILTERS[i].field);
+                if (hidden.hasOwnProperty(val)) return false;
+            }
+            return true;
+        }
+
+        function _hasActiveJsFilters() {
+            for (var i = 0; i < JS_FILTERS.length; i++) {
+                var hidden = _jsFilterActive[JS_FILTERS[i].field];
+                if (hidden && Object.keys(hidden).length > 0) return true;
+            }
+            return false;
+        }
+
+        function buildJsFilters() {
+            if (!JS_FILTERS.length) return;
+            var $panel = $('#' + CARD_CODE + '_js_filter_panel');
+            if (!$panel.length) return;
+            for (var fi = 0; fi < JS_FILTERS.length; fi++) {
+                var f = JS_FILTERS[fi];
+                var counts = {};
+                if (SERVER_SIDE) {
+                    counts = $.extend({}, (_serverFacets || {})[f.field]);
+                } else if (PAGINATION) {
+                    for (var ni = 0; ni < _allNodes.length; ni++) {
+                        var val = _getNodeFieldValue(_allNodes[ni], f.field);
+                        counts[val] = (counts[val] || 0) + 1;
+                    }
+                } else {
+                    var tree = $.ui.fancytree.getTree('#' + CARD_CODE + '_table');
+                    if (tree) {
+                        (function(field) {
+                            tree.visit(function(node) {
+                                var v = _getNodeFieldValue(node, field);
+                                counts[v] = (counts[v] || 0) + 1;
+                            });
+                        })(f.field);
+                    }
+                }
+                var $content = $panel.find('.treegrid-js-filter-block[data-field="' + f.field + '"] .treegrid-js-filter-content');
+                $content.empty();
+                var hidden = _jsFilterActive[f.field] || {};
+                var sortedVals = Object.keys(counts).sort();
+                for (var vi = 0; vi < sortedVals.length; vi++) {
+                    var v = sortedVals[vi];
+                    var $label = $('<label class="treegrid-jsf-check">');
+                    var $cb = $('<input type="checkbox">').val(v).prop('checked', !hidden.hasOwnProperty(v)).attr('data-field', f.field);
+                    $label.append($cb);
+                    $label.append($('<span class="treegrid-jsf-label">').text(v || '(blank)'));
+                    $label.append($('<span class="badge badge-secondary ml-1">').text(counts[v]));
+                    $content.append($label);
+                }
+            }
+        }
+
+        function _applyJsFilters() {
+            var hasActive = _hasActiveJsFilters();
+            if (SERVER_SIDE) {
+                _loadPage(1);
+            } else if (PAGINATION) {
+                var lower = _filterTerm;
+                var hasSearch = lower && lower.length > 0;
+                if (!hasActive && !hasSearch) {
+                    _filteredNodes = null;
+                    _loadPage(1);
+                } else {
+                    var matched = _allNodes.filter(function(n) {
+                        return _nodeMatchesJsFilters(n) && (!hasSearch || _nodeMatchesGlobal(n, lower));
+                    });
+                    _applyPaginatedFilter(matched);
+                }
+            } else {
+                var tree = $.ui.fancytree.getTree('#' + CARD_CODE + '_table');
+                if (!tree) return;
+                if (hasActive) {
+                    var count = tree.filterNodes(function(node) { return _nodeMatchesJsFilters(node); }, {autoExpand: FILTER_AUTO_EXPAND});
+                    _filterMatchCount = count;
+                } else {
+                    tree.clearFilter();
+                    _filterMatchCount = null;
+                }
+            }
+            updateInfo();
+        }
+
+        // Children fetched for several parents in one request, consumed by lazyLoad
+        var _bulkChildren = {};
+
+        function _loadChildrenBulk(nodes) {
+            var keys = nodes.filter(function(node) {
+                return node.isLazy() && !node.isLoaded() && !_bulkChildren.hasOwnProperty(node.key);
+            }).map(function(node) { return node.key; });
+            if (keys.length === 0) return $.when();
+            return $.ajax({
+                url: LOCATION_URL,
+                method: 'POST',
+                data: JSON.stringify({treegrid_data: true, card_id: CARD_CODE, parents: keys}),
+                contentType: 'application/json',
+                beforeSend: function(xhr) {
+                    xhr.setRequestHeader('X-Requested-With', 'XMLHttpRequest');
+                    xhr.setRequestHeader('X-CSRFToken', ajax_helpers.getCookie('csrftoken'));
+                }
+            }).then(function(resp) {
+                Object.keys(resp).forEach(function(key) { _bulkChildren[key] = resp[key]; });
+            }, function() {
+                // Fall back to loading each node on its own
+                return $.when();
+            });
+        }
+
+        function expandAll(tree) {
+            if (DATA_MODE !== 'ajax') {
+                return tree.expandAll(true);
+            }
+            // Expand a level at a time, loading all lazy nodes on a level with one request
+            function expandLevel(nodes) {
+                nodes = nodes.filter(function(node) { return node.hasChildren() !== false; });
+                if (nodes.length === 0) return $.when();
+                return _loadChildrenBulk(nodes).then(function() {
+                    return $.when.apply($, nodes.map(function(node) {
+                        return node.setExpanded(true, {noAnimation: true});
+                    }));
+                }).then(function() {
+                    var next = [];
+                    nodes.forEach(function(node) { next = next.concat(node.children || []); });
+                    return expandLevel(next);
+                });
+            }
+            return expandLevel(tree.rootNode.children || []);
+        }
+
+        function getLazyLoad() {
+            if (DATA_MODE === 'static') {
+                return undefined;
+            } else if (DATA_MODE === 'url') {
+                return function(event, data) {
+                    data.result = {url: DATA_URL, data: {parent: data.node.key}, cache: false};
+                };
+            } else {
+                // 'ajax' mode
+                return function(event, data) {
+                    if (_bulkChildren.hasOwnProperty(data.node.key)) {
+                        data.result = _bulkChildren[data.node.key];
+                        delete _bulkChildren[data.node.key];
+                        return;
+                    }
+                    data.result = $.ajax({
+                        url: LOCATION_URL,
+                        method: 'POST',
+                        data: JSON.stringify({treegrid_data: true, card_id: CARD_CODE, parent: data.node.key}),
+                        contentType: 'application/json',
+                        beforeSend: function(xhr) {
+                            xhr.setRequestHeader('X-Requested-With', 'XMLHttpRequest');
+                            xhr.setRequestHeader('X-CSRFToken', ajax_helpers.getCookie('csrftoken'));
+                        }
+                    });
+                };
+            }
+        }
+
+        $(function() {
+            var treeConfig = {
+                extensions: ['table', 'filter'],
+                checkbox: CHECKBOX,
+                selectMode: CHECKBOX ? 3 : 1,
+                source: getTreeSource(),
+                table: {
+                    indentation: INDENTATION,
+                    nodeColumnIdx: TD_OFFSET + NODE_COLUMN,
+                    checkboxColumnIdx: CHECKBOX ? (SORTABLE ? 1 : 0) + (DRAG_DROP ? 1 : 0) + CHECKBOX_COLUMN : null
+                },
+                filter: {
+                    autoApply: true,
+                    autoExpand: true,
+                    counter: true,
+                    highlight: true,
+                    mode: 'hide'
+                },
+                renderColumns: function(event, data) {
+                    renderCells(data.node);
+                    if (SORTABLE) {
+                        var $handleTd = $(data.node.tr).find('>td').eq(0);
+                        if (data.node.data.no_sort) {
+                            $handleTd.html('');
+                        } else {
+                            $handleTd.html('<span class="treegrid-drag-handle"><i class="fas fa-arrows-alt-v"></i></span>');
+                        }
+                    }
+                    if (DRAG_DROP) {
+                        var $ddHandleTd = $(data.node.tr).find('>td').eq(SORTABLE ? 1 : 0);
+                        $ddHandleTd.html('<span class="treegrid-drag-handle"><i class="fas fa-arrows-alt"></i></span>');
+                    }
+                    // Highlight the node title when a pagination filter is active
+                    if (PAGINATION) {
+                        var titleTerm = _filterTerm || _filterColTerms[NODE_COLUMN] || '';
+                        if (titleTerm) {
+                            var $title = $(data.node.tr).find('.fancytree-title');
+                            if ($title.length) $title.html(_highlightText($title.text(), titleTerm));
+                        }
+                    }
+                },
+                init: function(event, data) {
+                    if (DATA_MODE === 'static' && PAGINATION) _updatePaginationUI();
+                    updateInfo();
+                    buildJsFilters();
+                    _populateAutoFilters();
+                    if (EXPAND_ALL) {
+                        expandAll(data.tree);
+                    }
+                    if (CURRENT_NODE) {
+                        var currentFtNode = data.tree.getNodeByKey(CURRENT_NODE);
+                        if (currentFtNode) {
+                            currentFtNode.makeVisible({scrollIntoView: true}).done(function() {
+                                currentFtNode.setActive(true);
+                            });
+                        }
+                    }
+                    if (FORM_FIELD) {
+                        // Restore edits/reorders/selections from existing field value
+                        // (e.g. re-rendering after a form validation error).
+                        var existingVal = $('[name="' + FORM_FIELD + '"]').val();
+                        var parsedField = null;
+                        if (existingVal) {
+                            try {
+                                parsedField = JSON.parse(existingVal);
+                                // Restore edits keyed by "nodeKey:field"
+                                if (parsedField.edits && Array.isArray(parsedField.edits)) {
+                                    parsedField.edits.forEach(function(edit) {
+                                        _ffEdits[edit.key + ':' + edit.field] = edit;
+                                    });
+                                }
+                                // Restore reorders keyed by parent key
+                                if (parsedField.reorders && Array.isArray(parsedField.reorders)) {
+                                    parsedField.reorders.forEach(function(reorder) {
+                                        _ffReorders[reorder.parent_key || '__root__'] = reorder;
+                                    });
+                                }
+                                // Restore drag-drop moves (ordered list)
+                                if (parsedField.moves && Array.isArray(parsedField.moves)) {
+                                    _ffMoves = parsedField.moves;
+                                }
+                            } catch (e) {}
+                        }
+                        // Re-apply edits visually to already-loaded nodes
+                        if (Object.keys(_ffEdits).length > 0) {
+                            var editsByNode = {};
+                            Object.values(_ffEdits).forEach(function(edit) {
+                                if (!editsByNode[edit.key]) editsByNode[edit.key] = [];
+                                editsByNode[edit.key].push(edit);
+                            });
+                            data.tree.visit(function(node) {
+                                var nodeEdits = editsByNode[node.key];
+                                if (nodeEdits) {
+                                    nodeEdits.forEach(function(edit) {
+                                        if (edit.field === 'title') {
+                                            node.setTitle(edit.value);
+                                        } else {
+                                            node.data[edit.field] = edit.value;
+                                        }
+                                    });
+                                    renderCells(node);
+                                }
+                            });
+                        }
+                        if (CHECKBOX) {
+                            var initialKeys = [];
+                            if (parsedField && parsedField.selected && Array.isArray(parsedField.selected)) {
+                                initialKeys = parsedField.selected;
+                            }
+                            if (initialKeys.length === 0) {
+                                initialKeys = DEFAULT_SELECTED;
+                            }
+                            if (initialKeys.length > 0) {
+                                initialKeys.forEach(function(k) { _ffSelectedKeys[k] = true; });
+                                data.tree.visit(function(node) {
+                                    if (_ffSelectedKeys[node.key]) node.setSelected(true);
+                                });
+                                updateSelectCount();
+                                _writeFormField();
+                            }
+                        }
+                    }
+                },
+                select: function(event, data) {
+                    // Track selections across pages when pagination is active
+                    if (PAGINATION && CHECKBOX) {
+                        if (data.node.isSelected()) {
+                            _pagedSelectedKeys[data.node.key] = true;
+                        } else {
+                            delete _pagedSelectedKeys[data.node.key];
+                        }
+                        // Track how many children are selected under each root node
+                        // so we can restore the partsel indicator when paging back
+                        if (!data.node.isTopLevel()) {
+                            var rootNode = data.node;
+                            while (rootNode.parent && !rootNode.parent.isRootNode()) {
+                                rootNode = rootNode.parent;
+                            }
+                            if (data.node.isSelected()) {
+                                _childSelectionCounts[rootNode.key] = (_childSelectionCounts[rootNode.key] || 0) + 1;
+                            } else {
+                                if (_childSelectionCounts[rootNode.key] > 0) {
+                                    _childSelectionCounts[rootNode.key]--;
+                                }
+                                if (!_childSelectionCounts[rootNode.key]) {
+                                    delete _childSelectionCounts[rootNode.key];
+                                }
+                            }
+                        }
+                    }
+                    updateSelectCount();
+                    if (FORM_FIELD) _writeFormField();
+                    // When a lazy node with unloaded children is deselected, fancytree
+                    // leaves it as partially selected — force it to fully unselected.
+                    if (CHECKBOX && !data.node.isSelected() && data.node.lazy && !data.node.isLoaded()) {
+                        data.node.partsel = false;
+                        data.node.renderStatus();
+                    }
+                },
+                loadChildren: function(event, data) {
+                    updateInfo();
+                    buildJsFilters();
+                    _populateAutoFilters();
+                    if (CHECKBOX) {
+                        if (data.node.isSelected()) {
+                            data.node.visit(function(child) {
+                                child.setSelected(true);
+                            });
+                        } else if (PAGINATION) {
+                            // Restore individual child selections from cross-page tracking
+                            data.node.visit(function(child) {
+                                if (child.key in _pagedSelectedKeys) {
+                                    child.setSelected(true);
+                                }
+                            });
+                        } else if (!data.node.partsel) {
+                            // Non-pagination: explicitly deselect children of a non-selected parent
+                            data.node.visit(function(child) {
+                                child.setSelected(false);
+                            });
+                        }
+                        // Apply any pending initial selections (DEFAULT_SELECTED / field restore)
+                        if (FORM_FIELD && Object.keys(_ffSelectedKeys).length > 0) {
+                            data.node.visit(function(child) {
+                                if (_ffSelectedKeys[child.key]) child.setSelected(true);
+                            });
+                            _writeFormField();
+                        }
+                        updateSelectCount();
+                    }
+                    // Re-apply edits to newly loaded children (lazy load / field restore)
+                    if (FORM_FIELD && Object.keys(_ffEdits).length > 0) {
+                        var editsByNode = {};
+                        Object.values(_ffEdits).forEach(function(edit) {
+                            if (!editsByNode[edit.key]) editsByNode[edit.key] = [];
+                            editsByNode[edit.key].push(edit);
+                        });
+                        data.node.visit(function(child) {
+                            var nodeEdits = editsByNode[child.key];
+                            if (nodeEdits) {
+                                nodeEdits.forEach(function(edit) {
+                                    if (edit.field === 'title') {
+                                        child.setTitle(edit.value);
+                                    } else {
+                                        child.data[edit.field] = edit.value;
+                                    }
+                                });
+                                renderCells(child);
+                            }
+                        });
+                    }
+                },
+                expand: function() { updateInfo(); },
+                collapse: function() { updateInfo(); },
+                icon: function(event, data) {
+                    var nodeType = data.node.data.type;
+                    if (nodeType && ICON_MAP[nodeType]) {
+                        return ICON_MAP[nodeType];
+                    }
+                    if (data.node.folder) return 'fas fa-folder';
+                    return 'fas fa-file';
+                }
+            };
+            var lazyFn = getLazyLoad();
+            if (lazyFn) treeConfig.lazyLoad = lazyFn;
+
+            if (DRAG_DROP) {
+                var _ddDragNode     = null;
+                var _ddClone        = null;
+                var _ddPlaceholder  = null;
+                var _ddDropTarget   = null;
+                var _ddStartY       = 0;
+                var _ddActive       = false;
+
+                $('#' + CARD_CODE + '_table').on('mousedown', '.treegrid-drag-handle', function(e) {
+                    if (e.which !== 1) return;
+                    var $tr = $(this).closest('tr');
+                    _ddDragNode = $.ui.fancytree.getNode($tr[0]);
+                    if (!_ddDragNode) return;
+                    _ddStartY   = e.clientY;
+                    _ddActive   = false;
+                    _ddDropTarget = null;
+                    e.preventDefault();
+                    $(document).on('mousemove.tgdd', _ddMove).on('mouseup.tgdd', _ddEnd);
+                });
+
+                function _ddMove(e) {
+                    if (!_ddDragNode) return;
+                    if (!_ddActive) {
+                        if (Math.abs(e.clientY - _ddStartY) < 4) return;
+                        _ddActive = true;
+                        _ddBegin(e);
+                    }
+                    _ddClone.css('top', e.clientY + 10);
+
+                    var el = document.elementFromPoint(e.clientX, e.clientY);
+                    var $target = el ? $(el).closest('tr') : $();
+                    if (!$target.length || $target.hasClass('treegrid-sort-placeholder') || $target[0] === _ddDragNode.tr) return;
+                    var targetNode = $.ui.fancytree.getNode($target[0]);
+                    if (!targetNode || targetNode.tree !== _ddDragNode.tree) return;
+                    if (!DRAG_CROSS_LEVEL && targetNode.parent !== _ddDragNode.parent) return;
+                    // Prevent dropping onto own descendant
+                    var anc = targetNode;
+                    while (anc) { if (anc === _ddDragNode) return; anc = anc.parent; }
+
+                    var rect   = $target[0].getBoundingClientRect();
+                    var isAbove = e.clientY < rect.top + rect.height / 2;
+                    var mode   = isAbove ? 'before' : 'after';
+                    _ddDropTarget = {node: targetNode, mode: mode};
+                    if (isAbove) { _ddPlaceholder.insertBefore($target); }
+                    else         { _ddPlaceholder.insertAfter($target); }
+                }
+
+                function _ddBegin(e) {
+                    var $tr       = $(_ddDragNode.tr);
+                    var $table    = $('#' + CARD_CODE + '_table');
+                    var tableRect = $table[0].getBoundingClientRect();
+                    var widths    = [];
+                    $tr.find('>td').each(function() { widths.push($(this).outerWidth()); });
+                    var $cloneTr  = $tr.clone();
+                    $cloneTr.find('>td').each(function(i) { $(this).css('width', widths[i]); });
+                    _ddClone = $('<table>').addClass('treegrid-sort-clone table table-sm')
+                        .css({position: 'fixed', top: e.clientY + 10, left: tableRect.left,
+                              width: $table.outerWidth(), 'z-index': 9999, opacity: 0.85,
+                              'pointer-events': 'none', 'box-shadow': '0 4px 14px rgba(0,0,0,0.18)',
+                              'border-radius': '3px', background: '#fff', 'table-layout': 'fixed'})
+                        .append($('<tbody>').append($cloneTr));
+                    $('body').append(_ddClone);
+                    _ddPlaceholder = $('<tr class="treegrid-sort-placeholder">').append(
+                        $('<td>').attr('colspan', $tr.find('>td').length)
+                    );
+                    $tr.after(_ddPlaceholder);
+                    $tr.addClass('treegrid-sort-source');
+                    $('body').addClass('treegrid-sorting');
+                }
+
+                function _ddEnd() {
+                    $(document).off('.tgdd');
+                    $('body').removeClass('treegrid-sorting');
+                    if (!_ddActive || !_ddDragNode) { _ddDragNode = null; return; }
+                    if (_ddClone)       { _ddClone.remove();       _ddClone = null; }
+                    if (_ddPlaceholder) { _ddPlaceholder.remove(); _ddPlaceholder = null; }
+                    $(_ddDragNode.tr).removeClass('treegrid-sort-source');
+
+                    if (_ddDropTarget && _ddDropTarget.node !== _ddDragNode) {
+                        var t = _ddDropTarget;
+                        var oldParent    = _ddDragNode.parent;
+                        var oldParentKey = oldParent.isRootNode() ? '' : oldParent.key;
+                        _ddDragNode.moveTo(t.node, t.mode);
+                        var newParent    = _ddDragNode.parent;
+                        var newParentKey = newParent.isRootNode() ? '' : newParent.key;
+                        var siblings     = newParent.children || [];
+                        var siblingKeys  = siblings.map(function(s) { return s.key; });
+                        var newIndex     = 0;
+                        for (var i = 0; i < siblings.length; i++) {
+                            if (siblings[i] === _ddDragNode) { newIndex = i; break; }
+                        }
+                        if (FORM_FIELD) {
+                            _ffMoves.push({
+                                key:            _ddDragNode.key,
+                                target_key:     t.node.key,
+                                hit_mode:       t.mode,
+                                old_parent_key: oldParentKey,
+                                parent_key:     newParentKey,
+                                new_index:      newIndex,
+                                sibling_keys:   siblingKeys
+                            });
+                            _writeFormField();
+                        } else {
+                            ajax_helpers.post_json({
+                                data: {
+                                    button:          CARD_CODE + '_drag_drop',
+                                    key:             _ddDragNode.key,
+                                    target_key:      t.node.key,
+                                    hit_mode:        t.mode,
+                                    old_parent_key:  oldParentKey,
+                                    parent_key:      newParentKey,
+                                    new_index:       newIndex,
+                                    sibling_keys:    JSON.stringify(siblingKeys)
+                                },
+                                url: LOCATION_URL
+                            });
+                        }
+                    }
+                    _ddDragNode = _ddDropTarget = null;
+                    _ddActive = false;
+                }
+            }
+
+            $('#' + CARD_CODE + '_table').fancytree(treeConfig);
+
+            // Mouse-based row sorting (no HTML5 drag API — avoids text-selection and ghost issues)
+            if (SORTABLE) {
+                var _sortDragNode   = null;
+                var _sortClone      = null;
+                var _sortPlaceholder = null;
+                var _sortDropTarget = null;  // {node, mode}
+                var _sortStartY     = 0;
+                var _sortActive     = false;
+
+                $('#' + CARD_CODE + '_table').on('mousedown', '.treegrid-drag-handle', function(e) {
+                    if (e.which !== 1) return;
+                    var $tr = $(this).closest('tr');
+                    _sortDragNode = $.ui.fancytree.getNode($tr[0]);
+                    if (!_sortDragNode) return;
+                    _sortStartY  = e.clientY;
+                    _sortActive  = false;
+                    _sortDropTarget = null;
+                    e.preventDefault();  // Prevent text selection
+                    $(document).on('mousemove.tgsort', _sortMove).on('mouseup.tgsort', _sortEnd);
+                });
+
+                function _sortMove(e) {
+                    if (!_sortDragNode) return;
+
+                    if (!_sortActive) {
+                        if (Math.abs(e.clientY - _sortStartY) < 4) return;
+                        _sortActive = true;
+                        _sortBegin(e);
+                    }
+
+                    // Float the clone under the cursor
+                    _sortClone.css('top', e.clientY + 10);
+
+                    // Find the row under the cursor (clone has pointer-events:none so it is skipped)
+                    var el = document.elementFromPoint(e.clientX, e.clientY);
+                    var $target = el ? $(el).closest('tr') : $();
+                    if (!$target.length || $target.hasClass('treegrid-sort-placeholder') || $target[0] === _sortDragNode.tr) {
+                        return;
+                    }
+                    var targetNode = $.ui.fancytree.getNode($target[0]);
+                    if (!targetNode || targetNode.parent !== _sortDragNode.parent) return;
+                    if (targetNode.data.no_sort) return;
+
+                    var rect   = $target[0].getBoundingClientRect();
+                    var isAbove = e.clientY < rect.top + rect.height / 2;
+                    var mode   = isAbove ? 'before' : 'after';
+                    _sortDropTarget = {node: targetNode, mode: mode};
+
+                    if (isAbove) {
+                        _sortPlaceholder.insertBefore($target);
+                    } else {
+                        _sortPlaceholder.insertAfter($target);
+                    }
+                }
+
+                function _sortBegin(e) {
+                    var $tr    = $(_sortDragNode.tr);
+                    var $table = $('#' + CARD_CODE + '_table');
+                    var tableRect = $table[0].getBoundingClientRect();
+
+                    // Capture column widths before cloning
+                    var widths = [];
+                    $tr.find('>td').each(function() { widths.push($(this).outerWidth()); });
+
+                    // Floating clone
+                    var $cloneTr = $tr.clone();
+                    $cloneTr.find('>td').each(function(i) { $(this).css('width', widths[i]); });
+                    _sortClone = $('<table>').addClass('treegrid-sort-clone table table-sm')
+                        .css({
+                            position:        'fixed',
+                            top:             e.clientY + 10,
+                            left:            tableRect.left,
+                            width:           $table.outerWidth(),
+                            'z-index':       9999,
+                            opacity:         0.85,
+                            'pointer-events':'none',
+                            'box-shadow':    '0 4px 14px rgba(0,0,0,0.18)',
+                            'border-radius': '3px',
+                            background:      '#fff',
+                            'table-layout':  'fixed'
+                        })
+                        .append($('<tbody>').append($cloneTr));
+                    $('body').append(_sortClone);
+
+                    // Placeholder row (same height, blue-outlined)
+                    _sortPlaceholder = $('<tr class="treegrid-sort-placeholder">').append(
+                        $('<td>').attr('colspan', $tr.find('>td').length)
+                    );
+                    $tr.after(_sortPlaceholder);
+
+                    // Fade original row
+                    $tr.addClass('treegrid-sort-source');
+
+                    // Disable text selection for the duration
+                    $('body').addClass('treegrid-sorting');
+                }
+
+                function _sortEnd() {
+                    $(document).off('.tgsort');
+                    $('body').removeClass('treegrid-sorting');
+
+                    if (!_sortActive || !_sortDragNode) {
+                        _sortDragNode = null;
+                        return;
+                    }
+
+                    if (_sortClone)      { _sortClone.remove();      _sortClone = null; }
+                    if (_sortPlaceholder){ _sortPlaceholder.remove(); _sortPlaceholder = null; }
+
+                    $(_sortDragNode.tr).removeClass('treegrid-sort-source');
+
+                    if (_sortDropTarget) {
+                        var t = _sortDropTarget;
+                        if (t.node !== _sortDragNode) {
+                            _sortDragNode.moveTo(t.node, t.mode);
+                        }
+                    }
+
+                    var parent      = _sortDragNode.parent;
+                    var siblings    = parent.children || [];
+                    var siblingKeys = siblings.map(function(s) { return s.key; });
+                    var newIndex    = 0;
+                    for (var i = 0; i < siblings.length; i++) {
+                        if (siblings[i] === _sortDragNode) { newIndex = i; break; }
+                    }
+
+                    var parentKey = parent.isRootNode() ? '' : parent.key;
+                    if (FORM_FIELD) {
+                        _ffReorders[parentKey || '__root__'] = {
+                            key:          _sortDragNode.key,
+                            parent_key:   parentKey,
+                            new_index:    newIndex,
+                            sibling_keys: siblingKeys
+                        };
+                        _writeFormField();
+                    } else {
+                        ajax_helpers.post_json({
+                            data: {
+                                button:       CARD_CODE + '_reorder',
+                                key:          _sortDragNode.key,
+                                parent_key:   parentKey,
+                                new_index:    newIndex,
+                                sibling_keys: JSON.stringify(siblingKeys)
+                            },
+                            url: LOCATION_URL
+                        });
+                    }
+
+                    _sortDragNode = _sortDropTarget = null;
+                    _sortActive   = false;
+                }
+            }
+
+            // Inline editing via double-click (text fields only)
+            if (!READ_ONLY) {
+                $('#' + CARD_CODE + '_table').on('dblclick', 'td', function(e) {
+                    if ($(e.target).is('input, select, option') || $(e.target).closest('.treegrid-action-btn').length) return;
+                    var $td = $(this);
+                    var $tr = $td.closest('tr');
+                    var node = $.ui.fancytree.getNode($tr);
+                    if (node) {
+                        startCellEdit($td, node);
+                    }
+                });
+            }
+
+            function _populateAutoFilters() {
+                var $autoSelects = $('#' + CARD_CODE + '_table .treegrid-col-filter[data-auto-options]');
+                if (!$autoSelects.length) return;
+
+                var colIndices = [];
+                $autoSelects.each(function() { colIndices.push(parseInt($(this).data('col-idx'))); });
+
+                var colValues = {};
+                colIndices.forEach(function(i) { colValues[i] = {}; });
+
+                function collectFrom(title, data) {
+                    colIndices.forEach(function(idx) {
+                        var val = idx === NODE_COLUMN
+                            ? String(title || '')
+                            : (COLUMNS[idx] && data && data[COLUMNS[idx].field] != null
+                                ? String(data[COLUMNS[idx].field]) : '');
+                        if (val) colValues[idx][val] = true;
+                    });
+                }
+
+                if (SERVER_SIDE) {
+                    colIndices.forEach(function(idx) {
+                        var counts = COLUMNS[idx] ? (_serverFacets || {})[COLUMNS[idx].field] : null;
+                        Object.keys(counts || {}).forEach(function(val) { if (val) colValues[idx][val] = true; });
+                    });
+                } else if (PAGINATION && _allNodes.length) {
+                    _allNodes.forEach(function(n) { collectFrom(n.title, n.data); });
+                } else {
+                    var tree = $.ui.fancytree.getTree('#' + CARD_CODE + '_table');
+                    if (tree) tree.visit(function(node) { collectFrom(node.title, node.data); });
+                }
+
+                $autoSelects.each(function() {
+                    var $sel = $(this);
+                    var idx = parseInt($sel.data('col-idx'));
+                    var currentVal = $sel.val();
+                    var values = Object.keys(colValues[idx]).sort();
+                    $sel.find('option:not(:first)').remove();
+                    values.forEach(function(v) { $sel.append($('<option>').val(v).text(v)); });
+                    if (currentVal) $sel.val(currentVal);
+                });
+            }
+
+            // Per-column filters
+            if (SHOW_COL_FILTERS) {
+                // Stop Fancytree intercepting arrow/backspace keys typed into filter inputs
+                $('#' + CARD_CODE + '_table').on('keydown', '.treegrid-col-filter', function(e) {
+                    e.stopPropagation();
+                });
+                $('#' + CARD_CODE + '_table').on('keyup change', '.treegrid-col-filter', function() {
+                    var filters = [];
+                    $('#' + CARD_CODE + '_table .treegrid-col-filter').each(function() {
+                        var val = $(this).val().trim().toLowerCase();
+                        var colIdx = parseInt($(this).data('col-idx'));
+                        if (val) {
+                            filters.push({colIdx: colIdx, val: val});
+                        }
+                    });
+                    if (filters.length === 0) {
+                        if (PAGINATION) {
+                            _clearPaginatedFilter();
+                        } else {
+                            $.ui.fancytree.getTree('#' + CARD_CODE + '_table').clearFilter();
+                            _filterMatchCount = null;
+                        }
+                    } else {
+                        if (SERVER_SIDE) {
+                            _filterTerm = '';
+                            _filterColTerms = {};
+                            _serverColFilters = {};
+                            filters.forEach(function(f) {
+                                _filterColTerms[f.colIdx] = f.val;
+                                if (COLUMNS[f.colIdx]) _serverColFilters[COLUMNS[f.colIdx].field] = f.val;
+                            });
+                            _loadPage(1);
+                        } else if (PAGINATION) {
+                            var matched = _allNodes.filter(function(n) { return _nodeMatchesColFilters(n, filters); });
+                            _filterTerm = '';
+                            _filterColTerms = {};
+                            filters.forEach(function(f) { _filterColTerms[f.colIdx] = f.val; });
+                            _applyPaginatedFilter(matched);
+                        } else {
+                            var tree = $.ui.fancytree.getTree('#' + CARD_CODE + '_table');
+                            _filterMatchCount = tree.filterNodes(function(node) { return _nodeMatchesColFilters(node, filters); }, {autoExpand: FILTER_AUTO_EXPAND});
+                        }
+                    }
+                    updateInfo();
+                });
+
+            }
+
+            // JS side-panel filter checkboxes
+            if (JS_FILTERS.length) {
+                $('#' + CARD_CODE + '_js_filter_panel').on('change', 'input[type="checkbox"]', function() {
+                    var field = $(this).data('field');
+                    var val = $(this).val();
+                    if (!_jsFilterActive[field]) _jsFilterActive[field] = {};
+                    if ($(this).prop('checked')) {
+                        delete _jsFilterActive[field][val];
+                    } else {
+                        _jsFilterActive[field][val] = true;
+                    }
+                    _applyJsFilters();
+                });
+                $('#' + CARD_CODE + '_js_filter_panel').on('click', '.treegrid-jsf-clear-field', function(e) {
+                    e.preventDefault();
+                    var field = $(this).data('field');
+                    _jsFilterActive[field] = {};
+                    $('#' + CARD_CODE + '_js_filter_panel .treegrid-js-filter-block[data-field="' + field + '"] input[type="checkbox"]').prop('checked', true);
+                    _applyJsFilters();
+                });
+                $('#' + CARD_CODE + '_js_filter_panel').on('click', '.treegrid-jsf-deselect-field', function(e) {
+                    e.preventDefault();
+                    var field = $(this).data('field');
+                    if (!_jsFilterActive[field]) _jsFilterActive[field] = {};
+                    $('#' + CARD_CODE + '_js_filter_panel .treegrid-js-filter-block[data-field="' + field + '"] input[type="checkbox"]').each(function() {
+                        _jsFilterActive[field][$(this).val()] = true;
+                        $(this).prop('checked', false);
+                    });
+                    _applyJsFilters();
+                });
+            }
+
+            // Global filter controls
+            function applyFilter() {
+                var val = $('#' + CARD_CODE + '_filter_input').val().trim();
+                if (val) {
+                    if (SERVER_SIDE) {
+                        _filterTerm = val.toLowerCase();
+                        _filterColTerms = {};
+                        _serverColFilters = {};
+                        _loadPage(1);
+                    } else if (PAGINATION) {
+                        var lower = val.toLowerCase();
+                        _filterTerm = lower;
+                        _filterColTerms = {};
+                        var matched = _allNodes.filter(function(n) {
+                            return _nodeMatchesGlobal(n, lower) && _nodeMatchesJsFilters(n);
+                        });
+                        _applyPaginatedFilter(matched);
+                        $('#' + CARD_CODE + '_matches').text('(' + matched.length + ' matches)');
+                    } else {
+                        var tree = $.ui.fancytree.getTree('#' + CARD_CODE + '_table');
+                        var count = tree.filterNodes(val, {autoExpand: FILTER_AUTO_EXPAND});
+                        _filterMatchCount = count;
+                        $('#' + CARD_CODE + '_matches').text('(' + count + ' matches)');
+                    }
+                } else {
+                    if (PAGINATION) {
+                        _filterTerm = '';
+                        _filterColTerms = {};
+                        if (_hasActiveJsFilters()) {
+                            _applyJsFilters();
+                        } else {
+                            _clearPaginatedFilter();
+                        }
+                    } else {
+                        $.ui.fancytree.getTree('#' + CARD_CODE + '_table').clearFilter();
+                        _filterMatchCount = null;
+                    }
+                    $('#' + CARD_CODE + '_matches').text('');
+                }
+                updateInfo();
+            }
+
+            $('#' + CARD_CODE + '_filter_btn').on('click', applyFilter);
+            $('#' + CARD_CODE + '_filter_input').on('keydown', function(e) {
+                if (e.key === 'Enter') applyFilter();
+            });
+            $('#' + CARD_CODE + '_filter_clear').on('click', function() {
+                $('#' + CARD_CODE + '_filter_input').val('');
+                if (PAGINATION) {
+                    _filterTerm = '';
+                    _filterColTerms = {};
+                    if (_hasActiveJsFilters()) {
+                        _applyJsFilters();
+                    } else {
+                        _clearPaginatedFilter();
+                    }
+                } else {
+                    $.ui.fancytree.getTree('#' + CARD_CODE + '_table').clearFilter();
+                    _filterMatchCount = null;
+                }
+                $('#' + CARD_CODE + '_matches').text('');
+                updateInfo();
+            });
+
+            // Expand/Collapse All
+            $('#' + CARD_CODE + '_expand_all').on('click', function() {
+                expandAll($.ui.fancytree.getTree('#' + CARD_CODE + '_table'));
+            });
+            $('#' + CARD_CODE + '_collapse_all').on('click', function() {
+                $.ui.fancytree.getTree('#' + CARD_CODE + '_table').expandAll(false);
+            });
+
+            // Select All / Deselect All
+            if (CHECKBOX) {
+                if (PAGINATION) {
+                    // Select all root nodes across every page
+                    $('#' + CARD_CODE + '_select_all_pages').on('click', function() {
+                        _allKeys.forEach(function(key) { _pagedSelectedKeys[key] = true; });
+                        var tree = $.ui.fancytree.getTree('#' + CARD_CODE + '_table');
+                        tree.visit(function(node) {
+                            if (node.key in _pagedSelectedKeys) { node.setSelected(true); }
+                        });
+                        updateSelectCount();
+                        if (FORM_FIELD) _writeFormField();
+                    });
+                    // Deselect every root node across every page
+                    $('#' + CARD_CODE + '_deselect_all_pages').on('click', function() {
+                        _pagedSelectedKeys = {};
+                        _childSelectionCounts = {};
+                        $.ui.fancytree.getTree('#' + CARD_CODE + '_table').selectAll(false);
+                        updateSelectCount();
+                        if (FORM_FIELD) _writeFormField();
+                    });
+                    // Select only the root nodes visible on the current page
+                    $('#' + CARD_CODE + '_select_page').on('click', function() {
+                        $.ui.fancytree.getTree('#' + CARD_CODE + '_table').selectAll(true);
+                        updateSelectCount();
+                        if (FORM_FIELD) _writeFormField();
+                    });
+                    // Deselect only the root nodes visible on the current page
+                    $('#' + CARD_CODE + '_deselect_page').on('click', function() {
+                        $.ui.fancytree.getTree('#' + CARD_CODE + '_table').selectAll(false);
+                        updateSelectCount();
+                        if (FORM_FIELD) _writeFormField();
+                    });
+                } else {
+                    $('#' + CARD_CODE + '_select_all').on('click', function() {
+                        $.ui.fancytree.getTree('#' + CARD_CODE + '_table').selectAll(true);
+                        updateSelectCount();
+                        if (FORM_FIELD) _writeFormField();
+                    });
+                    $('#' + CARD_CODE + '_deselect_all').on('click', function() {
+                        $.ui.fancytree.getTree('#' + CARD_CODE + '_table').selectAll(false);
+                        updateSelectCount();
+                        if (FORM_FIELD) _writeFormField();
+                    });
+                }
+                // "Submit Selected" button is hidden in form_field mode; shown only for AJAX mode.
+                $('#' + CARD_CODE + '_get_selected').on('click', function() {
+                    ajax_helpers.post_json({
+                        data: {
+                            button: CARD_CODE + '_selected',
+                            selected_keys: JSON.stringify(getSelectedKeys())
+                        }, url: LOCATION_URL
+                    });
+                });
+            }
+
+            // Toolbar buttons
+            $('#' + CARD_CODE + '_card').on('click', '.treegrid-toolbar-btn', function() {
+                var action = $(this).data('action');
+                var postData = {button: CARD_CODE + '_' + action};
+                if (CHECKBOX) {
+                    postData.selected_keys = JSON.stringify(getSelectedKeys());
+                }
+                ajax_helpers.post_json({data: postData, url: LOCATION_URL});
+            });
+
+            // Batch save controls
+            if (SAVE_MODE === 'batch') {
+                $('#' + CARD_CODE + '_save_btn').on('click', function() {
+                    var changes = Object.values(pendingChanges);
+                    if (changes.length === 0) return;
+                    ajax_helpers.post_json({data: {
+                        button: CARD_CODE + '_batch_save',
+                        changes: JSON.stringify(changes)
+                    }, url: LOCATION_URL});
+                    pendingChanges = {};
+                    updateBatchUI();
+                });
+                $('#' + CARD_CODE + '_discard_btn').on('click', function() {
+                    pendingChanges = {};
+                    updateBatchUI();
+                    var tree = $.ui.fancytree.getTree('#' + CARD_CODE + '_table');
+                    tree.reload();
+                });
+            }
+
+            // Pagination controls (only present when server returns paginated response)
+            $('#' + CARD_CODE + '_prev_page').on('click', function() {
+                if (_currentPage > 1) _loadPage(_currentPage - 1);
+            });
+            $('#' + CARD_CODE + '_next_page').on('click', function() {
+                if (_currentPage < Math.ceil((SERVER_SIDE ? _serverTotal : _allKeys.length) / _pageSize)) {
+                    _loadPage(_currentPage + 1);
+                }
+            });
+            function _doPageJump() {
+                var totalPages = Math.ceil(_activeCount() / _pageSize);
+                var page = parseInt($('#' + CARD_CODE + '_page_jump').val());
+                if (!isNaN(page) && page >= 1 && page <= totalPages) {
+                    _loadPage(page);
+                }
+                $('#' + CARD_CODE + '_page_jump').val('');
+            }
+            $('#' + CARD_CODE + '_page_jump').on('keydown', function(e) {
+                if (e.key === 'Enter') _doPageJump();
+            });
+            $('#' + CARD_CODE + '_page_jump_btn').on('click', _doPageJump);
+
+            // Server-side sorting: clicking a column header sorts the root nodes, clicking again reverses
+            if (SERVER_SIDE) {
+                var $sortHeaders = $('#' + CARD_CODE + '_table thead tr').not('.treegrid-column-filters').last()
+                    .children('th').slice(TD_OFFSET);
+                $sortHeaders.each(function(colIdx) {
+                    var column = COLUMNS[colIdx];
+                    if (!column || !column.field || column.sort === false || column.type === 'actions') return;
+                    $(this).css('cursor', 'pointer').on('click', function() {
+                        _sortDir = (_sortField === column.field && _sortDir === 'asc') ? 'desc' : 'asc';
+                        _sortField = column.field;
+                        $sortHeaders.find('.treegrid-sort-icon').remove();
+                        $(this).append(' <i class="fas fa-sort-' + (_sortDir === 'asc' ? 'up' : 'down') +
+                                       ' treegrid-sort-icon"></i>');
+                        _loadPage(1);
+                    });
+                });
+            }
+
+            // Context menu - supports MenuItem HTML (server-rendered) and dict items (JS-built)
+            var $ctxMenu = $('#' + CARD_CODE + '_context_menu-menu');
+
+            if ($ctxMenu.length === 0 && CONTEXT_MENU.length > 0) {
+                // No server-rendered menu, build entirely from dicts
+                var menuHtml = '<div id="' + CARD_CODE + '_context_menu" class="dropdown-menu treegrid-context-menu">';
+                for (var m = 0; m < CONTEXT_MENU.length; m++) {
+                    var item = CONTEXT_MENU[m];
+                    if (item.divider) {
+                        menuHtml += '<div class="dropdown-divider"></div>';
+                    } else {
+                        menuHtml += '<a class="dropdown-item treegrid-ctx-item" data-action="' + item.name + '" href="#">';
+                        if (item.icon) menuHtml += '<i class="' + item.icon + ' mr-2"></i>';
+                        menuHtml += item.label + '</a>';
+                    }
+                }
+                menuHtml += '</div>';
+                $('body').append(menuHtml);
+                $ctxMenu = $('#' + CARD_CODE + '_context_menu');
+            } else if ($ctxMenu.length > 0 && CONTEXT_MENU.length > 0) {
+                // Server-rendered menu exists, append dict items to it
+                for (var m = 0; m < CONTEXT_MENU.length; m++) {
+                    var item = CONTEXT_MENU[m];
+                    if (item.divider) {
+                        $ctxMenu.append('<div class="dropdown-divider"></div>');
+                    } else {
+                        $ctxMenu.append('<a class="dropdown-item treegrid-ctx-item" data-action="' + item.name + '" href="#">' +
+                            (item.icon ? '<i class="' + item.icon + ' mr-2"></i>' : '') + item.label + '</a>');
+                    }
+                }
+            }
+            if ($ctxMenu.length > 0) {
+                $ctxMenu.addClass('treegrid-context-menu');
+                // Move to body for correct fixed positioning
+                $ctxMenu.detach().appendTo('body');
+            }
+
+            if ($ctxMenu.length > 0) {
+                var ctxNodeKey = null;
+
+                // Store original hrefs so we can re-inject the key each time
+                $ctxMenu.find('.dropdown-item:not(.treegrid-ctx-item)').each(function() {
+                    $(this).data('original-href', $(this).attr('href') || '');
+                    var onclick = $(this).attr('onclick');
+                    if (onclick) $(this).data('original-onclick', onclick);
+                });
+
+                $('#' + CARD_CODE + '_table').on('contextmenu', 'tr', function(e) {
+                    e.preventDefault();
+                    var node = $.ui.fancytree.getNode(this);
+                    if (!node) return;
+                    ctxNodeKey = node.key;
+                    node.setActive(true);
+
+                    // Inject node key into all MenuItem hrefs
+                    $ctxMenu.find('.dropdown-item:not(.treegrid-ctx-item)').each(function() {
+                        var origHref = $(this).data('original-href');
+                        if (origHref) {
+                            $(this).attr('href', origHref.replace(/__node_key__/g, ctxNodeKey));
+                        }
+                        var origOnclick = $(this).data('original-onclick');
+                        if (origOnclick) {
+                            $(this).attr('onclick', origOnclick.replace(/__node_key__/g, ctxNodeKey));
+                        }
+                    });
+
+                    $ctxMenu.css({
+                        top: e.clientY + 'px',
+                        left: e.clientX + 'px',
+                        display: 'block',
+                        position: 'fixed',
+                        'z-index': 1050
+                    });
+                });
+
+                $(document).on('click', function() {
+                    $ctxMenu.hide();
+                });
+
+                // Simple dict-based menu items post via ajax
+                $ctxMenu.on('click', '.treegrid-ctx-item', function(e) {
+                    e.preventDefault();
+                    var action = $(this).data('action');
+                    $ctxMenu.hide();
+                    if (ctxNodeKey) {
+                        ajax_helpers.post_json({data: {
+                            button: CARD_CODE + '_context',
+                            key: ctxNodeKey,
+                            action: action
+                        }, url: LOCATION_URL});
+                    }
+                });
+            }
+
+            // Row click
+            if (ROW_CLICK) {
+                $('#' + CARD_CODE + '_table').addClass('treegrid-row-clickable');
+                var _rowClickTimer = null;
+                var _rowClickIgnore = '.fancytree-checkbox, .fancytree-expander, ' +
+                    '.treegrid-action-btn, .treegrid-edit-icon, .treegrid-drag-handle, ' +
+                    'select, input, a, button, label';
+                $('#' + CARD_CODE + '_table').on('click', 'tr', function(e) {
+                    if ($(e.target).closest(_rowClickIgnore).length) return;
+                    var $tr = $(this);
+                    function fireRowClick() {
+                        var node = $.ui.fancytree.getNode($tr[0]);
+                        if (!node) return;
+                        ajax_helpers.post_json({
+                            data: {button: CARD_CODE + '_' + ROW_CLICK, key: node.key},
+                            url: LOCATION_URL
+                        });
+                    }
+                    if (READ_ONLY) {
+                        fireRowClick();
+                    } else {
+                        // Delay so a double-click (cell edit) can cancel before the action fires
+                        if (_rowClickTimer) { clearTimeout(_rowClickTimer); _rowClickTimer = null; }
+                        _rowClickTimer = setTimeout(function() { _rowClickTimer = null; fireRowClick(); }, 200);
+                    }
+                });
+                if (!READ_ONLY) {
+                    $('#' + CARD_CODE + '_table').on('dblclick', 'tr.fancytree-node', function() {
+                        if (_rowClickTimer) { clearTimeout(_rowClickTimer); _rowClickTimer = null; }
+                    });
+                }
+            }
+
+            // Column resizing
+            if (RESIZABLE) {
+                var $table = $('#' + CARD_CODE + '_table');
+                $table.find('thead tr:last th').each(function(i) {
+                    if (i === 0 && CHECKBOX) return;  // Skip checkbox column
+                    var $th = $(this);
+                    var $handle = $('<div class="treegrid-resize-handle"></div>');
+                    $th.css('position', 'relative');
+                    $th.append($handle);
+                    var startX, startWidth;
+                    $handle.on('mousedown', function(e) {
+                        e.preventDefault();
+                        startX = e.pageX;
+                        startWidth = $th.outerWidth();
+                        $(document).on('mousemove.treegrid-resize', function(e2) {
+                            var newWidth = startWidth + (e2.pageX - startX);
+                            if (newWidth > 30) {
+                                $th.css('width', newWidth + 'px');
+                                // Update the matching col element
+                                $table.find('colgroup col').eq(i).css('width', newWidth + 'px');
+                            }
+                        });
+                        $(document).on('mouseup.treegrid-resize', function() {
+                            $(document).off('.treegrid-resize');
+                        });
+                    });
+                });
+            }
+        });
+    }
+
+    return {
+        init: init
+    };
+})();
@@ -1,6 +1,8 @@
 from django import template
 from django.utils.safestring import mark_safe
 
+from cards.fast_render import render_default_rows
+
 register = template.Library()
 
 
@@ -11,3 +13,14 @@ def show_card(card, override_card_context=None):
     else:
         html = card.render(override_card_context)
     return mark_safe(html)
+
+
+@register.simple_tag(takes_context=True)
+def fast_default_rows(context, card):
+    """
+    Renders the rows of a `fast_render` standard card (its first window for `window_rows` cards) with
+    `cards.fast_render.render_default_rows()` instead of `cards/standard/_default_rows.html`.
+    """
+    rows = card.get_visible_rows() if card.window_rows else card.rows
+    return mark_safe(render_default_rows(rows, item_css_class=context.get('item_css_class', ''),
+                                         item_css=context.get('item_css', '')))
@@ -0,0 +1,884 @@
+import datetime
+import json
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db.models.signals import post_save
+from django.test import TestCase, RequestFactory
+from django.utils import translation
+from django.views.generic import TemplateView
+
+from cards.base import CardBase, CardEntry, RowStyle, CARD_TYPE_ORDERED_DATATABLE, CARD_TYPE_STANDARD
+from cards.channels import card_group_name, reload_cards_on_save, unsign_subscription
+from cards.standard import AsyncCardMixin, CardPostError
+from cards_examples.models import Company, CompanyCategory, Payment, Person, Sector, Status, Tags
+from cards_examples.views.dashboard import AsyncDashboardExample, LazyDashboardExample, StreamedDashboardExample, \
+    WindowedRowsExample
+from cards_examples.views.datatable import DatatableOrderExample
+from cards_examples.views.linked_datatables import LinkedDatatablesFourLevelExample, LinkedDatatablesPaymentExample
+from cards_examples.views.list import ExampleCompanyCardPagedList
+from cards_examples.views.tree import ExampleCompanyTree, ExampleLazyTree
+from cards_examples.views.new_features import NewFeatures2Index, NewFeaturesIndex, TooltipTestIndex
+from cards_examples.views.row_styles import RowStyleExampleIndex
+
+User = get_user_model()
+
+
+class CardViewTestMixin:
+    """Shared helpers for building card views outside of the URL dispatcher."""
+
+    view_class = None
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.user = User(username='test', is_superuser=False)
+
+    def _get_view(self, path='/'):
+        request = self.factory.get(path)
+        request.user = self.user
+        view = self.view_class()
+        view.setup(request)
+        return view
+
+
+class TestSingleCardReload(CardViewTestMixin, TestCase):
+    view_class = NewFeaturesIndex
+
+    def test_builder_used_instead_of_setup_cards(self):
+        view = self._get_view()
+        with mock.patch.object(NewFeaturesIndex, 'setup_cards') as setup_cards:
+            response = view.button_reload_card(card='reload')
+        setup_cards.assert_not_called()
+        commands = json.loads(response.content)
+        self.assertEqual(commands[0]['selector'], '#reload_ajax')
+        self.assertIn('AJAX Reload Examples', commands[0]['html'])
+        self.assertEqual(list(view.cards), ['reload'])
+
+    def test_fallback_to_full_rebuild(self):
+        view = self._get_view()
+        response = view.button_reload_card(card='badge')
+        commands = json.loads(response.content)
+        self.assertEqual(commands[0]['selector'], '#badge_ajax')
+        self.assertIn('reload', view.cards)
+
+    def test_unknown_card(self):
+        view = self._get_view()
+        response = view.button_reload_card(card='missing')
+        commands = json.loads(response.content)
+        self.assertEqual(commands[0]['function'], 'null')
+
+
+class TestPushCard(CardViewTestMixin, TestCase):
+    view_class = NewFeaturesIndex
+
+    def test_rendered_once_and_sent(self):
+        view = self._get_view()
+        with mock.patch('cards.channels.send_card_html', create=True) as send_card_html:
+            html = view.push_card('reload')
+        send_card_html.assert_called_once_with('reload', html, group_name=None, obj=None)
+        self.assertIn('AJAX Reload Examples', html)
+
+    def test_missing_card_not_sent(self):
+        view = self._get_view()
+        with mock.patch('cards.channels.send_card_html', create=True) as send_card_html:
+            self.assertIsNone(view.push_card('missing'))
+        send_card_html.assert_not_called()
+
+
+class TestCardSubscriptions(TestCase):
+
+    def test_group_names(self):
+        company = Company.objects.create(name='Company')
+        self.assertEqual(card_group_name('details'), 'card_updates.details')
+        self.assertEqual(card_group_name('details', company),
+                         f'card_updates.details.cards_examples.company.{company.pk}')
+        self.assertEqual(card_group_name('details', Company()), 'card_updates.details')
+        self.assertLess(len(card_group_name('x' * 200)), 100)
+
+    def test_subscription_tokens(self):
+        company = Company.objects.create(name='Company')
+        card = CardBase(request=None, code='details', details_object=company)
+        self.assertEqual([unsign_subscription(token) for token in card.get_reload_subscriptions()],
+                         [card_group_name('details'), card_group_name('details', company)])
+        self.assertIsNone(unsign_subscription(card_group_name('details', company)))
+        card = CardBase(request=None, code='details')
+        self.assertEqual([unsign_subscription(token) for token in card.get_reload_subscriptions()],
+                         [card_group_name('details')])
+
+    def test_reload_cards_on_save(self):
+        reload_cards_on_save(Sector, 'sector_details')
+        self.addCleanup(post_save.disconnect, sender=Sector,
+                        dispatch_uid='cards_reload.cards_examples.sector.sector_details')
+        with mock.patch('cards.channels.send_card_reload', create=True) as send_card_reload:
+            with self.captureOnCommitCallbacks(execute=True):
+                sector = Sector.objects.create(name='Sector')
+        send_card_reload.assert_called_once_with('sector_details', obj=sector)
+
+
+class TestRenderCache(TestCase):
+
+    class Details:
+        pk = 1
+
+        def __init__(self, name, modified):
+            self.name = name
+            self.modified = modified
+
+    def setUp(self):
+        caches['default'].clear()
+        self.request = RequestFactory().get('/')
+
+    def _card(self, details_object, **kwargs):
+        card = CardBase(request=self.request, code='cached', details_object=details_object,
+                        cache_key='cached_card', **kwargs)
+        card.add_entry(label='Name', value=details_object.name)
+        return card
+
+    def test_cached_until_modified_changes(self):
+        details = self.Details('First', modified=1)
+        self.assertIn('First', self._card(details).render())
+        details.name = 'Second'
+        self.assertIn('First', self._card(details).render())
+        details.modified = 2
+        self.assertIn('Second', self._card(details).render())
+
+    def test_version_callable(self):
+        details = self.Details('First', modified=1)
+        self.assertIn('First', self._card(details, cache_version=lambda o: o.name).render())
+        details.name = 'Second'
+        self.assertIn('Second', self._card(details, cache_version=lambda o: o.name).render())
+
+    def test_no_cache_key(self):
+        card = CardBase(request=self.request, code='uncached', details_object=self.Details('First', 1))
+        self.assertIsNone(card.get_render_cache_key())
+
+
+class TestRowStyle(TestCase):
+
+    def test_placeholders_parsed_once(self):
+        row_style = RowStyle('<b>{label}</b> {value[v1]} {test}')
+        self.assertEqual(row_style.field_names, {'label', 'value', 'test'})
+
+    def test_missing_values_blank(self):
+        row_style = RowStyle('<b>{label}</b>{foo}')
+        self.assertEqual(row_style.render({'label': 'Name', 'value': 'x'}), '<b>Name</b>')
+
+    def test_extra_values(self):
+        row_style = RowStyle('{value} - {test}')
+        self.assertEqual(row_style.render({'value': 'a'}, extra={'test': 'b'}), 'a - b')
+
+    def test_escaped_braces(self):
+        self.assertEqual(RowStyle('<i>{{literal}}</i>').render({}), '<i>{literal}</i>')
+        self.assertEqual(RowStyle('{{x}} {value}').render({'value': 'a'}), '{x} a')
+
+    def test_menu_only_rendered_when_used(self):
+        menu = mock.Mock()
+        menu.render.return_value = '<menu>'
+        self.assertEqual(RowStyle('{value}').render({'value': 'a'}, menu=menu), 'a')
+        menu.render.assert_not_called()
+        self.assertEqual(RowStyle('{value}{menu}').render({'value': 'a'}, menu=menu), 'a<menu>')
+
+
+class TestCardEntry(TestCase):
+
+    def _entry(self, **kwargs):
+        card = CardBase(request=RequestFactory().get('/'), code='entries')
+        card.add_entry(**kwargs)
+        return card.rows[0]['entries'][0]
+
+    def test_slots(self):
+        entry = self._entry(label='Name', value='Acme')
+        self.assertIsInstance(entry, CardEntry)
+        self.assertFalse(hasattr(entry, '__dict__'))
+        self.assertEqual((entry.label, entry.html), ('Name', 'Acme'))
+
+    def test_every_slot_set(self):
+        # Reads of unset slots fall back to __getattr__, which made entries several times slower to use
+        entry = self._entry(value='Acme')
+        for name, default in CardEntry.defaults.items():
+            self.assertEqual(object.__getattribute__(entry, name), default if name != 'html' else 'Acme')
+        self.assertEqual(object.__getattribute__(entry, 'extra'), {})
+
+    def test_defaults(self):
+        entry = self._entry(value='Acme')
+        self.assertIsNone(entry.badge)
+        self.assertEqual(entry['css_class'], '')
+        self.assertFalse(entry.get('copy_to_clipboard'))
+        self.assertIn('old_value', entry)
+
+    def test_dict_access(self):
+        entry = self._entry(label='Name', value='Acme', badge='New')
+        entry['entry_css_class'] = 'text-danger'
+        self.assertEqual(entry['entry_css_class'], 'text-danger')
+        self.assertEqual(dict(entry.items())['badge'], 'New')
+        self.assertEqual(entry.get('missing', 'x'), 'x')
+        with self.assertRaises(KeyError):
+            entry['missing']
+
+    def test_extra_kwargs(self):
+        entry = self._entry(value='Acme', data_id='acme')
+        self.assertEqual(entry['data_id'], 'acme')
+        self.assertEqual(entry.data_id, 'acme')
+        self.assertIn('data_id', entry.keys())
+
+    def test_rendered(self):
+        card = CardBase(request=RequestFactory().get('/'), code='entries')
+        card.add_entry(label='Name', value='Acme', badge='New')
+        html = card.render()
+        self.assertIn('Acme', html)
+        self.assertIn('New', html)
+
+
+class TestDatatableSort(CardViewTestMixin, TestCase):
+    view_class = DatatableOrderExample
+
+    def setUp(self):
+        super().setUp()
+        self.statuses = [Status.objects.create(name=f'Status {i}') for i in range(4)]
+
+    def _card(self, **card_kwargs):
+        return self._get_view().add_card('statuses', group_type=CARD_TYPE_ORDERED_DATATABLE,
+                                         datatable_model=Status, **card_kwargs)
+
+    def _reversed_sort(self):
+        return [(i + 1, s.id) for i, s in enumerate(reversed(self.statuses))]
+
+    def _current_order(self):
+        return list(Status.objects.order_by('order').values_list('id', flat=True))
+
+    def test_sort_with_save(self):
+        self._card().datatable_sort(sort=self._reversed_sort())
+        self.assertEqual(self._current_order(), [s.id for s in reversed(self.statuses)])
+
+    def test_sort_single_update(self):
+        card = self._card(order_save_instances=False)
+        with self.assertNumQueries(4):  # select, savepoint, update, release
+            card.datatable_sort(sort=self._reversed_sort())
+        self.assertEqual(self._current_order(), [s.id for s in reversed(self.statuses)])
+
+
+class TestPrefetchedManyToMany(TestCase):
+
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+        self.company = Company.objects.create(name='Company')
+        self.company.sectors.add(Sector.objects.create(name='Retail', type=1),
+                                 Sector.objects.create(name='Finance', type=2))
+        self.company = Company.objects.get(pk=self.company.pk)
+
+    def _sectors_html(self, card):
+        return card.rows[-1]['entries'][0]['html']
+
+    def test_prefetch_declared_on_card(self):
+        card = CardBase(request=self.request, details_object=self.company, prefetch=['sectors'])
+        with self.assertNumQueries(0):
+            card.add_entry(field='sectors')
+            card.add_entry(field='sectors', query_filter={'type': 2})
+            card.add_entry(field='sectors', query_filter={'name__icontains': 'RET'})
+        self.assertIn('Finance', card.rows[1]['entries'][0]['html'])
+        self.assertNotIn('Retail', card.rows[1]['entries'][0]['html'])
+        self.assertIn('Retail', self._sectors_html(card))
+
+    def test_unsupported_lookup_queries_database(self):
+        card = CardBase(request=self.request, details_object=self.company, prefetch=['sectors'])
+        with self.assertNumQueries(1):
+            card.add_entry(field='sectors', query_filter={'companysectors__name': 'Company'})
+        self.assertIn('Retail', self._sectors_html(card))
+
+    def test_values_converted_like_the_database(self):
+        card = CardBase(request=self.request, details_object=self.company, prefetch=['sectors'])
+        with self.assertNumQueries(0):
+            card.add_entry(field='sectors', query_filter={'type': '2'})
+            card.add_entry(field='sectors', query_filter={'created__gte': '2000-01-01T00:00:00+00:00',
+                                                          'type__in': ['1']})
+        html = [row['entries'][0]['html'] for row in card.rows]
+        self.assertIn('Finance', html[0])
+        self.assertNotIn('Retail', html[0])
+        self.assertIn('Retail', html[1])
+        self.assertNotIn('Finance', html[1])
+
+    def test_relation_filtered_without_loading(self):
+        category = CompanyCategory.objects.create(name='Category')
+        Company.objects.filter(pk=self.company.pk).update(company_category=category)
+        tag = Tags.objects.create(tag='Tag')
+        tag.company.add(self.company, Company.objects.create(name='Other'))
+        tag = Tags.objects.prefetch_related('company').get(pk=tag.pk)
+        card = CardBase(request=self.request, details_object=tag)
+        with self.assertNumQueries(0):
+            card.add_entry(field='company', query_filter={'company_category': category})
+            card.add_entry(field='company', query_filter={'company_category_id': str(category.pk)})
+            card.add_entry(field='company', query_filter={'company_category__pk__in': [category.pk]})
+            card.add_entry(field='company', query_filter={'company_category': None})
+        html = [row['entries'][0]['html'] for row in card.rows]
+        for company_html in html[:3]:
+            self.assertIn('Company', company_html)
+            self.assertNotIn('Other', company_html)
+        self.assertIn('Other', html[3])
+        self.assertNotIn('Company', html[3])
+
+    def test_unconverted_lookup_queries_database(self):
+        card = CardBase(request=self.request, details_object=self.company, prefetch=['sectors'])
+        with self.assertNumQueries(1):
+            card.add_entry(field='sectors', query_filter={'type__contains': 2})
+        self.assertIn('Finance', self._sectors_html(card))
+
+    def test_without_prefetch(self):
+        card = CardBase(request=self.request, details_object=self.company)
+        with self.assertNumQueries(1):
+            card.add_entry(field='sectors', query_filter={'type': 1})
+        self.assertIn('Retail', self._sectors_html(card))
+
+
+class TestRelatedPlanning(TestCase):
+
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+        category = CompanyCategory.objects.create(name='Category')
+        company = Company.objects.create(name='Company', company_category=category)
+        company.sectors.add(Sector.objects.create(name='Retail'))
+        self.person = Person.objects.create(company=company, first_name='First', surname='Last')
+
+    def test_plan(self):
+        card = CardBase(request=self.request, details_object=self.person)
+        select_related, prefetch_related = card.plan_related_lookups(
+            ['first_name', {'field': 'company__company_category__name'}, ('company__sectors', 'company__name')])
+        self.assertEqual(select_related, {'company', 'company__company_category'})
+        self.assertEqual(prefetch_related, {'company__sectors'})
+
+    def test_reverse_relations_use_accessor(self):
+        company = Company.objects.get(pk=self.person.company_id)
+        Payment.objects.create(company=company, date=datetime.date(2024, 1, 1), amount=1, quantity=1)
+        card = CardBase(request=self.request, details_object=company)
+        self.assertEqual(card.plan_related_lookups(['payment_set', 'payment', 'person__first_name']),
+                         (set(), {'payment_set'}))
+        card.add_rows('payment')
+        self.assertEqual(card.rows[0]['entries'][0]['html'], 'N/A')
+
+    def test_add_rows_loads_related_once(self):
+        person = Person.objects.get(pk=self.person.pk)
+        card = CardBase(request=self.request, details_object=person)
+        with self.assertNumQueries(2):
+            card.add_rows('first_name', 'company__name', 'company__company_category__name', 'company__sectors')
+        html = [row['entries'][0]['html'] for row in card.rows]
+        self.assertEqual(html[:3], ['First', 'Company', 'Category'])
+        self.assertIn('Retail', html[3])
+        self.assertIs(card.details_object, person)
+
+    def test_changed_foreign_key_not_replaced(self):
+        other = Company.objects.create(name='Other')
+        person = Person.objects.get(pk=self.person.pk)
+        person.company_id = other.pk
+        card = CardBase(request=self.request, details_object=person)
+        card.add_rows('company__name')
+        self.assertEqual(card.rows[0]['entries'][0]['html'], 'Other')
+
+    def test_relations_cached(self):
+        CardBase._relation_for_attribute(Company, 'payment_set')
+        with mock.patch.object(Company._meta, 'get_fields') as get_fields:
+            self.assertEqual(CardBase._relation_for_attribute(Company, 'payment_set').related_model, Payment)
+        get_fields.assert_not_called()
+
+    def test_disabled(self):
+        class NoRelatedCard(CardBase):
+            auto_related = False
+
+        person = Person.objects.get(pk=self.person.pk)
+        card = NoRelatedCard(request=self.request, details_object=person)
+        with self.assertNumQueries(3):
+            card.add_rows('company__name', 'company__company_category__name', 'company__sectors')
+
+
+class TestFieldMetaCache(TestCase):
+
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+        self.person = Person(title=1, first_name='First', surname='Last')
+
+    def test_meta_cached_per_model(self):
+        field_type, has_display = CardBase.get_field_meta(Person, 'title')
+        self.assertEqual(field_type.name, 'title')
+        self.assertTrue(has_display)
+        with mock.patch.object(Person._meta, 'get_field') as get_field:
+            self.assertEqual(CardBase.get_field_meta(Person, 'title'), (field_type, has_display))
+        get_field.assert_not_called()
+        self.assertEqual(CardBase.get_field_meta(Person, 'not_a_field'), (None, False))
+
+    def test_display_and_label(self):
+        card = CardBase(request=self.request, details_object=self.person)
+        with mock.patch.object(CardBase, 'label_from_field', wraps=CardBase.label_from_field) as label_from_field:
+            card.add_rows('title', 'title')
+        self.assertEqual([row['entries'][0]['html'] for row in card.rows], ['Mrs', 'Mrs'])
+        self.assertLessEqual(label_from_field.call_count, 1)
+
+    def test_label_cached_per_language(self):
+        user = get_user_model()(email='user@example.com')
+        labels = []
+        for language in ('en', 'fr', 'en'):
+            with translation.override(language):
+                card = CardBase(request=self.request, details_object=user)
+                card.add_rows('email')
+                labels.append(str(card.rows[0]['entries'][0]['label']))
+        self.assertEqual(labels[0], labels[2])
+        self.assertNotEqual(labels[0], labels[1])
+
+    def test_cleared_when_models_prepared(self):
+        from cards import base
+        CardBase.get_field_meta(Person, 'surname')
+        self.assertIn((Person, 'surname'), base._field_meta_cache)
+        base._clear_field_caches(sender=Person)
+        self.assertEqual(base._field_meta_cache, {})
+
+
+class TestPagedList(CardViewTestMixin, TestCase):
+    view_class = ExampleCompanyCardPagedList
+
+    def setUp(self):
+        super().setUp()
+        self.companies = [Company.objects.create(name=f'Company {i:02}') for i in range(45)]
+
+    def _get_view(self, path='/', slug='-'):
+        view = super()._get_view(path)
+        view.split_slug({'slug': slug})
+        return view
+
+    def test_first_page_and_selected_entry(self):
+        view = self._get_view(slug=str(self.companies[-1].pk))
+        view.display_list_entries()
+        self.assertEqual(len(view.list_entries), 21)
+        self.assertEqual(view.list_entries[0]['pk'], self.companies[-1].pk)
+        self.assertEqual(view.list_entries[1]['name'], 'Company 00')
+        self.assertIsNotNone(view.list_next_cursor)
+
+    def test_pages_follow_cursor(self):
+        view = self._get_view()
+        names, cursor = [], None
+        while True:
+            entry_objects, cursor = view.get_list_page(cursor=cursor)
+            names += [o.name for o in entry_objects]
+            if cursor is None:
+                break
+        self.assertEqual(names, sorted(c.name for c in self.companies))
+
+    def test_invalid_cursor_restarts(self):
+        view = self._get_view()
+        first_page, cursor = view.get_list_page()
+        values = cursor.rsplit(':', 1)[0]
+        for bad_cursor in ('[', '[1]', values, cursor[:-2], 'null'):
+            self.assertEqual(view.get_list_page(cursor=bad_cursor)[0], first_page)
+        command = json.loads(view.button_list_page(cursor=values).content)[0]
+        self.assertTrue(command['reset'])
+        self.assertIn(f'id="list_{first_page[0].pk}"', command['html'])
+
+    def test_button_list_page_search(self):
+        view = self._get_view()
+        response = view.button_list_page(search='company 4', reset=True)
+        command = json.loads(response.content)[0]
+        self.assertEqual(command['function'], 'list_page')
+        self.assertIsNone(command['cursor'])
+        self.assertTrue(command['reset'])
+        self.assertEqual(command['html'].count('cards-list-group-item'), 5)
+        self.assertIn(f'id="list_{self.companies[40].pk}"', command['html'])
+
+
+class TestTreeSelection(CardViewTestMixin, TestCase):
+    view_class = ExampleCompanyTree
+
+    def _get_view(self, path='/', slug='-'):
+        view = super()._get_view(path)
+        view.split_slug({'slug': slug})
+        return view
+
+    def test_open_parent_path(self):
+        view = self._get_view(slug='ajson5')
+        tree_data = view.get_tree_data(selected_id=view.selected_id)
+        view.add_tree_card(tree_data=tree_data, extra_kwargs={})
+        rows = {row['id']: row for row in tree_data}
+        self.assertEqual(rows['ajson5']['state'], {'selected': True})
+        self.assertEqual(rows['ajson4']['state'], {'opened': True})
+        self.assertEqual(rows['ajson2']['state'], {'opened': True})
+        self.assertNotIn('state', rows['ajson1'])
+
+    def test_open_parent_cycle(self):
+        tree_data = [{'id': 1, 'parent': 2}, {'id': 2, 'parent': 1}]
+        self._get_view().open_parent(tree_data=tree_data, parent_id=1)
+        self.assertTrue(all(row['state']['opened'] for row in tree_data))
+
+
+class TestLazyTree(CardViewTestMixin, TestCase):
+    view_class = ExampleLazyTree
+
+    def _get_view(self, path='/', slug='-'):
+        view = super()._get_view(path)
+        view.split_slug({'slug': slug})
+        return view
+
+    def test_roots_and_selected_path(self):
+        view = self._get_view(slug='n3_4_5')
+        tree_data = view.get_lazy_tree_data(selected_id=view.selected_id)
+        self.assertEqual(len(tree_data), 10)
+        self.assertIs(tree_data[0]['children'], True)
+        node_3 = tree_data[3]
+        self.assertEqual(node_3['state'], {'opened': True})
+        node_3_4 = node_3['children'][4]
+        self.assertEqual(node_3_4['state'], {'opened': True})
+        self.assertEqual(node_3_4['children'][5]['state'], {'selected': True})
+        self.assertIs(node_3_4['children'][5]['children'], True)
+
+    def test_ajax_tree_children(self):
+        response = self._get_view().ajax_tree_children(parent_id='n1_2_3')
+        children = json.loads(response.content)
+        self.assertEqual(children[0], {'id': 'n1_2_3_0', 'text': 'Node n1.2.3.0', 'children': False})
+
+    def test_page_embeds_lazy_data_source(self):
+        view = self._get_view()
+        view.setup_cards()
+        html = view.cards['tree_card'].render()
+        self.assertIn("ajax: 'tree_children'", html)
+        self.assertNotIn('n0_0', html)
+
+
+class TestSingleTableSetup(CardViewTestMixin, TestCase):
+    view_class = LinkedDatatablesFourLevelExample
+
+    def setUp(self):
+        super().setUp()
+        company = Company.objects.create(name='Company')
+        Person.objects.create(company=company, first_name='First', surname='Last')
+        self.company = company
+
+    def _post_datatable_data(self, table_id, **data):
+        request = self.factory.post('/', data={'datatable_data': True, 'table_id': table_id, 'draw': 1, **data})
+        request.user = self.user
+        return self.view_class.as_view()(request)
+
+    def test_linked_tier_built_alone(self):
+        hooks = ['setup_table_ld4_categories', 'setup_table_ld4_companies',
+                 'setup_table_ld4_people', 'setup_table_ld4_payments']
+        patches = {hook: mock.patch.object(self.view_class, hook, autospec=True,
+                                           side_effect=getattr(self.view_class, hook)) for hook in hooks}
+        mocks = {hook: patch.start() for hook, patch in patches.items()}
+        self.addCleanup(mock.patch.stopall)
+        response = self._post_datatable_data('ld4_people', linked_filter_field='company_id',
+                                             linked_filter_value=self.company.pk)
+        self.assertEqual(mocks['setup_table_ld4_people'].call_count, 1)
+        for hook in hooks[:2] + hooks[3:]:
+            mocks[hook].assert_not_called()
+        self.assertEqual(len(json.loads(response.content)['data']), 1)
+
+    def test_setup_single_table(self):
+        view = self._get_view()
+        table = view.setup_single_table('ld4_companies')
+        self.assertEqual(list(view.tables), ['ld4_companies'])
+        self.assertIs(table, view.tables['ld4_companies'])
+        self.assertIsNone(view.table_setup_only)
+        self.assertIsNone(view.setup_single_table('missing'))
+
+
+class TestServerSideLinkedDatatables(CardViewTestMixin, TestCase):
+    view_class = LinkedDatatablesPaymentExample
+
+    def setUp(self):
+        super().setUp()
+        self.company = Company.objects.create(name='Company')
+        other = Company.objects.create(name='Other')
+        for x in range(30):
+            Payment.objects.create(company=self.company, date=datetime.date(2024, 1, 1), amount=x, quantity=1)
+        Payment.objects.create(company=other, date=datetime.date(2024, 1, 1), amount=1, quantity=1)
+
+    def _post_page(self, **data):
+        request = self.factory.post('/', data={'datatable_data': True, 'table_id': 'ld_pay_payments',
+                                               'linked_filter_field': 'company_id',
+                                               'linked_filter_value': self.company.pk,
+                                               'server_side': True, **data})
+        request.user = self.user
+        return json.loads(self.view_class.as_view()(request).content)
+
+    def test_page(self):
+        page = self._post_page(start=25, length=25)
+        self.assertEqual(len(page['data']), 5)
+        self.assertEqual(page['start'], 25)
+        self.assertEqual(page['recordsTotal'], 30)
+        self.assertEqual(page['recordsFiltered'], 30)
+
+    def test_search_and_order(self):
+        page = self._post_page(start=0, length=10, search='2', order_column=2, order_dir='desc')
+        amounts = [row[2] for row in page['data']]
+        self.assertEqual(page['recordsFiltered'], 12)
+        self.assertEqual(amounts, sorted(amounts, reverse=True))
+
+    def test_equal_values_paged_once(self):
+        amounts = []
+        for start in range(0, 30, 10):
+            page = self._post_page(start=start, length=10, order_column=3)
+            amounts += [row[2] for row in page['data']]
+        self.assertEqual(sorted(amounts), list(range(30)))
+
+    def test_invalid_order_column(self):
+        page = self._post_page(start='x', length=10, order_column='name')
+        self.assertEqual((len(page['data']), page['start']), (10, 0))
+
+    def test_list_searched(self):
+        view = self._get_view()
+        table = view.setup_single_table('ld_pay_payments')
+        payments = list(Payment.objects.filter(company=self.company).order_by('amount')
+                        .values('id', 'date', 'amount', 'quantity'))
+        payments[3]['amount'] = 987654
+        page = view.get_datatable_page(table, payments, start=0, length=5, search='87654')
+        self.assertEqual((page['recordsTotal'], page['recordsFiltered']), (30, 1))
+        self.assertEqual([row[2] for row in page['data']], [987654])
+
+    def test_tier_starts_empty(self):
+        view = self._get_view()
+        view.setup_datatable_cards()
+        self.assertFalse(view.tables['ld_pay_payments'].ajax_data)
+        self.assertEqual(view.tables['ld_pay_payments'].search_fields, ['amount', 'quantity'])
+
+
+class BarrierCardsView(AsyncCardMixin, TemplateView):
+    template_name = 'cards_examples/cards.html'
+    async_cards = ['one', 'two', 'three']
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.barrier = threading.Barrier(len(self.async_cards), timeout=5)
+
+    def _build(self, code):
+        # Only returns once every builder has started, so fails unless they run concurrently
+        self.barrier.wait()
+        return self.add_card(code, title=code)
+
+    def setup_one_card(self):
+        return self._build('one')
+
+    def setup_two_card(self):
+        return self._build('two')
+
+    def setup_three_card(self):
+        return self._build('three')
+
+    def setup_cards(self):
+        self.add_card_group('one', 'two', 'three')
+
+
+class TestAsyncCards(CardViewTestMixin, TestCase):
+    view_class = AsyncDashboardExample
+
+    def test_builders_run_concurrently(self):
+        self.view_class = BarrierCardsView
+        context = self._get_view().get_context_data()
+        self.assertEqual(set(context['cards']), {'one', 'two', 'three'})
+        self.assertIn('main', context['card_groups'])
+
+    def test_dashboard(self):
+        view = self._get_view()
+        view.slow_seconds = 0
+        context = view.get_context_data()
+        self.assertEqual(set(context['cards']), {'companies', 'people', 'payments', 'service'})
+        self.assertIn('External Service', context['card_groups']['main'])
+
+    def test_single_card_reload(self):
+        view = self._get_view()
+        view.slow_seconds = 0
+        for code in ('people', 'service'):
+            response = view.button_reload_card(card=code)
+            self.assertEqual(json.loads(response.content)[-1]['selector'], f'#{code}_ajax')
+
+
+class TestLazyCards(CardViewTestMixin, TestCase):
+    view_class = LazyDashboardExample
+
+    def setUp(self):
+        super().setUp()
+        Company.objects.create(name='Company', active=True)
+
+    def test_placeholders(self):
+        view = self._get_view()
+        view.slow_seconds = 0
+        with self.assertNumQueries(0):
+            context = view.get_context_data()
+        html = context['card_groups']['main']
+        self.assertIn('<div id="companies_ajax">', html)
+        self.assertIn("load_lazy_card('payments')", html)
+        self.assertTrue(view.cards['companies'].lazy)
+        self.assertFalse(view.cards['about'].lazy)
+
+    def test_batched_load(self):
+        view = self._get_view()
+        view.slow_seconds = 0
+        response = view.button_lazy_cards(cards=['companies', 'payments', 'about', 'missing'])
+        commands = json.loads(response.content)
+        self.assertEqual([command['selector'] for command in commands],
+                         ['#companies_ajax', '#payments_ajax', '#about_ajax'])
+        self.assertNotIn('fa-spinner', commands[0]['html'])
+        self.assertIn('Active', commands[0]['html'])
+
+
+class PageCommandStreamedView(StreamedDashboardExample):
+
+    def setup_cards(self):
+        super().setup_cards()
+        self.add_page_command('streamed_page_command')
+
+
+class TestStreamedCardGroups(CardViewTestMixin, TestCase):
+    view_class = StreamedDashboardExample
+
+    def _get_response(self):
+        request = self.factory.get('/')
+        request.user = self.user
+        return self.view_class.as_view(slow_seconds=0)(request)
+
+    def test_head_sent_before_groups_rendered(self):
+        response = self._get_response()
+        self.assertTrue(response.streaming)
+        with mock.patch.object(self.view_class, 'render_card_groups', autospec=True,
+                               side_effect=self.view_class.render_card_groups) as render_card_groups:
+            chunks = iter(response.streaming_content)
+            head = next(chunks).decode()
+            render_card_groups.assert_not_called()
+            rest = b''.join(chunks).decode()
+        render_card_groups.assert_called_once()
+        self.assertIn('<head>', head)
+        self.assertNotIn('django-cards-group', head + rest)
+        self.assertIn('External Service', rest)
+        self.assertIn('</html>', rest)
+
+    # Menus otherwise get random element ids on every render
+    @mock.patch('django_menus.menu.menu.random_string', return_value='menu')
+    def test_same_page_as_normal_render(self, _random_string):
+        self.view_class = PageCommandStreamedView
+        streamed = b''.join(self._get_response().streaming_content).decode()
+        self.view_class = type('PageCommandView', (PageCommandStreamedView,), {'stream_card_groups': False})
+        response = self._get_response()
+        self.assertFalse(response.streaming)
+        self.assertIn('streamed_page_command', streamed)
+        self.assertEqual(streamed, response.rendered_content)
+
+
+class TestWindowedRows(CardViewTestMixin, TestCase):
+    view_class = WindowedRowsExample
+
+    def test_first_window_rendered(self):
+        html = self._get_view().get_context_data()['card_groups']['main']
+        self.assertIn('Event 100<', html)
+        self.assertNotIn('Event 101<', html)
+        self.assertIn('data-start="100"', html)
+
+    def test_next_window(self):
+        commands = json.loads(self._get_view().button_card_rows(card='audit', start=2900, search='').content)
+        self.assertEqual(commands[0]['function'], 'card_rows')
+        self.assertIn('Event 2901<', commands[0]['html'])
+        self.assertIn('Event 3000<', commands[0]['html'])
+        self.assertIsNone(commands[0]['next_start'])
+
+    def test_search(self):
+        commands = json.loads(self._get_view().button_card_rows(card='audit', start=0, search='RECORD 599').content)
+        self.assertEqual(commands[0]['html'].count('Event '), 5)
+        self.assertIsNone(commands[0]['next_start'])
+        card = self._get_view().setup_single_card('audit')
+        rows, next_start = card.get_window(search='approved')
+        self.assertEqual((len(rows), next_start), (100, 100))
+
+    def test_only_builder_called(self):
+        view = self._get_view()
+        with mock.patch.object(view, 'setup_cards') as setup_cards:
+            view.button_card_rows(card='audit', start=100, search='')
+        setup_cards.assert_not_called()
+
+    def test_builder_required(self):
+        with self.assertRaises(CardPostError):
+            self._get_view().button_card_rows(card='missing', start=0, search='')
+
+    def test_without_builder_renders_all_rows(self):
+        view = self._get_view()
+        card = view.add_card('events', title='Events', window_rows=100)
+        for number in range(1, 151):
+            card.add_entry(value=f'Record {number}', label=f'Event {number}')
+        self.assertIsNone(card.window_rows)
+        html = card.render()
+        self.assertIn('Event 150<', html)
+        self.assertNotIn('events_more', html)
+        self.assertNotIn('fa-spinner', html)
+
+
+class TestFastRender(CardViewTestMixin, TestCase):
+    """Golden-output tests keeping `cards.fast_render` in sync with `_default_rows.html`."""
+
+    class Menu:
+        def render(self):
+            return '<menu>'
+
+    entry_options = [{'value': 'Plain'},
+                     {'value': '<b>Safe</b> & raw', 'label': 'Label <i>html</i>'},
+                     {'value': 'Linked', 'label': 'Link', 'link': '/a?b=1&c=2'},
+                     {'value': 'Value link', 'label': 'Value link', 'value_link': '/x', 'badge': 'badge-info'},
+                     {'value': 'Tip', 'label': 'Tooltip', 'tooltip': 'Say "hi" <now>'},
+                     {'value': 'Pop', 'label': 'Popover', 'popover': {'title': 'T', 'content': 'C & D'}},
+                     {'value': 'Pop', 'label': 'Popover string', 'popover': 'Only content'},
+                     {'value': 'Dot', 'label': 'Status', 'status_dot': '#28a745', 'icon': 'fas fa-check'},
+                     {'value': 'Dot', 'status_dot': 'red', 'icon': 'fas fa-x', 'prefix': '£', 'suffix': 'kg'},
+                     {'value': "it's", 'label': 'Copy', 'copy_to_clipboard': True, 'css_class': 'text-bold'},
+                     {'value': "it's", 'copy_to_clipboard': True, 'badge': 'badge-danger'},
+                     {'value': 65, 'label': 'Progress', 'progress_bar': 'bg-success'},
+                     {'value': 40, 'progress_bar': 'bg-info'},
+                     {'value': '/static/tree_icon.png', 'label': 'Image', 'image': '50px'},
+                     {'value': '/static/tree_icon.png', 'image': '20px', 'help_text': 'An image'},
+                     {'value': 3, 'label': 'Rating', 'rating': 5},
+                     {'value': 2, 'rating': 4},
+                     {'value': 'New', 'label': 'Changed', 'old_value': 'Old'},
+                     {'value': 'New', 'old_value': 'Old <b>', 'badge': 'badge-warning'},
+                     {'value': ['One', 'Two <b>'], 'label': 'Lines', 'copy_to_clipboard': True, 'tooltip': 'Tip'},
+                     {'value': 'Help', 'label': 'Help', 'help_text': 'Some help', 'separator': True},
+                     {'value': 'Css', 'label': 'Entry css', 'entry_css_class': 'border'},
+                     {'value': 1234.5, 'label': 'Number'},
+                     {'value': None, 'label': 'Default'}]
+
+    def _assert_same(self, card):
+        card.fast_render = False
+        expected = card._render_template_uncached(), card.render_rows(card.rows)
+        card.fast_render = True
+        self.assertEqual((card._render_template_uncached(), card.render_rows(card.rows)), expected)
+
+    def test_entry_options(self):
+        card = CardBase(request=RequestFactory().get('/'), code='options')
+        for options in self.entry_options:
+            card.add_entry(**options)
+        card.rows += [{'type': 'standard', 'entries': [entry]} for entry in
+                      [card._add_entry_internal(value='Menu', label='With menu', menu=self.Menu()),
+                       card._add_entry_internal(value='Menu', menu=self.Menu(), badge='badge-info', old_value='Was')]]
+        self._assert_same(card)
+
+    def test_row_types(self):
+        card = CardBase(request=RequestFactory().get('/'), code='rows')
+        card.add_row({'value': 'A', 'label': 'First'}, {'value': 'B', 'link': '/b'},
+                     {'value': 'C', 'entry_css_class': 'col-sm-6', 'rating': 3})
+        card.add_html_string_entry('<p>Raw & html</p>')
+        card.add_row_style('pair', '<b>{label}</b> {value}', is_default=False)
+        card.add_entry(value='Styled', label='Style', row_style='pair')
+        card.add_entry(value='Last')
+        self._assert_same(card)
+
+    def test_example_views(self):
+        for view_class in (NewFeaturesIndex, NewFeatures2Index, TooltipTestIndex, RowStyleExampleIndex):
+            self.view_class = view_class
+            view = self._get_view()
+            view.setup_cards()
+            for code, card in view.cards.items():
+                if card.group_type == CARD_TYPE_STANDARD and card.template_name in (None, 'default'):
+                    with self.subTest(view=view_class.__name__, card=code):
+                        self._assert_same(card)
+
+    def test_class_default(self):
+        card = CardBase(request=RequestFactory().get('/'), code='default')
+        self.assertFalse(card.fast_render)
+        with mock.patch.object(CardBase, 'fast_render', True):
+            card = CardBase(request=RequestFactory().get('/'), code='default')
+            self.assertTrue(card.fast_render)
+            self.assertFalse(CardBase(request=None, code='off', fast_render=False).fast_render)
+        with mock.patch('cards.templatetags.django_cards_tags.render_default_rows', return_value='') as render:
+            card = CardBase(request=RequestFactory().get('/'), code='fast', fast_render=True)
+            card.add_entry(value='Fast')
+            card.render()
+        render.assert_called_once_with(card.rows, item_css_class='list-group-item', item_css='')
@@ -1,15 +1,25 @@
+import datetime
 import json
 import re
+from unittest import mock
+
+from django.contrib.staticfiles import finders
+from django.db import connection
 from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
-from cards.includes import FancytreeJS, FancytreeAwesomeSkinCSS
-from cards_examples.models import Company, CompanyCategory
+from cards.fast_json import script_json
+from cards.includes import FancytreeJS, FancytreeAwesomeSkinCSS, TreegridJS, TreegridCSS
+from cards.standard import CardMixin, CardPostError
+from cards_examples.models import Company, CompanyCategory, Person
 from cards_examples.views.treegrid import (
     TreegridBasicExample, TreegridEditableExample, TreegridMultiLevelExample,
     TreegridCompactExample, TreegridPaymentsExample, TreegridExpandedExample,
     TreegridWidgetsExample, TreegridFullExample, TreegridBatchExample, TreegridColspanExample,
-    TreegridStyledExample,
+    TreegridStyledExample, TreegridServerPaginationExample, TreegridStaticExample, TreegridCoalesceExample,
+    TreegridCalculatorExample,
     TreegridData, TreegridMultiData, TreegridCompactData, TreegridPaymentsData,
     TreegridWidgetsData, TreegridFullData, TreegridColspanData, TreegridStyledData,
 )
@@ -17,6 +27,15 @@ from cards_examples.views.treegrid import (
 User = get_user_model()
 
 
+def read_static(path):
+    with open(finders.find(path)) as f:
+        return f.read()
+
+
+TREEGRID_JS = read_static('cards/treegrid/js/treegrid.js')
+TREEGRID_CSS = read_static('cards/treegrid/css/treegrid.css')
+
+
 class TestFancytreeIncludes(TestCase):
     """Verify Fancytree CDN includes generate correct URLs."""
 
@@ -44,6 +63,11 @@ class TestFancytreeIncludes(TestCase):
         self.assertIn('dist/skin-awesome/ui.fancytree.min.css', output)
         self.assertNotIn('dist/css/', output)
 
+    def test_treegrid_static_versioned(self):
+        output = TreegridJS('1.2', False).includes() + TreegridCSS('1.2', False).includes()
+        self.assertIn('/static/cards/treegrid/js/treegrid.js?v=1.2', output)
+        self.assertIn('/static/cards/treegrid/css/treegrid.css?v=1.2', output)
+
 
 class TreegridViewTestMixin:
     """Shared helpers for treegrid view tests."""
@@ -61,6 +85,10 @@ class TreegridViewTestMixin:
         response.render()
         return response.content.decode()
 
+    def _config(self, html):
+        match = re.search(r'<script id="\w+_treegrid_config" type="application/json">(.*?)</script>', html)
+        return json.loads(match.group(1))
+
     def _count_filter_inputs(self, html):
         return len(re.findall(r'<input[^>]*filter_input', html))
 
@@ -99,23 +127,42 @@ class TestTreegridBasic(TreegridViewTestMixin, TestCase):
         self.assertEqual(count, 1)
 
     def test_outline_plus_minus_icons_in_css(self):
-        html = self._render()
         # f0fe = fa-plus-square, f146 = fa-minus-square
-        self.assertIn('\\f0fe', html)
-        self.assertIn('\\f146', html)
+        self.assertIn('\\f0fe', TREEGRID_CSS)
+        self.assertIn('\\f146', TREEGRID_CSS)
         # Outline style: font-weight 400 (regular), not 900 (solid)
-        self.assertIn('font-weight: 400', html)
+        self.assertIn('font-weight: 400', TREEGRID_CSS)
         # Old caret icons should not be present
-        self.assertNotIn('\\f0da', html)
-        self.assertNotIn('\\f0d7', html)
+        self.assertNotIn('\\f0da', TREEGRID_CSS)
+        self.assertNotIn('\\f0d7', TREEGRID_CSS)
 
     def test_fancytree_init_script(self):
+        self.assertIn('.fancytree(', TREEGRID_JS)
+
+    def test_static_script_included_once(self):
+        html = self._render()
+        self.assertEqual(html.count('cards/treegrid/js/treegrid.js'), 1)
+        self.assertEqual(html.count('cards/treegrid/css/treegrid.css'), 1)
+        self.assertNotIn('var CARD_CODE', html)
+
+    def test_init_from_config(self):
         html = self._render()
-        self.assertIn('.fancytree(', html)
+        config = self._config(html)
+        self.assertIn(f"CardsTreegrid.init(JSON.parse(document.getElementById('{config['card_code']}_treegrid_config')",
+                      html)
+        self.assertEqual(config['data_url'], '/treegrid/data/')
+        self.assertEqual(config['page_size'], 50)
+
+    def test_filter_auto_expand(self):
+        self.assertFalse(self._config(self._render())['filter_auto_expand'])
+        view = self.view_class()
+        view.setup(self.factory.get('/treegrid/'))
+        card = view.add_treegrid_card(card_name='expand_tree', treegrid_filter_auto_expand=True)
+        self.assertTrue(card.get_treegrid_config()['filter_auto_expand'])
 
     def test_expand_all_disabled(self):
         html = self._render()
-        self.assertIn('EXPAND_ALL = false', html)
+        self.assertFalse(self._config(html)['expand_all'])
 
     def test_data_url(self):
         html = self._render()
@@ -137,7 +184,7 @@ class TestTreegridEditable(TreegridViewTestMixin, TestCase):
 
     def test_editable_columns(self):
         html = self._render()
-        self.assertIn('READ_ONLY = false', html)
+        self.assertFalse(self._config(html)['read_only'])
 
     def test_footer_present(self):
         html = self._render()
@@ -168,7 +215,7 @@ class TestTreegridMultiLevel(TreegridViewTestMixin, TestCase):
 
     def test_data_url(self):
         html = self._render()
-        self.assertIn("DATA_MODE = 'ajax'", html)
+        self.assertEqual(self._config(html)['data_mode'], 'ajax')
 
 
 class TestTreegridCompact(TreegridViewTestMixin, TestCase):
@@ -200,7 +247,7 @@ class TestTreegridExpanded(TreegridViewTestMixin, TestCase):
 
     def test_expand_all_enabled(self):
         html = self._render()
-        self.assertIn('EXPAND_ALL = true', html)
+        self.assertTrue(self._config(html)['expand_all'])
 
     def test_filter_shown_by_default(self):
         html = self._render()
@@ -218,7 +265,7 @@ class TestTreegridWidgets(TreegridViewTestMixin, TestCase):
 
     def test_not_read_only(self):
         html = self._render()
-        self.assertIn('READ_ONLY = false', html)
+        self.assertFalse(self._config(html)['read_only'])
 
     def test_tree_column_not_editable(self):
         """Tree column (Name) should not be marked editable."""
@@ -227,11 +274,7 @@ class TestTreegridWidgets(TreegridViewTestMixin, TestCase):
         # The columns JSON should show first column without editable
         self.assertIn('"field": "title"', html)
         # Name column has no 'editable': true
-        import json
-        # Extract COLUMNS JSON from script
-        start = html.index('var COLUMNS = ') + len('var COLUMNS = ')
-        end = html.index(';\n', start)
-        columns = json.loads(html[start:end])
+        columns = self._config(html)['columns']
         self.assertFalse(columns[0].get('editable', False))
 
     def test_checkbox_column_defined(self):
@@ -249,7 +292,7 @@ class TestTreegridWidgets(TreegridViewTestMixin, TestCase):
 
     def test_data_url(self):
         html = self._render()
-        self.assertIn("DATA_MODE = 'ajax'", html)
+        self.assertEqual(self._config(html)['data_mode'], 'ajax')
 
     def test_footer_present(self):
         html = self._render()
@@ -300,7 +343,7 @@ class TestTreegridBatch(TreegridViewTestMixin, TestCase):
 
     def test_batch_save_mode(self):
         html = self._render()
-        self.assertIn("SAVE_MODE = 'batch'", html)
+        self.assertEqual(self._config(html)['save_mode'], 'batch')
 
     def test_save_button_present(self):
         html = self._render()
@@ -317,15 +360,13 @@ class TestTreegridBatch(TreegridViewTestMixin, TestCase):
         self.assertIn('_changes', html)
 
     def test_batch_save_js(self):
-        html = self._render()
-        self.assertIn('_batch_save', html)
-        self.assertIn('pendingChanges', html)
+        self.assertIn('_batch_save', TREEGRID_JS)
+        self.assertIn('pendingChanges', TREEGRID_JS)
 
     def test_auto_save_not_used(self):
         """In batch mode, individual changes should not post immediately."""
-        html = self._render()
         # recordChange should check SAVE_MODE, not post directly
-        self.assertIn("if (SAVE_MODE === 'batch')", html)
+        self.assertIn("if (SAVE_MODE === 'batch')", TREEGRID_JS)
 
 
 class TestTreegridReload(TreegridViewTestMixin, TestCase):
@@ -333,19 +374,16 @@ class TestTreegridReload(TreegridViewTestMixin, TestCase):
     view_class = TreegridBasicExample
 
     def test_reload_function_registered(self):
-        html = self._render()
-        self.assertIn('window._treegridRegistry', html)
-        self.assertIn('reloadTreegrid', html)
+        self.assertIn('window._treegridRegistry', TREEGRID_JS)
+        self.assertIn('reloadTreegrid', TREEGRID_JS)
 
     def test_reload_command_registered(self):
-        html = self._render()
-        self.assertIn('reload_treegrid', html)
-        self.assertIn('ajax_helpers.command_functions', html)
+        self.assertIn('reload_treegrid', TREEGRID_JS)
+        self.assertIn('ajax_helpers.command_functions', TREEGRID_JS)
 
     def test_on_change_reload_support(self):
-        html = self._render()
-        self.assertIn('on_change', html)
-        self.assertIn("=== 'reload'", html)
+        self.assertIn('on_change', TREEGRID_JS)
+        self.assertIn("=== 'reload'", TREEGRID_JS)
 
     def test_treegrid_reload_response_method(self):
         """The CardMixin should have a treegrid_reload_response helper."""
@@ -358,15 +396,9 @@ class TestTreegridCellCommands(TestCase):
 
     def test_update_cell_command_registered(self):
         """JS should register treegrid_update_cell command."""
-        factory = RequestFactory()
-        request = factory.get('/treegrid/')
-        request.user = User(username='test', is_superuser=False)
-        response = TreegridBasicExample.as_view()(request)
-        response.render()
-        html = response.content.decode()
-        self.assertIn('treegrid_update_cell', html)
-        self.assertIn('treegrid_style_cell', html)
-        self.assertIn('treegrid_style_row', html)
+        self.assertIn('treegrid_update_cell', TREEGRID_JS)
+        self.assertIn('treegrid_style_cell', TREEGRID_JS)
+        self.assertIn('treegrid_style_row', TREEGRID_JS)
 
     def test_update_cell_helper(self):
         from cards.standard import CardMixin
@@ -381,13 +413,63 @@ class TestTreegridCellCommands(TestCase):
         self.assertTrue(hasattr(CardMixin, 'treegrid_style_row'))
 
 
+class TestTreegridPatch(TestCase):
+    """Test the batched treegrid_patch command."""
+
+    def _commands(self, **kwargs):
+        view = TreegridCalculatorExample()
+        view.treegrid_patch('my_tree', **kwargs)
+        return view.command_response().content
+
+    def test_command_registered(self):
+        self.assertIn('ajax_helpers.command_functions.treegrid_patch', TREEGRID_JS)
+        self.assertIn('applyPatch: _applyPatch', TREEGRID_JS)
+
+    def test_grouped_by_key(self):
+        commands = json.loads(self._commands(
+            updates=[('a', 'qty', 1), {'key': 'a', 'field': 'total', 'value': '2.00'}, ('b', 'qty', 3)],
+            styles=[{'key': 'a', 'field': 'total', 'bg': '', 'color': '#dc3545'},
+                    {'key': 'b', 'css_class': 'done', 'color': None}],
+            inserts=[{'parent_key': None, 'node_data': {'key': 'c', 'title': 'C'}}],
+            removes=['d'],
+            moves=[{'key': 'e', 'target_key': 'a', 'mode': 'after'}],
+        ))
+        self.assertEqual(commands, [{
+            'function': 'treegrid_patch',
+            'card': 'my_tree',
+            'updates': {'a': {'qty': 1, 'total': '2.00'}, 'b': {'qty': 3}},
+            'styles': {'a': {'total': {'bg': '', 'color': '#dc3545'}}},
+            'row_styles': {'b': {'css_class': 'done'}},
+            'inserts': [[None, {'key': 'c', 'title': 'C'}, 'child']],
+            'removes': ['d'],
+            'moves': [['e', 'a', 'after']],
+        }])
+
+    def test_empty_parts_omitted(self):
+        commands = json.loads(self._commands(updates=[('a', 'qty', 1)]))
+        self.assertEqual(commands, [{'function': 'treegrid_patch', 'card': 'my_tree', 'updates': {'a': {'qty': 1}}}])
+
+    def test_calculator_sends_one_patch(self):
+        body = {'button': 'calc_tree_save', 'key': 'product_1', 'field': 'qty', 'value': '2',
+                'row_price': '10', 'row_discount': '5', 'row_tax_rate': '20'}
+        request = RequestFactory().post('/', data=json.dumps(body), content_type='application/json',
+                                        HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        request.user = User.objects.create_user(username='patch', password='patch')
+        commands = json.loads(TreegridCalculatorExample.as_view()(request).content)
+        patches = [c for c in commands if c['function'] == 'treegrid_patch']
+        self.assertEqual(len(patches), 1)
+        self.assertEqual(patches[0]['updates']['product_1']['total'], '22.80')
+        self.assertEqual(patches[0]['styles']['product_1']['total']['color'], '#dc3545')
+        self.assertFalse(any(c['function'].startswith('treegrid_update') for c in commands))
+
+
 class TestTreegridWidgetsAutoSave(TreegridViewTestMixin, TestCase):
     """Verify the Widgets example uses auto save mode."""
     view_class = TreegridWidgetsExample
 
     def test_auto_save_mode(self):
         html = self._render()
-        self.assertIn("SAVE_MODE = 'auto'", html)
+        self.assertEqual(self._config(html)['save_mode'], 'auto')
 
     def test_no_save_button(self):
         html = self._render()
@@ -432,7 +514,7 @@ class TestTreegridFull(TreegridViewTestMixin, TestCase):
 
     def test_column_filter_js(self):
         html = self._render()
-        self.assertIn('SHOW_COL_FILTERS = true', html)
+        self.assertTrue(self._config(html)['show_column_filters'])
 
     def test_global_filter_hidden(self):
         """Full example uses column filters instead of global filter."""
@@ -446,7 +528,7 @@ class TestTreegridFull(TreegridViewTestMixin, TestCase):
 
     def test_data_url(self):
         html = self._render()
-        self.assertIn("DATA_MODE = 'ajax'", html)
+        self.assertEqual(self._config(html)['data_mode'], 'ajax')
 
 
 class TestTreegridFullData(TestCase):
@@ -518,20 +600,18 @@ class TestTreegridColspan(TreegridViewTestMixin, TestCase):
     def test_node_column_set_to_4(self):
         """Tree node should render in column 4 (Subitem Type / Style Name)."""
         html = self._render()
-        self.assertIn('NODE_COLUMN = 4', html)
+        self.assertEqual(self._config(html)['node_column'], 4)
 
     def test_node_column_in_fancytree_config(self):
-        html = self._render()
-        self.assertIn('nodeColumnIdx: NODE_COLUMN', html)
+        self.assertIn('nodeColumnIdx: NODE_COLUMN', TREEGRID_JS)
 
     def test_data_url(self):
         html = self._render()
-        self.assertIn("DATA_MODE = 'ajax'", html)
+        self.assertEqual(self._config(html)['data_mode'], 'ajax')
 
     def test_rendercells_skips_node_column(self):
         """renderCells should skip NODE_COLUMN, not hardcoded 0."""
-        html = self._render()
-        self.assertIn('if (i === NODE_COLUMN) continue;', html)
+        self.assertIn('if (i === NODE_COLUMN) continue;', TREEGRID_JS)
 
 
 class TestTreegridColspanData(TestCase):
@@ -562,7 +642,7 @@ class TestTreegridStyled(TreegridViewTestMixin, TestCase):
 
     def test_data_url(self):
         html = self._render()
-        self.assertIn("DATA_MODE = 'ajax'", html)
+        self.assertEqual(self._config(html)['data_mode'], 'ajax')
 
 
 class TestTreegridStyledData(TestCase):
@@ -612,7 +692,7 @@ class TestTreegridPayments(TreegridViewTestMixin, TestCase):
 
     def test_data_url(self):
         html = self._render()
-        self.assertIn("DATA_MODE = 'ajax'", html)
+        self.assertEqual(self._config(html)['data_mode'], 'ajax')
 
 
 # ---------------------------------------------------------------------------
@@ -699,3 +779,267 @@ class TestTreegridPaymentsData(TestCase):
         request = RequestFactory().get('/', {'parent': 'company_999999'})
         response = TreegridPaymentsData.as_view()(request)
         self.assertEqual(json.loads(response.content), [])
+
+
+class TestTreegridChildrenBulk(TestCase):
+    """Batched lazy children: one POST with a list of parent keys."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.companies = [Company.objects.create(name=f'Company {i}') for i in range(3)]
+        for company in self.companies:
+            for i in range(2):
+                Person.objects.create(company=company, first_name=f'First {i}', surname=company.name)
+        self.parents = [f'company_{c.pk}' for c in self.companies] + ['company_999999']
+
+    def _post(self, view_class, card_id):
+        request = self.factory.post('/', data=json.dumps({'treegrid_data': True, 'card_id': card_id,
+                                                          'parents': self.parents}),
+                                    content_type='application/json', HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        request.user = User(username='test', is_superuser=False)
+        response = view_class.as_view()(request)
+        self.assertTrue(response.streaming)
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_bulk_hook(self):
+        with self.assertNumQueries(1):
+            data = self._post(TreegridExpandedExample, 'expanded_tree')
+        self.assertEqual(list(data), self.parents)
+        self.assertEqual(len(data[self.parents[0]]), 2)
+        self.assertTrue(data[self.parents[0]][0]['key'].startswith('person_'))
+        self.assertEqual(data['company_999999'], [])
+
+    def test_falls_back_to_data_hook(self):
+        data = self._post(TreegridCompactExample, 'compact_tree')
+        self.assertEqual(list(data), self.parents)
+        self.assertEqual(len(data[self.parents[1]]), 2)
+
+    def test_unknown_card(self):
+        self.assertEqual(self._post(TreegridCompactExample, 'missing'), {})
+
+
+class TestTreegridServerPagination(TreegridViewTestMixin, TestCase):
+    """Root nodes paged, filtered and sorted on the server."""
+
+    view_class = TreegridServerPaginationExample
+
+    def setUp(self):
+        super().setUp()
+        retail = CompanyCategory.objects.create(name='Retail')
+        finance = CompanyCategory.objects.create(name='Finance')
+        for i in range(12):
+            company = Company.objects.create(name=f'Company {i:02}', company_category=finance if i % 3 else retail)
+            for j in range(i % 4 + 1):
+                Person.objects.create(company=company, first_name=f'First {j}', surname=company.name)
+
+    def _post(self, **kwargs):
+        body = {'treegrid_data': True, 'card_id': 'server_tree', 'parent': None, 'page': 1, 'page_size': 5, **kwargs}
+        request = self.factory.post('/', data=json.dumps(body), content_type='application/json',
+                                    HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        request.user = self.user
+        return json.loads(self.view_class.as_view()(request).content)
+
+    def test_renders_server_side(self):
+        html = self._render()
+        self.assertTrue(self._config(html)['server_side'])
+        self.assertIn('server_tree_pagination', html)
+        self.assertNotIn('server_tree_select_all_pages', html)
+
+    def test_page(self):
+        with self.assertNumQueries(2):
+            data = self._post(page=2)
+        self.assertEqual([node['title'] for node in data['nodes']],
+                         ['Company 05', 'Company 06', 'Company 07', 'Company 08', 'Company 09'])
+        self.assertEqual((data['total'], data['unfiltered_total'], data['page']), (12, 12, 2))
+
+    def test_page_clamped(self):
+        data = self._post(page=9)
+        self.assertEqual(data['page'], 3)
+        self.assertEqual(len(data['nodes']), 2)
+
+    def test_search_and_column_filters(self):
+        data = self._post(search='company 1')
+        self.assertEqual(data['total'], 2)
+        data = self._post(column_filters={'category': 'ret'})
+        self.assertEqual((data['total'], data['unfiltered_total']), (4, 12))
+        data = self._post(column_filters={'unknown': 'x'})
+        self.assertEqual(data['total'], 12)
+
+    def test_search_text_fields_only(self):
+        # 'people_count' is not searched, so companies with 3 people don't match
+        data = self._post(search='3')
+        self.assertEqual([node['title'] for node in data['nodes']], ['Company 03'])
+        data = self.view_class().get_treegrid_page(Company.objects.order_by('name'), list,
+                                                   fields={'id': 'id'}, search='3')
+        self.assertEqual(data['total'], 0)
+
+    def test_default_order_tie_breaker(self):
+        view = self.view_class()
+        for queryset, ordering in ((Company.objects.order_by('name'), ('name', 'pk')),
+                                   (Company.objects.all(), ('pk',)),
+                                   (Company.objects.order_by('-id'), ('-id',))):
+            data = view.get_treegrid_page(queryset, lambda page: [page.query.order_by], fields={'title': 'name'})
+            self.assertEqual(tuple(data['nodes'][0]), ordering)
+
+    def test_js_filters_and_facets(self):
+        data = self._post(js_filters={'category': ['Finance']}, facet_fields=['category'])
+        self.assertEqual(data['total'], 4)
+        self.assertEqual(data['facets'], {'category': {'Finance': 8, 'Retail': 4}})
+
+    def test_sort(self):
+        data = self._post(sort_field='people_count', sort_dir='desc')
+        self.assertEqual([node['data']['people_count'] for node in data['nodes']], [4, 4, 4, 3, 3])
+        data = self._post(sort_field='title', sort_dir='desc', page_size=1)
+        self.assertEqual(data['nodes'][0]['title'], 'Company 11')
+
+    def test_children_unchanged(self):
+        company = Company.objects.get(name='Company 03')
+        data = self._post(parent=f'company_{company.pk}')
+        self.assertEqual(len(data), 4)
+
+
+class TestTreegridConfigJson(TreegridViewTestMixin, TestCase):
+    """Config JSON is serialised once, at render time, optionally with orjson."""
+
+    view_class = TreegridStaticExample
+
+    def test_fast_json_static_data(self):
+        html = self._render()
+        self.assertIn('{"card_code":"static_tree",', html)
+        config = self._config(html)
+        self.assertEqual(config['data_mode'], 'static')
+        self.assertEqual([node['key'] for node in config['static_data']], ['fruits', 'veg', 'dairy'])
+
+    def test_serialised_once_per_card(self):
+        with mock.patch('cards.base.script_json', wraps=script_json) as dumps:
+            self._render()
+        self.assertEqual(dumps.call_count, 1)
+        self.assertTrue(dumps.call_args.kwargs['fast'])
+
+    def test_script_json(self):
+        value = {'title': '</script><b>&', 1: [1.5, None]}
+        for fast in (False, True):
+            with self.subTest(fast=fast):
+                text = script_json(value, fast=fast)
+                self.assertNotIn('<', text)
+                self.assertEqual(json.loads(text), {'title': '</script><b>&', '1': [1.5, None]})
+        with mock.patch('cards.fast_json.orjson', None):
+            self.assertEqual(script_json(value, fast=True), '{"title":"\\u003C/script\\u003E\\u003Cb\\u003E\\u0026",'
+                                                            '"1":[1.5,null]}')
+
+    def test_expand_to_current_node(self):
+        nodes = [{'key': 'a', 'children': [{'key': 'b', 'children': [{'key': 'c'}]}]}, {'key': 'd'}]
+        expanded = CardMixin._expand_to_current_node(nodes, 'c')
+        self.assertTrue(expanded[0]['expanded'])
+        self.assertTrue(expanded[0]['children'][0]['expanded'])
+        self.assertNotIn('expanded', nodes[0])
+        self.assertIs(expanded[1], nodes[1])
+        self.assertIsNone(CardMixin._expand_to_current_node(nodes, 'missing'))
+
+
+class TreegridCoalesceCompanyView(TreegridCoalesceExample):
+    """Coalesced edits of a model with an ``auto_now`` modified field."""
+
+    def setup_cards(self):
+        self.add_treegrid_card(card_name='coalesce_tree',
+                               treegrid_columns=[{'title': 'Name', 'field': 'title', 'model_field': 'name',
+                                                  'editable': True}],
+                               treegrid_read_only=False, treegrid_save_mode='coalesce')
+
+    def get_treegrid_coalesce_tree_instances(self, keys):
+        return self.get_treegrid_instances(keys, {'company': Company.objects})
+
+
+class TreegridCoalesceOverrideView(TreegridCoalesceExample):
+    """The coalesce example with some ``add_treegrid_card()`` arguments replaced."""
+
+    card_kwargs = {}
+
+    def add_treegrid_card(self, **kwargs):
+        return super().add_treegrid_card(**{**kwargs, **self.card_kwargs})
+
+
+class TestTreegridCoalesce(TreegridViewTestMixin, TestCase):
+    """Coalesced edits applied with one bulk_update per model."""
+
+    view_class = TreegridCoalesceExample
+
+    def setUp(self):
+        super().setUp()
+        company = Company.objects.create(name='Company')
+        self.ann = Person.objects.create(company=company, first_name='Ann', surname='Smith', age=30)
+        self.bob = Person.objects.create(company=company, first_name='Bob', surname='Jones', age=40)
+
+    def _post(self, changes):
+        body = {'button': 'treegrid_apply_changes', 'card': 'coalesce_tree', 'changes': changes}
+        request = self.factory.post('/', data=json.dumps(body), content_type='application/json',
+                                    HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        request.user = self.user
+        commands = json.loads(self.view_class.as_view()(request).content)
+        self.assertEqual(commands[0]['function'], 'treegrid_apply_results')
+        self.assertEqual(commands[0]['card'], 'coalesce_tree')
+        return commands[0]['results']
+
+    def test_config(self):
+        config = self._config(self._render())
+        self.assertEqual((config['save_mode'], config['save_delay']), ('coalesce', 500))
+
+    def test_bulk_update(self):
+        changes = [
+            {'key': f'person_{self.ann.pk}', 'field': 'first_name', 'value': 'Anne'},
+            {'key': f'person_{self.ann.pk}', 'field': 'person_title', 'value': '2'},
+            {'key': f'person_{self.bob.pk}', 'field': 'first_name', 'value': 'Robert'},
+            {'key': f'person_{self.bob.pk}', 'field': 'is_active', 'value': False},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            results = self._post(changes)
+        self.assertEqual(sum(query['sql'].startswith('UPDATE') for query in queries.captured_queries), 1)
+        self.assertTrue(all(result['ok'] for result in results))
+        self.assertEqual(results[1]['value'], 2)
+        self.ann.refresh_from_db()
+        self.bob.refresh_from_db()
+        self.assertEqual((self.ann.first_name, self.ann.title), ('Anne', 2))
+        self.assertEqual((self.bob.first_name, self.bob.is_active, self.bob.age), ('Robert', False, 40))
+
+    def test_rejected_changes(self):
+        results = self._post([
+            {'key': f'person_{self.ann.pk}', 'field': 'age', 'value': 'old'},
+            {'key': f'person_{self.ann.pk}', 'field': 'title', 'value': 'Dr Ann'},
+            {'key': 'person_999999', 'field': 'first_name', 'value': 'X'},
+            {'key': 'company_1', 'field': 'first_name', 'value': 'X'},
+            {'key': f'person_{self.bob.pk}', 'field': 'age', 'value': ''},
+        ])
+        self.assertFalse(results[0]['ok'])
+        self.assertEqual(results[0]['value'], 30)
+        self.assertIn('integer', results[0]['error'])
+        self.assertEqual(results[1]['error'], 'Not editable')
+        self.assertEqual([result.get('error') for result in results[2:4]], ['Not found', 'Not found'])
+        self.assertEqual(results[4], {'key': f'person_{self.bob.pk}', 'field': 'age', 'ok': True, 'value': None})
+        self.ann.refresh_from_db()
+        self.bob.refresh_from_db()
+        self.assertEqual((self.ann.age, self.bob.age), (30, None))
+
+    def test_rejected_unless_coalesced(self):
+        change = {'key': f'person_{self.ann.pk}', 'field': 'first_name', 'value': 'Anne'}
+        for card_kwargs in ({'treegrid_read_only': True}, {'treegrid_save_mode': 'batch'}):
+            view = TreegridCoalesceOverrideView(card_kwargs=card_kwargs)
+            view.setup(self.factory.post('/'))
+            with self.subTest(**card_kwargs), self.assertRaises(CardPostError):
+                view.treegrid_apply_changes('coalesce_tree', [change])
+        self.ann.refresh_from_db()
+        self.assertEqual(self.ann.first_name, 'Ann')
+
+    def test_auto_now_fields_updated(self):
+        self.view_class = TreegridCoalesceCompanyView
+        yesterday = timezone.now() - datetime.timedelta(days=1)
+        Company.objects.filter(pk=self.ann.company_id).update(modified=yesterday)
+        results = self._post([{'key': f'company_{self.ann.company_id}', 'field': 'title', 'value': 'Renamed'}])
+        self.assertTrue(results[0]['ok'])
+        company = Company.objects.get(pk=self.ann.company_id)
+        self.assertEqual(company.name, 'Renamed')
+        self.assertGreater(company.modified, yesterday)
+
+    def test_get_treegrid_instances(self):
+        instances = CardMixin.get_treegrid_instances(
+            [f'person_{self.ann.pk}', 'person_x', 'person_999999', 'other_1', 'nokey'], {'person': Person.objects})
+        self.assertEqual(instances, {f'person_{self.ann.pk}': self.ann})
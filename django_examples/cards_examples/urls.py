@@ -2,9 +2,9 @@ from django.urls import path, register_converter
 from cards.url_converters import CardListConverter
 from cards_examples.views.base import HelloModal
 from cards_examples.views.list import ExampleCompanyCardList, ExampleCompanyCardEmptyList, \
-    ExampleCompanyCardAdvancedList
+    ExampleCompanyCardAdvancedList, ExampleCompanyCardPagedList
 from cards_examples.views.main import ExampleIndex, ExampleCardsIndex
-from cards_examples.views.tree import ExampleCompanyTree
+from cards_examples.views.tree import ExampleCompanyTree, ExampleLazyTree
 from cards_examples.views.datatable import DatatableExample, DatatableOrderExample
 from cards_examples.views.linked_datatables import (
     LinkedDatatablesExample, LinkedDatatablesPaymentExample, LinkedDatatablesFourLevelExample
@@ -12,16 +12,19 @@ from cards_examples.views.linked_datatables import (
 
 from cards_examples.views.accordion import AccordionExample, AccordionAjaxExample, AccordionMultiExample, AccordionLayoutExample
 from cards_examples.views.child_cards import ChildCardExampleIndex
+from cards_examples.views.dashboard import AsyncDashboardExample, LazyDashboardExample, StreamedDashboardExample, \
+    WindowedRowsExample
 
 from cards_examples.views.row_styles import RowStyleExampleIndex
 from cards_examples.views.new_features import NewFeaturesIndex, NewFeaturesTableIndex, TooltipTestIndex, NewFeatures2Index, ImageGalleryIndex, ColumnSearchExample
 from cards_examples.views.treegrid import (
     TreegridBasicExample, TreegridEditableExample, TreegridMultiLevelExample,
     TreegridCompactExample, TreegridPaymentsExample, TreegridExpandedExample,
-    TreegridWidgetsExample, TreegridFullExample, TreegridBatchExample, TreegridColspanExample,
+    TreegridWidgetsExample, TreegridFullExample, TreegridBatchExample, TreegridCoalesceExample,
+    TreegridColspanExample,
     TreegridStyledExample, TreegridCalculatorExample, TreegridDualExample,
     TreegridSelfDispatchExample, TreegridStaticExample, TreegridSelectExample,
-    TreegridAdvancedExample, TreegridPaginationExample,
+    TreegridAdvancedExample, TreegridPaginationExample, TreegridServerPaginationExample,
     TreegridData, ColumnSearchTreegridExample,
     TreegridSortableExample,
     TreegridDragDropExample,
@@ -50,8 +53,10 @@ urlpatterns = [
     path('list/<card_list:slug>', ExampleCompanyCardList.as_view(), name='list'),
     path('list/empty/<card_list:slug>', ExampleCompanyCardEmptyList.as_view(), name='list_empty'),
     path('list/adv/<card_list:slug>', ExampleCompanyCardAdvancedList.as_view(), name='list_adv'),
+    path('list/paged/<card_list:slug>', ExampleCompanyCardPagedList.as_view(), name='list_paged'),
 
     path('tree/<card_list:slug>', ExampleCompanyTree.as_view(), name='tree'),
+    path('tree/lazy/<card_list:slug>', ExampleLazyTree.as_view(), name='tree_lazy'),
 
     path('child-cards/', ChildCardExampleIndex.as_view(), name='child_cards'),
 
@@ -77,6 +82,10 @@ urlpatterns = [
 
     path('new-features-2/', NewFeatures2Index.as_view(), name='new_features_2'),
     path('image-gallery/', ImageGalleryIndex.as_view(), name='image_gallery'),
+    path('async-dashboard/', AsyncDashboardExample.as_view(), name='async_dashboard'),
+    path('lazy-dashboard/', LazyDashboardExample.as_view(), name='lazy_dashboard'),
+    path('streamed-dashboard/', StreamedDashboardExample.as_view(), name='streamed_dashboard'),
+    path('windowed-rows/', WindowedRowsExample.as_view(), name='windowed_rows'),
 
     path('treegrid/', TreegridBasicExample.as_view(), name='treegrid'),
     path('treegrid/editable/', TreegridEditableExample.as_view(), name='treegrid_editable'),
@@ -87,6 +96,7 @@ urlpatterns = [
     path('treegrid/widgets/', TreegridWidgetsExample.as_view(), name='treegrid_widgets'),
     path('treegrid/data/', TreegridData.as_view(), name='treegrid_data'),
     path('treegrid/batch/', TreegridBatchExample.as_view(), name='treegrid_batch'),
+    path('treegrid/coalesce/', TreegridCoalesceExample.as_view(), name='treegrid_coalesce'),
     path('treegrid/self-dispatch/', TreegridSelfDispatchExample.as_view(), name='treegrid_self'),
     path('treegrid/select/', TreegridSelectExample.as_view(), name='treegrid_select'),
     path('treegrid/advanced/', TreegridAdvancedExample.as_view(), name='treegrid_advanced'),
@@ -97,6 +107,8 @@ urlpatterns = [
     path('treegrid/full/', TreegridFullExample.as_view(), name='treegrid_full'),
     path('treegrid/colspan/', TreegridColspanExample.as_view(), name='treegrid_colspan'),
     path('treegrid/pagination/', TreegridPaginationExample.as_view(), name='treegrid_pagination'),
+    path('treegrid/server-pagination/', TreegridServerPaginationExample.as_view(),
+         name='treegrid_server_pagination'),
     path('treegrid/column-search/', ColumnSearchTreegridExample.as_view(), name='treegrid_column_search'),
     path('treegrid/sortable/', TreegridSortableExample.as_view(), name='treegrid_sortable'),
     path('treegrid/drag-drop/', TreegridDragDropExample.as_view(), name='treegrid_drag_drop'),
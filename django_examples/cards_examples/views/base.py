@@ -13,7 +13,9 @@ class MainMenu(AjaxHelpers, MenuMixin):
                 ('cards_examples:list,-', 'List'),
                 ('cards_examples:list_empty,-', 'List Empty'),
                 ('cards_examples:list_adv,-', 'List Advanced'),
+                ('cards_examples:list_paged,-', 'List Paged'),
                 ('cards_examples:tree,-', 'Tree'),
+                ('cards_examples:tree_lazy,-', 'Lazy Tree'),
             )),
             MenuItem(menu_display='Datatables', dropdown=(
                 ('cards_examples:datatable', 'Datatable'),
@@ -31,6 +33,7 @@ class MainMenu(AjaxHelpers, MenuMixin):
                 ('cards_examples:treegrid_payments', 'Payments'),
                 ('cards_examples:treegrid_widgets', 'Widgets (Auto Save)'),
                 ('cards_examples:treegrid_batch', 'Widgets (Batch Save)'),
+                ('cards_examples:treegrid_coalesce', 'Widgets (Coalesced Save)'),
                 ('cards_examples:treegrid_select', 'Row Selection'),
                 ('cards_examples:treegrid_advanced', 'Advanced'),
                 ('cards_examples:treegrid_self', 'Self-Dispatch'),
@@ -41,6 +44,7 @@ class MainMenu(AjaxHelpers, MenuMixin):
                 ('cards_examples:treegrid_full', 'Full Featured'),
                 ('cards_examples:treegrid_colspan', 'Colspan Headers'),
                 ('cards_examples:treegrid_pagination', 'Pagination'),
+                ('cards_examples:treegrid_server_pagination', 'Server-Side Pagination'),
                 ('cards_examples:treegrid_column_search', 'Column Search'),
                 ('cards_examples:treegrid_sortable', 'Sortable'),
                 ('cards_examples:treegrid_drag_drop', 'Drag & Drop'),
@@ -72,6 +76,10 @@ class MainMenu(AjaxHelpers, MenuMixin):
                 ('cards_examples:new_features_2', 'New Features 2'),
                 ('cards_examples:image_gallery', 'Image Gallery'),
                 ('cards_examples:column_search', 'Column Search'),
+                ('cards_examples:async_dashboard', 'Async Dashboard'),
+                ('cards_examples:lazy_dashboard', 'Lazy Dashboard'),
+                ('cards_examples:streamed_dashboard', 'Streamed Dashboard'),
+                ('cards_examples:windowed_rows', 'Windowed Rows'),
             )),
             MenuItem(url='admin:index',
                      menu_display='Admin',
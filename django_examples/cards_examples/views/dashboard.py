@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+from cards_examples.models import Company, Payment, Person
+from cards_examples.views.base import MainMenu
+from django.db.models import Sum
+from django.views.generic import TemplateView
+
+from cards.standard import AsyncCardMixin, CardMixin
+
+
+class AsyncDashboardExample(MainMenu, AsyncCardMixin, TemplateView):
+    """Four independent cards, each with a simulated slow lookup, built concurrently."""
+    template_name = 'cards_examples/cards.html'
+    async_cards = ['companies', 'people', 'payments', 'service']
+    slow_seconds = 0.5
+
+    def setup_companies_card(self):
+        time.sleep(self.slow_seconds)
+        card = self.add_card('companies', title='Companies', header_icon='fas fa-building')
+        card.add_rows({'label': 'Total', 'value': Company.objects.count()},
+                      {'label': 'Active', 'value': Company.objects.filter(active=True).count()})
+        return card
+
+    def setup_people_card(self):
+        time.sleep(self.slow_seconds)
+        card = self.add_card('people', title='People', header_icon='fas fa-users')
+        card.add_rows({'label': 'Total', 'value': Person.objects.count()})
+        return card
+
+    def setup_payments_card(self):
+        time.sleep(self.slow_seconds)
+        card = self.add_card('payments', title='Payments', header_icon='fas fa-pound-sign')
+        card.add_rows({'label': 'Count', 'value': Payment.objects.count()},
+                      {'label': 'Amount', 'value': Payment.objects.aggregate(total=Sum('amount'))['total'] or 0})
+        return card
+
+    async def setup_service_card(self):
+        # async builders are awaited on the event loop rather than offloaded to a thread
+        await asyncio.sleep(self.slow_seconds)
+        card = self.add_card('service', title='External Service', header_icon='fas fa-cloud')
+        card.add_rows({'label': 'Status', 'value': 'OK'})
+        return card
+
+    def setup_cards(self):
+        self.add_card_group('companies', 'people', div_css_class='col-6 float-left')
+        self.add_card_group('payments', 'service', div_css_class='col-6 float-right')
+
+
+class StreamedDashboardExample(AsyncDashboardExample):
+    """The top of the page is sent once the cards are built, then each card group follows as it is rendered."""
+    stream_card_groups = True
+
+
+class LazyDashboardExample(MainMenu, CardMixin, TemplateView):
+    """The page is sent with placeholders, then one request builds the slow cards' bodies."""
+    template_name = 'cards_examples/cards.html'
+    slow_seconds = 0.5
+
+    def setup_cards(self):
+        self.setup_companies_card()
+        self.setup_payments_card()
+        card = self.add_card('about', title='About')
+        card.add_rows({'label': 'Rendered', 'value': 'With the page'})
+        self.add_card_group('about', 'companies', div_css_class='col-6 float-left')
+        self.add_card_group('payments', div_css_class='col-6 float-right')
+
+    def setup_companies_card(self):
+        card = self.add_card('companies', title='Companies', header_icon='fas fa-building', lazy=True)
+        if card.lazy:
+            return card
+        time.sleep(self.slow_seconds)
+        card.add_rows({'label': 'Total', 'value': Company.objects.count()},
+                      {'label': 'Active', 'value': Company.objects.filter(active=True).count()})
+        return card
+
+    def setup_payments_card(self):
+        card = self.add_card('payments', title='Payments', header_icon='fas fa-pound-sign', lazy=True)
+        if card.lazy:
+            return card
+        time.sleep(self.slow_seconds)
+        card.add_rows({'label': 'Count', 'value': Payment.objects.count()},
+                      {'label': 'Amount', 'value': Payment.objects.aggregate(total=Sum('amount'))['total'] or 0})
+        return card
+
+
+class WindowedRowsExample(MainMenu, CardMixin, TemplateView):
+    """A 3,000 row card that renders 100 rows at a time, with the search run on the server."""
+    template_name = 'cards_examples/cards.html'
+
+    def setup_cards(self):
+        self.setup_audit_card()
+        self.add_card_group('audit', div_css_class='col-12')
+
+    def setup_audit_card(self):
+        card = self.add_card('audit', title='Audit Log', header_icon='fas fa-history',
+                             window_rows=100, searchable=True)
+        actions = ['Created', 'Updated', 'Approved', 'Exported', 'Deleted']
+        for x in range(3000):
+            card.add_entry(value=f'{actions[x % len(actions)]} record {x // 5}', label=f'Event {x + 1}')
+        return card
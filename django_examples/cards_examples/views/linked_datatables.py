@@ -77,7 +77,8 @@ class LinkedDatatablesPaymentExample(MainMenu, CardMixin, TemplateView):
                 {'id': 'ld_pay_companies', 'model': Company, 'title': 'Companies',
                  'linked_field': 'company_category_id'},
                 {'id': 'ld_pay_payments', 'model': Payment, 'title': 'Payments',
-                 'linked_field': 'company_id'},
+                 'linked_field': 'company_id', 'server_side': True, 'page_length': 25,
+                 'search_fields': ['amount', 'quantity']},
             ]
         )
 
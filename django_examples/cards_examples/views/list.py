@@ -64,3 +64,9 @@ class ExampleCompanyCardAdvancedList(DjangoCardList):
                                      details_object=details_object,
                                      title='Just Name')
         card2.add_rows('name')
+
+
+class ExampleCompanyCardPagedList(ExampleCompanyCardList):
+    list_page_size = 20
+    list_cursor_fields = ('name',)
+    list_search_fields = ('name', 'number')
@@ -19,7 +19,7 @@ class NewFeaturesIndex(MainMenu, CardMixin, TemplateView):
         self.add_badge_card()
         self.add_icon_card()
         self.add_copy_truncate_card()
-        self.add_reload_card()
+        self.setup_reload_card()
         self.add_prefix_suffix_card()
         self.add_placeholder_card()
         self.add_status_dot_card()
@@ -174,7 +174,8 @@ class NewFeaturesIndex(MainMenu, CardMixin, TemplateView):
                        label='No truncation',
                        truncate=50)
 
-    def add_reload_card(self):
+    def setup_reload_card(self):
+        # Also used by button_reload_card so a reload only rebuilds this card
         card = self.add_card('reload', title='AJAX Reload Examples',
                              header_icon='fas fa-sync-alt',
                              ajax_reload=True)
@@ -186,6 +187,7 @@ class NewFeaturesIndex(MainMenu, CardMixin, TemplateView):
         card.add_entry(value='Use ajax_reload=True on any card',
                        label='Usage',
                        icon='fas fa-code')
+        return card
 
     def add_prefix_suffix_card(self):
         card = self.add_card('prefix_suffix', title='Prefix & Suffix Examples',
@@ -34,3 +34,26 @@ class ExampleCompanyTree(DjangoCardTree):
 
     def get_details_data(self, card, details_object):
         card.add_rows({'value': details_object, 'title': 'id'})
+
+
+class ExampleLazyTree(DjangoCardTree):
+    list_title = 'Lazy Tree'
+    lazy_tree = True
+    depth = 4
+    children_per_node = 10
+
+    def get_details_title(self, details_object):
+        return f'Details {details_object} lazy tree'
+
+    def get_tree_children(self, parent_id):
+        prefix = 'n' if parent_id == '#' else f'{parent_id}_'
+        level = 1 if parent_id == '#' else parent_id.count('_') + 2
+        return [{'id': f'{prefix}{x}', 'text': f'Node {prefix}{x}'.replace('_', '.'),
+                 'children': level < self.depth} for x in range(self.children_per_node)]
+
+    def get_tree_path(self, node_id):
+        parts = node_id.split('_')
+        return ['_'.join(parts[:x]) for x in range(1, len(parts))]
+
+    def get_details_data(self, card, details_object):
+        card.add_rows({'value': details_object, 'title': 'id'})
@@ -267,24 +267,33 @@ def _treegrid_compact_data_people(parent_key):
     except (ValueError, AttributeError):
         return []
 
-    title_map = dict(Person.title_choices)
     people = Person.objects.filter(
         company_id=company_id
     ).order_by('surname', 'first_name')
+    return [_treegrid_compact_person_node(person) for person in people]
+
+
+def _treegrid_compact_person_node(person):
+    return {
+        'title': f'{person.first_name} {person.surname}',
+        'key': f'person_{person.id}',
+        'folder': False,
+        'data': {
+            'type': 'person',
+            'is_active': 'Yes' if person.is_active else 'No',
+            'age': person.age or '',
+            'person_title': dict(Person.title_choices).get(person.title, ''),
+        },
+    }
 
-    children = []
+
+def _treegrid_compact_data_people_bulk(parent_keys):
+    """Children for several company keys with a single query."""
+    children = {key: [] for key in parent_keys}
+    company_ids = [key.replace('company_', '') for key in parent_keys if key.replace('company_', '').isdigit()]
+    people = Person.objects.filter(company_id__in=company_ids).order_by('surname', 'first_name')
     for person in people:
-        children.append({
-            'title': f'{person.first_name} {person.surname}',
-            'key': f'person_{person.id}',
-            'folder': False,
-            'data': {
-                'type': 'person',
-                'is_active': 'Yes' if person.is_active else 'No',
-                'age': person.age or '',
-                'person_title': title_map.get(person.title, ''),
-            },
-        })
+        children[f'company_{person.company_id}'].append(_treegrid_compact_person_node(person))
     return children
 
 
@@ -1014,6 +1023,9 @@ class TreegridExpandedExample(MainMenu, CardMixin, TemplateView):
     def get_treegrid_expanded_tree_data(self, parent=None):
         return _treegrid_compact_data_nodes(parent)
 
+    def get_treegrid_expanded_tree_children_bulk(self, parents):
+        return _treegrid_compact_data_people_bulk(parents)
+
 
 class TreegridWidgetsExample(MainMenu, CardMixin, TemplateView):
     """Treegrid with checkbox and select widgets. Tree column is read-only."""
@@ -1294,6 +1306,47 @@ class TreegridBatchExample(MainMenu, CardMixin, TemplateView):
         return self.command_response(toast_commands(header=f'Saved {count} change{"s" if count != 1 else ""}', text=details))
 
 
+class TreegridCoalesceExample(MainMenu, CardMixin, TemplateView):
+    """Auto save with edits coalesced into one request and applied with bulk_update."""
+    template_name = 'cards_examples/cards.html'
+
+    def setup_cards(self):
+        self.add_treegrid_card(
+            card_name='coalesce_tree',
+            title='Person Management (Coalesced Save)',
+            treegrid_columns=[
+                {'title': 'Name', 'field': 'title', 'width': '30%'},
+                {'title': 'First Name', 'field': 'first_name', 'width': '15%', 'editable': True},
+                {'title': 'Active', 'field': 'is_active', 'width': '10%',
+                 'editable': True, 'type': 'checkbox', 'visible_for': ['person']},
+                {'title': 'Title', 'field': 'person_title', 'width': '15%', 'model_field': 'title',
+                 'editable': True, 'type': 'select', 'visible_for': ['person'],
+                 'options': [
+                     {'value': '', 'label': '---'},
+                     {'value': '0', 'label': 'Mr'},
+                     {'value': '1', 'label': 'Mrs'},
+                     {'value': '2', 'label': 'Miss'},
+                 ]},
+                {'title': 'Age', 'field': 'age', 'width': '15%', 'editable': True},
+            ],
+            treegrid_read_only=False,
+            treegrid_save_mode='coalesce',
+            treegrid_icon_map={
+                'company': 'fas fa-building',
+                'person': 'fas fa-user',
+            },
+            footer='Edits are sent together half a second after the last one and saved with one bulk_update. '
+                   'Try an age that is not a number to see a rejected edit.',
+        )
+        self.add_card_group('coalesce_tree', div_css_class='col-12')
+
+    def get_treegrid_coalesce_tree_data(self, parent=None):
+        return _treegrid_widgets_data_nodes(parent)
+
+    def get_treegrid_coalesce_tree_instances(self, keys):
+        return self.get_treegrid_instances(keys, {'person': Person.objects})
+
+
 class TreegridColspanExample(MainMenu, CardMixin, TemplateView):
     """Treegrid with multi-row headers (colspan/rowspan) and conditional checkboxes."""
     template_name = 'cards_examples/cards.html'
@@ -1435,34 +1488,22 @@ class TreegridCalculatorExample(MainMenu, CardMixin, TemplateView):
         tax = after_discount * (tax_rate / 100)
         total = after_discount + tax
 
-        # Update all cells with recalculated values
-        self.treegrid_update_cell('calc_tree', key, 'price', f'{price:.2f}')
-        self.treegrid_update_cell('calc_tree', key, 'qty', str(qty))
-        self.treegrid_update_cell('calc_tree', key, 'discount', str(int(discount)))
-        self.treegrid_update_cell('calc_tree', key, 'subtotal', f'{subtotal:.2f}')
-        self.treegrid_update_cell('calc_tree', key, 'tax', f'{tax:.2f}')
-        self.treegrid_update_cell('calc_tree', key, 'total', f'{total:.2f}')
+        # Update all cells with recalculated values, and their colours, in one treegrid_patch command
+        updates = [(key, 'price', f'{price:.2f}'), (key, 'qty', str(qty)), (key, 'discount', str(int(discount))),
+                   (key, 'subtotal', f'{subtotal:.2f}'), (key, 'tax', f'{tax:.2f}'), (key, 'total', f'{total:.2f}')]
 
         # Colour the total: green >= 50k, amber 10k-50k, red < 10k
         if total >= 50000:
-            self.treegrid_style_cell('calc_tree', key, 'total',
-                                     bg='#d4edda', color='#28a745')
+            styles = [{'key': key, 'field': 'total', 'bg': '#d4edda', 'color': '#28a745'}]
         elif total >= 10000:
-            self.treegrid_style_cell('calc_tree', key, 'total',
-                                     bg='#fff3cd', color='#856404')
+            styles = [{'key': key, 'field': 'total', 'bg': '#fff3cd', 'color': '#856404'}]
         else:
-            self.treegrid_style_cell('calc_tree', key, 'total',
-                                     bg='#f8d7da', color='#dc3545')
+            styles = [{'key': key, 'field': 'total', 'bg': '#f8d7da', 'color': '#dc3545'}]
 
         # Highlight discount if applied
-        if discount > 0:
-            self.treegrid_style_cell('calc_tree', key, 'discount',
-                                     bg='#fff3cd', color='#856404')
-            self.treegrid_style_cell('calc_tree', key, 'subtotal',
-                                     bg='#fff3cd', color='#856404')
-        else:
-            self.treegrid_style_cell('calc_tree', key, 'discount', bg='', color='')
-            self.treegrid_style_cell('calc_tree', key, 'subtotal', bg='', color='')
+        discount_style = {'bg': '#fff3cd', 'color': '#856404'} if discount > 0 else {'bg': '', 'color': ''}
+        styles += [{'key': key, 'field': f, **discount_style} for f in ('discount', 'subtotal')]
+        self.treegrid_patch('calc_tree', updates=updates, styles=styles)
 
         self.add_command(toast_commands(
             header='Recalculated',
@@ -1893,6 +1934,7 @@ class TreegridStaticExample(MainMenu, CardMixin, TemplateView):
             },
             treegrid_expand_all=True,
             treegrid_show_filter=False,
+            treegrid_fast_json=True,
             footer='Data is embedded directly in the page. No AJAX calls. '
                    'Cherry has low stock (red text), Pepper has critical stock (red cell).',
         )
@@ -2066,6 +2108,53 @@ class TreegridPaginationExample(MainMenu, CardMixin, TemplateView):
         return self.command_response()
 
 
+class TreegridServerPaginationExample(TreegridPaginationExample):
+    """Treegrid with server-side pagination. Only the current page of root nodes is fetched."""
+
+    def setup_cards(self):
+        self.add_treegrid_card(
+            card_name='server_tree',
+            title='Company Tree (Server-Side Pages)',
+            treegrid_columns=[
+                {'title': 'Name', 'field': 'title', 'width': '50%'},
+                {'title': 'Category', 'field': 'category', 'width': '25%'},
+                {'title': 'People', 'field': 'people_count', 'width': '25%'},
+            ],
+            treegrid_icon_map={
+                'company': 'fas fa-building',
+                'person': 'fas fa-user',
+            },
+            treegrid_checkbox=True,
+            treegrid_server_side=True,
+            treegrid_page_size=5,
+            column_search=True,
+            treegrid_js_filters=[
+                {'field': 'category', 'title': 'Category'},
+            ],
+            footer='Each page, search, filter and column sort is a request that returns only that page of '
+                   'root nodes. Click a column header to sort.',
+        )
+        self.add_card_group('server_tree', div_css_class='col-12')
+
+    def get_treegrid_server_tree_data(self, parent=None, **kwargs):
+        if parent is not None:
+            return self._get_people(parent)
+        companies = (
+            Company.objects.annotate(people_count=Count('person'))
+            .filter(people_count__gt=0)
+            .select_related('company_category')
+            .order_by('name')
+        )
+        return self.get_treegrid_page(companies, self._companies_to_nodes,
+                                      fields={'title': 'name',
+                                              'category': 'company_category__name',
+                                              'people_count': 'people_count'},
+                                      **kwargs)
+
+    def button_server_tree_selected(self, **kwargs):
+        return self.button_paginated_tree_selected(**kwargs)
+
+
 class ColumnSearchTreegridExample(MainMenu, CardMixin, TemplateView):
     """Treegrid demonstrating per-column header search (non-paginated)."""
     template_name = 'cards_examples/cards.html'